@@ -2,180 +2,412 @@
 pragma solidity ^0.8.0;
 
 import "./RPS_Token.sol";
-import "@openzeppelin/contracts/access/Ownable.sol";
+import "@openzeppelin-upgradeable/contracts/access/OwnableUpgradeable.sol";
 
-contract RPS_Game is Ownable{
-    RPS_Token public rpsToken;
+// RPS_GameFactory clones this contract with EIP-1167 proxies, clones skip constructor so their
+// storage is set by initialize, while immutables (token and ledger mode) are shared with implementation
+contract RPS_Game is OwnableUpgradeable{
+    RPS_Token public immutable rpsToken;
     // 1 ETH = 10000 RPS
-    uint256 private ethRpsRatio = 10000;
+    uint256 private constant ethRpsRatio = 10000;
     enum RPS_AVAILABLE_SYMBOL{ROCK, PAPER, SCISSORS}
-    uint256 private lowBid;
-    uint256 private mediumBid;
-    uint256 private highBid;
     enum RPS_AVAILABLE_BID{LOW_BID, MEDIUM_BID, HIGH_BID}
+    // value is equal to (3 + player1Symbol - player2Symbol) % 3
+    enum RPS_MATCH_RESULT{DRAW, PLAYER1_WON, PLAYER2_WON}
     mapping(RPS_AVAILABLE_BID => uint256) private linkBidWithValues;
 
-    mapping(RPS_AVAILABLE_BID => address) private linkBidWithWaitingPlayerAddress;
-    mapping(address => RPS_AVAILABLE_SYMBOL) private linkAddressOfWaitingPlayerWithChosenMark;
-    mapping(address => bool) private isPlayerWaitingForMatch;
+    // address and symbol of waiting player share one storage slot
+    struct WaitingPlayer {
+        address playerAddress;
+        RPS_AVAILABLE_SYMBOL chosenSymbol;
+    }
+    mapping(RPS_AVAILABLE_BID => WaitingPlayer) private linkBidWithWaitingPlayer;
+    // new player is always matched with the one waiting for the same bid, so every bid
+    // queue holds at most one player and remembering its bid makes quiting queue O(1)
+    struct QueueEntry {
+        bool isWaiting;
+        RPS_AVAILABLE_BID chosenBid;
+    }
+    mapping(address => QueueEntry) private linkPlayerWithQueueEntry;
+
+    // when enabled, player balances are kept in linkPlayerWithLedgerBalance and RPS_Token
+    // is touched only by exportTokens and importTokens
+    bool private immutable internalLedgerEnabled;
+    mapping(address => uint256) private linkPlayerWithLedgerBalance;
+
+    // settleMatches takes 181 bytes per match: player1 address (20 bytes), player2 address (20 bytes),
+    // codes byte with player1 symbol in bits 0-1, player2 symbol in bits 2-3 and bid in bits 4-5,
+    // then move of player1 and move of player2 (70 bytes each): deadline (5 bytes) and EIP-712 signature (r, s, v)
+    uint256 private constant PACKED_MATCH_LENGTH = 181;
+    uint256 private constant PACKED_MATCH_CODES_LENGTH = 41;
+    uint256 private constant PACKED_MOVE_LENGTH = 70;
+    // every player signs own move with the bid value at stake, so owner settling the batch cant choose symbols,
+    // opponents or stakes for players, nonce grows with every settled or cancelled move, so every signature
+    // can be used only once, and deadline limits how long owner can hold it
+    bytes32 private constant BATCH_MOVE_TYPEHASH = keccak256(
+        "BatchMove(uint256 nonce,address opponent,uint8 symbol,uint8 bid,uint256 bidValue,uint256 deadline)");
+    bytes32 private constant DOMAIN_TYPEHASH = keccak256("EIP712Domain(string name,string version,uint256 chainId,address verifyingContract)");
+    // signatures with s above half of curve order are malleable copies, rejected like in OpenZeppelin ECDSA
+    uint256 private constant MAX_SIGNATURE_S = 0x7FFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF5D576E7357A4501DDFE92F46681B20A0;
+    struct BatchMatch {
+        address player1;
+        address player2;
+        RPS_AVAILABLE_SYMBOL symbol1;
+        RPS_AVAILABLE_SYMBOL symbol2;
+        RPS_AVAILABLE_BID bid;
+        uint256 bidValue;
+    }
+    mapping(address => uint256) private linkPlayerWithBatchMoveNonce;
 
-    event fundsDepositedEvent(address _addressOfAccount, uint256 _amountDepositedInEth);
-    event fundsWithdrawnEvent(address _addressOfAccount, uint256 _amountWithdrawnInEth);
-    event joinedQueueEvent(address _addressOfPlayer, RPS_AVAILABLE_BID _chosenBid);
-    event quiteQueueEvent(address _addressOfPlayer, RPS_AVAILABLE_BID _chosenBid);
+    // player addresses and bids are indexed, so nodes can filter logs of one player or bid
+    event fundsDepositedEvent(address indexed _addressOfAccount, uint256 _amountDepositedInEth);
+    event fundsWithdrawnEvent(address indexed _addressOfAccount, uint256 _amountWithdrawnInEth);
+    event joinedQueueEvent(address indexed _addressOfPlayer, RPS_AVAILABLE_BID indexed _chosenBid);
+    event quiteQueueEvent(address indexed _addressOfPlayer, RPS_AVAILABLE_BID indexed _chosenBid);
+    event tokensExportedEvent(address indexed _addressOfAccount, uint256 _amountInRps);
+    event tokensImportedEvent(address indexed _addressOfAccount, uint256 _amountInRps);
+    event bidValueUpdatedEvent(RPS_AVAILABLE_BID indexed _bid, uint256 _newValue);
     event matchEndedEvent(
-        address _player1Address,
+        address indexed _player1Address,
         RPS_AVAILABLE_SYMBOL _player1Symbol,
-        address _player2Address,
+        address indexed _player2Address,
         RPS_AVAILABLE_SYMBOL _player2Symbol,
-        RPS_AVAILABLE_BID _bidValue,
-        string _matchResult);
+        RPS_AVAILABLE_BID indexed _bidValue,
+        RPS_MATCH_RESULT _matchResult);
+    // match of settleMatches batch which could not be played, e.g. signature is expired or funds are missing
+    event matchSkippedEvent(address indexed _player1Address, address indexed _player2Address, uint256 _matchIndex);
 
 
-    constructor(address _rpsToken){
+    constructor(address _rpsToken, bool _internalLedgerEnabled){
         rpsToken = RPS_Token(_rpsToken);
-        lowBid = 1000000000000000000;
-        mediumBid = 5000000000000000000;
-        highBid = 10000000000000000000;
-        linkBidWithValues[RPS_AVAILABLE_BID.LOW_BID] = lowBid;
-        linkBidWithValues[RPS_AVAILABLE_BID.MEDIUM_BID] = mediumBid;
-        linkBidWithValues[RPS_AVAILABLE_BID.HIGH_BID] = highBid;
+        internalLedgerEnabled = _internalLedgerEnabled;
+        initialize(msg.sender);
     }
 
+    function initialize(address _owner) public initializer {
+        __Ownable_init();
+        if (_owner != msg.sender) {
+            transferOwnership(_owner);
+        }
+        linkBidWithValues[RPS_AVAILABLE_BID.LOW_BID] = 1000000000000000000;
+        linkBidWithValues[RPS_AVAILABLE_BID.MEDIUM_BID] = 5000000000000000000;
+        linkBidWithValues[RPS_AVAILABLE_BID.HIGH_BID] = 10000000000000000000;
+    }
+
+    // RPS_Token vault sends back ETH backing tokens imported in internal ledger mode
+    receive() external payable {
+        require(msg.sender == address(rpsToken), "Only RPS Token can send ETH to this contract!");
+    }
+
+    // RPS tokens are backed by ETH held in RPS_Token, internal ledger balances by ETH held in this contract,
+    // export and import move the backing between them
     function depositFunds() public payable {
         require(msg.value >= 100000000000000, 'Minimal value to deposit is 0.0001 ETH!');
         // 1 ETH = 10000 RPS
         uint256 valueInRPS = msg.value * ethRpsRatio;
-        rpsToken.createNewTokensForGame(msg.sender, valueInRPS);
+        if (internalLedgerEnabled){
+            linkPlayerWithLedgerBalance[msg.sender] += valueInRPS;
+        } else {
+            rpsToken.createNewTokensForGame{value: msg.value}(msg.sender, valueInRPS);
+        }
         emit fundsDepositedEvent(msg.sender, msg.value);
     }
 
     function withdrawFunds() public {
-        require(getDepositedFundsValue(msg.sender) > 0, 'You dont have funds deposited in this contract!');
+        uint256 depositedFunds = getDepositedFundsValue(msg.sender);
+        require(depositedFunds > 0, 'You dont have funds deposited in this contract!');
         require(isPlayerInQueue(msg.sender) == false, "To withdraw money, you cant be waiting for game. Please quite game!");
-        uint256 amountToWithdraw = getDepositedFundsValue(msg.sender) / ethRpsRatio;
-        payable(msg.sender).transfer(amountToWithdraw);
-        rpsToken.destroyTokens(msg.sender, getDepositedFundsValue(msg.sender));
+        uint256 amountToWithdraw = depositedFunds / ethRpsRatio;
+        if (internalLedgerEnabled){
+            delete linkPlayerWithLedgerBalance[msg.sender];
+            payable(msg.sender).transfer(amountToWithdraw);
+        } else {
+            rpsToken.destroyTokens(msg.sender, depositedFunds, payable(msg.sender), amountToWithdraw);
+        }
         emit fundsWithdrawnEvent(msg.sender, amountToWithdraw);
     }
 
+    function exportTokens(uint256 _amountInRps) public {
+        require(internalLedgerEnabled, "Internal ledger is disabled, your funds are already RPS tokens!");
+        require(linkPlayerWithQueueEntry[msg.sender].isWaiting == false, "To export tokens, you cant be waiting for game. Please quite game!");
+        require(linkPlayerWithLedgerBalance[msg.sender] >= _amountInRps, "You dont have enough funds deposited in this contract!");
+        require(_amountInRps % ethRpsRatio == 0, "Amount of RPS to export or import has to be whole wei!");
+        linkPlayerWithLedgerBalance[msg.sender] -= _amountInRps;
+        rpsToken.createNewTokensForGame{value: _amountInRps / ethRpsRatio}(msg.sender, _amountInRps);
+        emit tokensExportedEvent(msg.sender, _amountInRps);
+    }
+
+    function importTokens(uint256 _amountInRps) public {
+        require(internalLedgerEnabled, "Internal ledger is disabled, your funds are already RPS tokens!");
+        require(_amountInRps % ethRpsRatio == 0, "Amount of RPS to export or import has to be whole wei!");
+        rpsToken.destroyTokens(msg.sender, _amountInRps, payable(address(this)), _amountInRps / ethRpsRatio);
+        linkPlayerWithLedgerBalance[msg.sender] += _amountInRps;
+        emit tokensImportedEvent(msg.sender, _amountInRps);
+    }
+
     function getDepositedFundsValue(address _userToCheck) public view returns(uint256) {
+        if (internalLedgerEnabled){
+            return linkPlayerWithLedgerBalance[_userToCheck];
+        }
         return rpsToken.balanceOf(_userToCheck);
     }
 
+    function isInternalLedgerEnabled() public view returns(bool) {
+        return internalLedgerEnabled;
+    }
+
     function getEthRpsRatio() public view returns(uint256) {
         return ethRpsRatio;
     }
 
     function getLowBidValue() public view returns(uint256) {
-        return lowBid;
+        return linkBidWithValues[RPS_AVAILABLE_BID.LOW_BID];
     }
 
     function getMediumBidValue() public view returns(uint256) {
-        return mediumBid;
+        return linkBidWithValues[RPS_AVAILABLE_BID.MEDIUM_BID];
     }
 
     function getHighBidValue() public view returns(uint256) {
-        return highBid;
+        return linkBidWithValues[RPS_AVAILABLE_BID.HIGH_BID];
     }
 
     function updateLowBidValue(uint256 _newValue) public onlyOwner {
-        lowBid = _newValue;
-        linkBidWithValues[RPS_AVAILABLE_BID.LOW_BID] = _newValue;
+        updateBidValue(RPS_AVAILABLE_BID.LOW_BID, _newValue);
     }
 
     function updateMediumBidValue(uint256 _newValue) public onlyOwner {
-        mediumBid = _newValue;
-        linkBidWithValues[RPS_AVAILABLE_BID.MEDIUM_BID] = _newValue;
+        updateBidValue(RPS_AVAILABLE_BID.MEDIUM_BID, _newValue);
     }
 
     function updateHighBidValue(uint256 _newValue) public onlyOwner {
-        highBid = _newValue;
-        linkBidWithValues[RPS_AVAILABLE_BID.HIGH_BID] = _newValue;
+        updateBidValue(RPS_AVAILABLE_BID.HIGH_BID, _newValue);
+    }
+
+    function updateBidValue(RPS_AVAILABLE_BID _bid, uint256 _newValue) internal {
+        linkBidWithValues[_bid] = _newValue;
+        emit bidValueUpdatedEvent(_bid, _newValue);
     }
 
     function getLinkBidWithValues(RPS_AVAILABLE_BID _bid) public view returns(uint256){
         return linkBidWithValues[_bid];
     }
 
+    function getGameConfig() public view
+        returns(uint256 _ethRpsRatio, uint256[3] memory _bidValues, bool _internalLedgerEnabled){
+        _bidValues = [
+            linkBidWithValues[RPS_AVAILABLE_BID.LOW_BID],
+            linkBidWithValues[RPS_AVAILABLE_BID.MEDIUM_BID],
+            linkBidWithValues[RPS_AVAILABLE_BID.HIGH_BID]
+        ];
+        return (ethRpsRatio, _bidValues, internalLedgerEnabled);
+    }
+
+    function getPlayersState(address[] calldata _players) public view
+        returns(uint256[] memory _depositedFunds, bool[] memory _inQueue){
+        _depositedFunds = new uint256[](_players.length);
+        _inQueue = new bool[](_players.length);
+        for (uint256 i = 0; i < _players.length; i++) {
+            _depositedFunds[i] = getDepositedFundsValue(_players[i]);
+            _inQueue[i] = linkPlayerWithQueueEntry[_players[i]].isWaiting;
+        }
+    }
+
     function isPlayerInQueue(address _playerToCheck) public view returns(bool){
-        return isPlayerWaitingForMatch[_playerToCheck];
+        return linkPlayerWithQueueEntry[_playerToCheck].isWaiting;
+    }
+
+    function getQueueDepth(RPS_AVAILABLE_BID _bid) public view returns(uint256){
+        return linkBidWithWaitingPlayer[_bid].playerAddress == address(0x0) ? 0 : 1;
+    }
+
+    // lets routers check allowance of the waiting player, who pays with transferFrom if they lose
+    function getWaitingPlayerAddress(RPS_AVAILABLE_BID _bid) public view returns(address){
+        return linkBidWithWaitingPlayer[_bid].playerAddress;
+    }
+
+    function getQueueDepths() public view returns(uint256[3] memory){
+        return [
+            getQueueDepth(RPS_AVAILABLE_BID.LOW_BID),
+            getQueueDepth(RPS_AVAILABLE_BID.MEDIUM_BID),
+            getQueueDepth(RPS_AVAILABLE_BID.HIGH_BID)
+        ];
     }
 
     function joinGame(RPS_AVAILABLE_SYMBOL _chosenSymbol, RPS_AVAILABLE_BID _chosenBid) public{
-        require(getDepositedFundsValue(msg.sender) >= getLinkBidWithValues(_chosenBid), "You dont have enough funds to join game with this bid!");
-        require(isPlayerWaitingForMatch[msg.sender] == false, "You cant wait for 2 games at the same time! Quite queue or wait for match!");
+        uint256 bidValue = linkBidWithValues[_chosenBid];
+        require(getDepositedFundsValue(msg.sender) >= bidValue, "You dont have enough funds to join game with this bid!");
+        require(linkPlayerWithQueueEntry[msg.sender].isWaiting == false, "You cant wait for 2 games at the same time! Quite queue or wait for match!");
+        WaitingPlayer memory waitingPlayer = linkBidWithWaitingPlayer[_chosenBid];
         // no waiting player with selected bid
-        if (linkBidWithWaitingPlayerAddress[_chosenBid] == address(0x0)){
-            linkBidWithWaitingPlayerAddress[_chosenBid] = msg.sender;
-            linkAddressOfWaitingPlayerWithChosenMark[msg.sender] = _chosenSymbol;
-            isPlayerWaitingForMatch[msg.sender] = true;
+        if (waitingPlayer.playerAddress == address(0x0)){
+            linkBidWithWaitingPlayer[_chosenBid] = WaitingPlayer(msg.sender, _chosenSymbol);
+            linkPlayerWithQueueEntry[msg.sender] = QueueEntry(true, _chosenBid);
             emit joinedQueueEvent(msg.sender, _chosenBid);
         } else { //there is waiting player for selected bid
-            address _player1 = linkBidWithWaitingPlayerAddress[_chosenBid];
-            delete linkBidWithWaitingPlayerAddress[_chosenBid];
-            RPS_AVAILABLE_SYMBOL _chosenSymbol1 = linkAddressOfWaitingPlayerWithChosenMark[_player1];
-            delete linkAddressOfWaitingPlayerWithChosenMark[_player1];
-            delete isPlayerWaitingForMatch[_player1];
+            delete linkBidWithWaitingPlayer[_chosenBid];
+            delete linkPlayerWithQueueEntry[waitingPlayer.playerAddress];
             emit joinedQueueEvent(msg.sender, _chosenBid);
-            chooseWinnerAndTransferReward(_player1, _chosenSymbol1, msg.sender, _chosenSymbol, _chosenBid);
+            chooseWinnerAndTransferReward(waitingPlayer.playerAddress, waitingPlayer.chosenSymbol, msg.sender, _chosenSymbol, _chosenBid, bidValue);
         }
     }
 
+    function joinGameWithPermit(
+        RPS_AVAILABLE_SYMBOL _chosenSymbol,
+        RPS_AVAILABLE_BID _chosenBid,
+        uint256 _permitValue,
+        uint256 _deadline,
+        uint8 _v,
+        bytes32 _r,
+        bytes32 _s) public {
+        // permit may be already used by someone who saw it in mempool, then allowance is already set
+        try rpsToken.permit(msg.sender, address(this), _permitValue, _deadline, _v, _r, _s) {
+        } catch {
+            require(rpsToken.allowance(msg.sender, address(this)) >= _permitValue, "Permit signature is invalid!");
+        }
+        joinGame(_chosenSymbol, _chosenBid);
+    }
+
     function chooseWinnerAndTransferReward(
         address _player1,
         RPS_AVAILABLE_SYMBOL _chosenSymbol1,
         address _player2,
         RPS_AVAILABLE_SYMBOL _chosenSymbol2,
-        RPS_AVAILABLE_BID _chosenBid) internal {
-        string memory matchResult;
-        if (_chosenSymbol1 == RPS_AVAILABLE_SYMBOL.ROCK){
-            if (_chosenSymbol2 == RPS_AVAILABLE_SYMBOL.PAPER){
-                rpsToken.transferFrom(_player1, _player2, linkBidWithValues[_chosenBid]);
-                matchResult = 'Winner: player2';
-            } else if (_chosenSymbol2 == RPS_AVAILABLE_SYMBOL.SCISSORS){
-                rpsToken.transferFrom(_player2, _player1, linkBidWithValues[_chosenBid]);
-                matchResult = 'Winner: player1';
-            } else {
-                matchResult = 'Draw';
-            }
-        } else if (_chosenSymbol1 == RPS_AVAILABLE_SYMBOL.PAPER){
-            if (_chosenSymbol2 == RPS_AVAILABLE_SYMBOL.ROCK){
-                rpsToken.transferFrom(_player2, _player1, linkBidWithValues[_chosenBid]);
-                matchResult = 'Winner: player1';
-            } else if (_chosenSymbol2 == RPS_AVAILABLE_SYMBOL.SCISSORS){
-                rpsToken.transferFrom(_player1, _player2, linkBidWithValues[_chosenBid]);
-                matchResult = 'Winner: player2';
-            } else {
-                matchResult = 'Draw';
-            }
-        } else if (_chosenSymbol1 == RPS_AVAILABLE_SYMBOL.SCISSORS){
-            if (_chosenSymbol2 == RPS_AVAILABLE_SYMBOL.ROCK){
-                rpsToken.transferFrom(_player1, _player2, linkBidWithValues[_chosenBid]);
-                matchResult = 'Winner: player2';
-            } else if (_chosenSymbol2 == RPS_AVAILABLE_SYMBOL.PAPER){
-                rpsToken.transferFrom(_player2, _player1, linkBidWithValues[_chosenBid]);
-                matchResult = 'Winner: player1';
+        RPS_AVAILABLE_BID _chosenBid,
+        uint256 _bidValue) internal {
+        // ROCK < PAPER < SCISSORS < ROCK, so symbol which is one step ahead (mod 3) wins
+        RPS_MATCH_RESULT matchResult = RPS_MATCH_RESULT((3 + uint8(_chosenSymbol1) - uint8(_chosenSymbol2)) % 3);
+        if (matchResult == RPS_MATCH_RESULT.PLAYER1_WON){
+            transferReward(_player2, _player1, _bidValue);
+        } else if (matchResult == RPS_MATCH_RESULT.PLAYER2_WON){
+            transferReward(_player1, _player2, _bidValue);
+        }
+        emit matchEndedEvent(_player1, _chosenSymbol1, _player2, _chosenSymbol2, _chosenBid, matchResult);
+    }
+
+    function transferReward(address _loser, address _winner, uint256 _bidValue) internal {
+        if (internalLedgerEnabled){
+            linkPlayerWithLedgerBalance[_loser] -= _bidValue;
+            linkPlayerWithLedgerBalance[_winner] += _bidValue;
+        } else {
+            rpsToken.transferFrom(_loser, _winner, _bidValue);
+        }
+    }
+
+    function cancelBatchMoves() public {
+        linkPlayerWithBatchMoveNonce[msg.sender]++;
+    }
+
+    function getBatchMoveNonce(address _playerToCheck) public view returns(uint256){
+        return linkPlayerWithBatchMoveNonce[_playerToCheck];
+    }
+
+    function getDomainSeparator() public view returns(bytes32){
+        // built from address(this) on every call, clones created by RPS_GameFactory share code of implementation
+        return keccak256(abi.encode(DOMAIN_TYPEHASH, keccak256(bytes("RPS_Game")), keccak256(bytes("1")), block.chainid, address(this)));
+    }
+
+    // invalid codes are mistake of the owner and revert the batch, matches which players made unplayable
+    // (cancelled moves, moved funds, lowered allowance, expired deadline) are skipped, so they cant block the batch
+    function settleMatches(bytes calldata _packedMatches) public onlyOwner {
+        require(_packedMatches.length % PACKED_MATCH_LENGTH == 0, "Packed matches length have to be multiple of 181 bytes!");
+        uint256[3] memory bidValues = [
+            linkBidWithValues[RPS_AVAILABLE_BID.LOW_BID],
+            linkBidWithValues[RPS_AVAILABLE_BID.MEDIUM_BID],
+            linkBidWithValues[RPS_AVAILABLE_BID.HIGH_BID]
+        ];
+        bytes32 domainSeparator = getDomainSeparator();
+        for (uint256 offset = 0; offset < _packedMatches.length; offset += PACKED_MATCH_LENGTH) {
+            BatchMatch memory batchMatch = decodePackedMatch(_packedMatches, offset, bidValues);
+            if (isBatchMatchPlayable(batchMatch) &&
+                isBatchMoveSigned(batchMatch, true, _packedMatches, offset + PACKED_MATCH_CODES_LENGTH, domainSeparator) &&
+                isBatchMoveSigned(batchMatch, false, _packedMatches, offset + PACKED_MATCH_CODES_LENGTH + PACKED_MOVE_LENGTH, domainSeparator)) {
+                linkPlayerWithBatchMoveNonce[batchMatch.player1]++;
+                linkPlayerWithBatchMoveNonce[batchMatch.player2]++;
+                chooseWinnerAndTransferReward(batchMatch.player1, batchMatch.symbol1, batchMatch.player2,
+                    batchMatch.symbol2, batchMatch.bid, batchMatch.bidValue);
             } else {
-                matchResult = 'Draw';
+                emit matchSkippedEvent(batchMatch.player1, batchMatch.player2, offset / PACKED_MATCH_LENGTH);
             }
         }
-        emit matchEndedEvent(_player1, _chosenSymbol1, _player2, _chosenSymbol2, _chosenBid, matchResult);
     }
 
-    function quiteQueue() public {
-        require(isPlayerWaitingForMatch[msg.sender] == true, "You cant quite queue, if you arent in it!");
-        if (linkBidWithWaitingPlayerAddress[RPS_AVAILABLE_BID.LOW_BID] == msg.sender){
-            delete linkBidWithWaitingPlayerAddress[RPS_AVAILABLE_BID.LOW_BID];
-            emit quiteQueueEvent(msg.sender, RPS_AVAILABLE_BID.LOW_BID);
-        } else if (linkBidWithWaitingPlayerAddress[RPS_AVAILABLE_BID.MEDIUM_BID] == msg.sender){
-            delete linkBidWithWaitingPlayerAddress[RPS_AVAILABLE_BID.MEDIUM_BID];
-            emit quiteQueueEvent(msg.sender, RPS_AVAILABLE_BID.MEDIUM_BID);
-        } else if (linkBidWithWaitingPlayerAddress[RPS_AVAILABLE_BID.HIGH_BID] == msg.sender) {
-            delete linkBidWithWaitingPlayerAddress[RPS_AVAILABLE_BID.HIGH_BID];
-            emit quiteQueueEvent(msg.sender, RPS_AVAILABLE_BID.HIGH_BID);
+    function isBatchMatchPlayable(BatchMatch memory _batchMatch) internal view returns(bool) {
+        if (_batchMatch.player1 == _batchMatch.player2 ||
+            linkPlayerWithQueueEntry[_batchMatch.player1].isWaiting ||
+            linkPlayerWithQueueEntry[_batchMatch.player2].isWaiting ||
+            getDepositedFundsValue(_batchMatch.player1) < _batchMatch.bidValue ||
+            getDepositedFundsValue(_batchMatch.player2) < _batchMatch.bidValue) {
+            return false;
+        }
+        if (internalLedgerEnabled || _batchMatch.symbol1 == _batchMatch.symbol2) {
+            return true;
+        }
+        // loser pays with transferFrom, which would revert the whole batch without allowance
+        address loser = (3 + uint8(_batchMatch.symbol1) - uint8(_batchMatch.symbol2)) % 3 == uint8(RPS_MATCH_RESULT.PLAYER1_WON)
+            ? _batchMatch.player2 : _batchMatch.player1;
+        return rpsToken.allowance(loser, address(this)) >= _batchMatch.bidValue;
+    }
+
+    function isBatchMoveSigned(
+        BatchMatch memory _batchMatch,
+        bool _isPlayer1,
+        bytes calldata _packedMatches,
+        uint256 _moveOffset,
+        bytes32 _domainSeparator) internal view returns(bool) {
+        uint256 deadline;
+        bytes32 r;
+        bytes32 s;
+        uint8 v;
+        assembly {
+            let pointer := add(_packedMatches.offset, _moveOffset)
+            deadline := shr(216, calldataload(pointer))
+            r := calldataload(add(pointer, 5))
+            s := calldataload(add(pointer, 37))
+            v := byte(0, calldataload(add(pointer, 69)))
+        }
+        // ECDSA.recover reverts on malformed signature, which would let one player block the batch
+        if (block.timestamp > deadline || uint256(s) > MAX_SIGNATURE_S || (v != 27 && v != 28)) {
+            return false;
         }
-        delete isPlayerWaitingForMatch[msg.sender];
-        delete linkAddressOfWaitingPlayerWithChosenMark[msg.sender];
+        bytes32 digest = keccak256(abi.encodePacked("\x19\x01", _domainSeparator, hashBatchMove(_batchMatch, _isPlayer1, deadline)));
+        address signer = ecrecover(digest, v, r, s);
+        return signer != address(0) && signer == (_isPlayer1 ? _batchMatch.player1 : _batchMatch.player2);
+    }
+
+    function hashBatchMove(BatchMatch memory _batchMatch, bool _isPlayer1, uint256 _deadline) internal view returns(bytes32) {
+        address player = _isPlayer1 ? _batchMatch.player1 : _batchMatch.player2;
+        return keccak256(abi.encode(
+            BATCH_MOVE_TYPEHASH,
+            linkPlayerWithBatchMoveNonce[player],
+            _isPlayer1 ? _batchMatch.player2 : _batchMatch.player1,
+            _isPlayer1 ? _batchMatch.symbol1 : _batchMatch.symbol2,
+            _batchMatch.bid,
+            _batchMatch.bidValue,
+            _deadline));
+    }
+
+    function decodePackedMatch(bytes calldata _packedMatches, uint256 _offset, uint256[3] memory _bidValues) internal pure
+        returns(BatchMatch memory) {
+        address player1;
+        address player2;
+        uint8 codes;
+        assembly {
+            let pointer := add(_packedMatches.offset, _offset)
+            player1 := shr(96, calldataload(pointer))
+            player2 := shr(96, calldataload(add(pointer, 20)))
+            codes := byte(0, calldataload(add(pointer, 40)))
+        }
+        require((codes & 0x03) < 3 && ((codes >> 2) & 0x03) < 3 && (codes >> 4) < 3, "Packed match has invalid symbol or bid code!");
+        return BatchMatch(player1, player2, RPS_AVAILABLE_SYMBOL(codes & 0x03), RPS_AVAILABLE_SYMBOL((codes >> 2) & 0x03),
+            RPS_AVAILABLE_BID(codes >> 4), _bidValues[codes >> 4]);
+    }
+
+    function quiteQueue() public {
+        QueueEntry memory queueEntry = linkPlayerWithQueueEntry[msg.sender];
+        require(queueEntry.isWaiting == true, "You cant quite queue, if you arent in it!");
+        delete linkBidWithWaitingPlayer[queueEntry.chosenBid];
+        delete linkPlayerWithQueueEntry[msg.sender];
+        emit quiteQueueEvent(msg.sender, queueEntry.chosenBid);
     }
 }
\ No newline at end of file
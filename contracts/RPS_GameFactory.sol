@@ -0,0 +1,40 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.0;
+
+import "./RPS_Game.sol";
+import "@openzeppelin/contracts/proxy/Clones.sol";
+import "@openzeppelin/contracts/access/Ownable.sol";
+
+contract RPS_GameFactory is Ownable{
+    // every shard is EIP-1167 proxy delegating to this game, so it shares its RPS_Token and ledger mode
+    address public immutable gameImplementation;
+    RPS_Token public immutable rpsToken;
+    address[] private shards;
+
+    event shardCreatedEvent(address indexed _shardAddress, uint256 _shardIndex);
+
+    constructor(address _gameImplementation){
+        gameImplementation = _gameImplementation;
+        rpsToken = RPS_Game(payable(_gameImplementation)).rpsToken();
+    }
+
+    function createShards(uint256 _shardsCount) public onlyOwner returns(address[] memory _newShards){
+        _newShards = new address[](_shardsCount);
+        for (uint256 i = 0; i < _shardsCount; i++) {
+            address shard = Clones.clone(gameImplementation);
+            RPS_Game(payable(shard)).initialize(owner());
+            rpsToken.registerRPSGame(shard);
+            shards.push(shard);
+            _newShards[i] = shard;
+            emit shardCreatedEvent(shard, shards.length - 1);
+        }
+    }
+
+    function getShards() public view returns(address[] memory){
+        return shards;
+    }
+
+    function getShardsCount() public view returns(uint256){
+        return shards.length;
+    }
+}
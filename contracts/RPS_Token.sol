@@ -2,22 +2,33 @@
 pragma solidity ^0.8.0;
 
 import "@openzeppelin/contracts/token/ERC20/ERC20.sol";
+import "@openzeppelin/contracts/token/ERC20/extensions/draft-ERC20Permit.sol";
+import "@openzeppelin/contracts/utils/Address.sol";
 
-contract RPS_Token is ERC20 {
+contract RPS_Token is ERC20, ERC20Permit {
     address private rpsGameAddress;
     address private ownerAddress;
+    // games cloned by RPS_GameFactory, all of them share this token
+    address private rpsGameFactoryAddress;
+    mapping(address => bool) private isRegisteredRpsGame;
 
-    constructor() ERC20('RPS_Token', 'RPS'){
+    // game address can be known before deployment (deployer nonce), so wiring needs no extra transaction
+    constructor(address _rpsGameAddress) ERC20('RPS_Token', 'RPS') ERC20Permit('RPS_Token'){
         _mint(msg.sender, 1000000000000000000);
         ownerAddress = msg.sender;
+        rpsGameAddress = _rpsGameAddress;
     }
 
-    function createNewTokensForGame(address _addressToTransfer, uint256 _amount) external onlyRpsGame(msg.sender){
+    // token is the ETH vault of all games, games send ETH backing minted tokens and burning tokens pays it out,
+    // so no game or shard can pay out ETH deposited in other one for tokens still in circulation
+    function createNewTokensForGame(address _addressToTransfer, uint256 _amount) external payable onlyRpsGame(msg.sender){
         _mint(_addressToTransfer, _amount);
     }
 
-    function destroyTokens(address _addressToTransfer, uint256 _amount) external onlyRpsGame(msg.sender){
+    function destroyTokens(address _addressToTransfer, uint256 _amount, address payable _ethReceiver, uint256 _amountInEth)
+        external onlyRpsGame(msg.sender){
         _burn(_addressToTransfer, _amount);
+        Address.sendValue(_ethReceiver, _amountInEth);
     }
 
     function setRPSGameAddress(address _rpsGameAddress) public {
@@ -25,8 +36,22 @@ contract RPS_Token is ERC20 {
         rpsGameAddress = _rpsGameAddress;
     }
 
+    function setRPSGameFactoryAddress(address _rpsGameFactoryAddress) public {
+        require(msg.sender == ownerAddress, "To call this function you need to be owner of this contract!");
+        rpsGameFactoryAddress = _rpsGameFactoryAddress;
+    }
+
+    function registerRPSGame(address _rpsGameAddress) external {
+        require(msg.sender == rpsGameFactoryAddress, "This function can call only RPS Game factory contract!");
+        isRegisteredRpsGame[_rpsGameAddress] = true;
+    }
+
+    function isRPSGame(address _addressToCheck) public view returns(bool){
+        return _addressToCheck == rpsGameAddress || isRegisteredRpsGame[_addressToCheck];
+    }
+
     modifier onlyRpsGame(address _addressToCheck){
-        require(_addressToCheck == rpsGameAddress, "This function can call only RPS Game contract!");
+        require(isRPSGame(_addressToCheck), "This function can call only RPS Game contract!");
         _;
     }
 }
\ No newline at end of file
@@ -0,0 +1,96 @@
+from scripts.helpful_scripts import sign_typed_data_hash
+from scripts.rps_abi import encode_abi
+from web3 import Web3
+
+MATCH_CODES_LENGTH = 41
+DEADLINE_LENGTH = 5
+SIGNATURE_LENGTH = 65
+MOVE_LENGTH = DEADLINE_LENGTH + SIGNATURE_LENGTH
+# match codes followed by deadline and signature of both players
+PACKED_MATCH_LENGTH = MATCH_CODES_LENGTH + 2 * MOVE_LENGTH
+BATCH_MOVE_TYPEHASH = Web3.keccak(
+    text="BatchMove(uint256 nonce,address opponent,uint8 symbol,uint8 bid,uint256 bidValue,uint256 deadline)")
+
+
+def hash_batch_move(nonce, opponent, symbol, bid, bid_value, deadline):
+    return Web3.keccak(encode_abi(["bytes32", "uint256", "address", "uint8", "uint8", "uint256", "uint256"],
+                                  [BATCH_MOVE_TYPEHASH, nonce, str(opponent), symbol, bid, bid_value, deadline]))
+
+
+def sign_batch_move(rps_game, player_account, opponent, symbol, bid, deadline, nonce=None, bid_value=None):
+    """Signs move of player against opponent, returns (deadline, v, r, s) accepted by settleMatches.
+
+    Signature covers the current value of the bid, so the move is skipped when owner changes it before settlement.
+    Nonce of player grows with every settled move, so every further move in one batch needs next nonce.
+    """
+    nonce = rps_game.getBatchMoveNonce(player_account.address) if nonce is None else nonce
+    bid_value = rps_game.getLinkBidWithValues(bid) if bid_value is None else bid_value
+    v, r, s = sign_typed_data_hash(player_account, rps_game.getDomainSeparator(),
+                                   hash_batch_move(nonce, opponent, symbol, bid, bid_value, deadline))
+    return deadline, v, r, s
+
+
+def sign_matches(rps_game, matches, deadline):
+    # matches are (player_1_account, player_1_symbol, player_2_account, player_2_symbol, bid) tuples
+    nonces = {}
+    signed_matches = []
+    for player_1, player_1_symbol, player_2, player_2_symbol, bid in matches:
+        moves = []
+        for player, opponent, symbol in ((player_1, player_2, player_1_symbol), (player_2, player_1, player_2_symbol)):
+            if player.address not in nonces:
+                nonces[player.address] = rps_game.getBatchMoveNonce(player.address)
+            moves.append(sign_batch_move(rps_game, player, opponent.address, symbol, bid, deadline, nonces[player.address]))
+            nonces[player.address] += 1
+        signed_matches.append((player_1.address, player_1_symbol, player_2.address, player_2_symbol, bid, *moves))
+    return signed_matches
+
+
+def pack_match(player_1, player_1_symbol, player_2, player_2_symbol, bid, player_1_move, player_2_move):
+    for code in (player_1_symbol, player_2_symbol, bid):
+        if code not in (0, 1, 2):
+            raise ValueError(f"Symbol and bid codes have to be 0, 1 or 2, got {code}")
+    codes = player_1_symbol | (player_2_symbol << 2) | (bid << 4)
+    return address_to_bytes(player_1) + address_to_bytes(player_2) + bytes([codes]) + \
+        move_to_bytes(player_1_move) + move_to_bytes(player_2_move)
+
+
+def pack_matches(signed_matches):
+    # signed matches are (player_1, player_1_symbol, player_2, player_2_symbol, bid, player_1_move, player_2_move)
+    # tuples with (deadline, v, r, s) moves
+    return b"".join(pack_match(*match) for match in signed_matches)
+
+
+def unpack_matches(packed_matches):
+    if len(packed_matches) % PACKED_MATCH_LENGTH:
+        raise ValueError(f"Packed matches length has to be multiple of {PACKED_MATCH_LENGTH} bytes")
+    matches = []
+    for offset in range(0, len(packed_matches), PACKED_MATCH_LENGTH):
+        codes = packed_matches[offset + 40]
+        moves_offset = offset + MATCH_CODES_LENGTH
+        matches.append(("0x" + packed_matches[offset:offset + 20].hex(), codes & 0x03,
+                        "0x" + packed_matches[offset + 20:offset + 40].hex(), (codes >> 2) & 0x03,
+                        codes >> 4,
+                        bytes_to_move(packed_matches[moves_offset:moves_offset + MOVE_LENGTH]),
+                        bytes_to_move(packed_matches[moves_offset + MOVE_LENGTH:offset + PACKED_MATCH_LENGTH])))
+    return matches
+
+
+def address_to_bytes(address):
+    address_bytes = bytes.fromhex(str(address)[2:])
+    if len(address_bytes) != 20:
+        raise ValueError(f"{address} is not a valid address")
+    return address_bytes
+
+
+def move_to_bytes(move):
+    deadline, v, r, s = move
+    return deadline.to_bytes(DEADLINE_LENGTH, "big") + bytes(r) + bytes(s) + bytes([v])
+
+
+def bytes_to_move(move_bytes):
+    signature = move_bytes[DEADLINE_LENGTH:]
+    return int.from_bytes(move_bytes[:DEADLINE_LENGTH], "big"), signature[64], signature[:32], signature[32:64]
+
+
+def settle_matches(rps_game, signed_matches, owner_acc):
+    return rps_game.settleMatches(pack_matches(signed_matches), {"from": owner_acc})
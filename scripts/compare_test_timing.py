@@ -0,0 +1,51 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ElementTree
+from pathlib import Path
+
+TEST_PATH = "tests/unit"
+
+
+def run_test_suite(extra_args, junit_path):
+    command = ["brownie", "test", TEST_PATH, f"--junitxml={junit_path}"] + extra_args
+    start = time.perf_counter()
+    result = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    elapsed = time.perf_counter() - start
+    test_cases = ElementTree.parse(junit_path).getroot().iter("testcase")
+    test_times = [float(test_case.get("time", 0)) for test_case in test_cases]
+    return {
+        "returncode": result.returncode,
+        "wall_time": elapsed,
+        "tests": len(test_times),
+        "mean_test_time": sum(test_times) / len(test_times) if test_times else 0.0,
+    }
+
+
+def print_timing_report(per_test_deploy, shared_deploy, parallel_shared_deploy, workers):
+    print(f"{'mode':<24}{'tests':>8}{'wall [s]':>12}{'mean/test [s]':>16}")
+    runs = (("deploy per test", per_test_deploy), ("shared fixture", shared_deploy),
+            (f"shared fixture, {workers} workers", parallel_shared_deploy))
+    for name, run in runs:
+        print(f"{name:<24}{run['tests']:>8}{run['wall_time']:>12.2f}{run['mean_test_time']:>16.3f}")
+    if shared_deploy["wall_time"] > 0:
+        print(f"speedup: {per_test_deploy['wall_time'] / shared_deploy['wall_time']:.2f}x")
+    if parallel_shared_deploy["wall_time"] > 0:
+        print(f"parallel speedup: {shared_deploy['wall_time'] / parallel_shared_deploy['wall_time']:.2f}x")
+
+
+def main(workers=None):
+    workers = int(workers or os.cpu_count())
+    with tempfile.TemporaryDirectory() as report_dir:
+        per_test_deploy = run_test_suite(["--deploy-per-test"], Path(report_dir) / "per_test.xml")
+        shared_deploy = run_test_suite([], Path(report_dir) / "shared.xml")
+        parallel_shared_deploy = run_test_suite(["-n", str(workers)], Path(report_dir) / "parallel.xml")
+    print_timing_report(per_test_deploy, shared_deploy, parallel_shared_deploy, workers)
+    if per_test_deploy["returncode"] or shared_deploy["returncode"] or parallel_shared_deploy["returncode"]:
+        sys.exit("Test suite failed in at least one mode, timings are not comparable!")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:2])
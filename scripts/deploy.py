@@ -1,28 +1,118 @@
-from scripts.helpful_scripts import get_account
-from brownie import RPS_Game, RPS_Token, config, network
+import hashlib
+import json
+from pathlib import Path
+from scripts.helpful_scripts import NON_FORKED_LOCAL_BLOCKCHAIN_ENVIRONMENTS, get_account
+from brownie import RPS_Game, RPS_GameFactory, RPS_Token, config, network, web3
+from web3 import Web3
 
-def deploy_rps_token_and_game():
+MANIFEST_DIRECTORY = Path("deployments")
+FLATTEN_CACHE_PATH = Path(".flatten_cache.json")
+
+def get_manifest_path():
+    return MANIFEST_DIRECTORY / f"{network.show_active()}.json"
+
+def get_bytecode_hash(contract_container):
+    return Web3.keccak(hexstr=contract_container.bytecode).hex()
+
+def load_manifest():
+    manifest_path = get_manifest_path()
+    if not manifest_path.exists():
+        return {}
+    with open(manifest_path) as f:
+        return json.load(f)
+
+def write_manifest(rps_token, rps_game, internal_ledger_enabled):
+    manifest = {
+        "RPS_Token": {"address": rps_token.address, "bytecode_hash": get_bytecode_hash(RPS_Token)},
+        "RPS_Game": {"address": rps_game.address, "bytecode_hash": get_bytecode_hash(RPS_Game),
+                     "internal_ledger_enabled": internal_ledger_enabled},
+    }
+    get_manifest_path().parent.mkdir(parents=True, exist_ok=True)
+    with open(get_manifest_path(), 'w') as f:
+        json.dump(manifest, f, indent=2)
+        f.write("\n")
+
+def load_reusable_deployment(internal_ledger_enabled):
+    # token and game are reused only together, game points to its token by immutable address and token lets
+    # only the game registered at its deployment mint and burn, so a fresh half could not work with the old one
+    manifest = load_manifest()
+    token_entry, game_entry = manifest.get("RPS_Token"), manifest.get("RPS_Game")
+    if token_entry is None or game_entry is None:
+        return None
+    if token_entry["bytecode_hash"] != get_bytecode_hash(RPS_Token) or \
+            game_entry["bytecode_hash"] != get_bytecode_hash(RPS_Game) or \
+            game_entry["internal_ledger_enabled"] != internal_ledger_enabled:
+        return None
+    if len(web3.eth.get_code(token_entry["address"])) == 0 or len(web3.eth.get_code(game_entry["address"])) == 0:
+        return None
+    return RPS_Token.at(token_entry["address"]), RPS_Game.at(game_entry["address"])
+
+def deploy_rps_token_and_game(internal_ledger_enabled=False, use_manifest=False):
     owner_acc = get_account()
-    rps_token = RPS_Token.deploy({'from': owner_acc},
+    if use_manifest:
+        deployment = load_reusable_deployment(internal_ledger_enabled)
+        if deployment is not None:
+            print(f"Bytecode unchanged, reusing RPS_Token and RPS_Game from {get_manifest_path()}")
+            return deployment + (owner_acc,)
+    # game is deployed right after token, so its address is known when token is deployed
+    rps_game_address = owner_acc.get_deployment_address(owner_acc.nonce + 1)
+    rps_token = RPS_Token.deploy(rps_game_address,
+                                 {'from': owner_acc},
                                  publish_source=config['networks']
                                  [network.show_active()]
                                  ['publish_source'])
     rps_game = RPS_Game.deploy(rps_token.address,
+                               internal_ledger_enabled,
                                {"from": owner_acc},
                                publish_source=config['networks']
                                [network.show_active()]
                                ['publish_source'])
-    rps_token.setRPSGameAddress(rps_game.address, {'from': owner_acc}).wait(1)
+    if rps_game.address != rps_game_address:
+        # other transaction of owner took the nonce in between
+        rps_token.setRPSGameAddress(rps_game.address, {'from': owner_acc}).wait(1)
+    if use_manifest:
+        write_manifest(rps_token, rps_game, internal_ledger_enabled)
     return rps_token, rps_game, owner_acc
 
-def generate_flattern_contrac():
-    f = open("./rps_token.txt", 'w')
-    f.write(RPS_Token.get_verification_info()["flattened_source"])
-    f.close()
+def deploy_rps_game_shards(shards_count, internal_ledger_enabled=False):
+    # deployed game is implementation of shards and can still be played on itself
+    rps_token, rps_game, owner_acc = deploy_rps_token_and_game(internal_ledger_enabled)
+    rps_game_factory = RPS_GameFactory.deploy(rps_game.address,
+                                              {"from": owner_acc},
+                                              publish_source=config['networks']
+                                              [network.show_active()]
+                                              ['publish_source'])
+    rps_token.setRPSGameFactoryAddress(rps_game_factory.address, {'from': owner_acc}).wait(1)
+    create_shards_tx = rps_game_factory.createShards(shards_count, {'from': owner_acc})
+    create_shards_tx.wait(1)
+    shards = [RPS_Game.at(event['_shardAddress']) for event in create_shards_tx.events['shardCreatedEvent']]
+    return rps_token, rps_game_factory, shards, owner_acc
 
-    f2 = open("./rps_game.txt", 'w')
-    f2.write(RPS_Game.get_verification_info()["flattened_source"])
-    f2.close()
+def get_source_hash(contract_container):
+    # None when some source cant be read, its change would go unnoticed, so cache is not used then
+    source_hash = hashlib.sha256()
+    for source_path in sorted(contract_container._build["allSourcePaths"].values()):
+        try:
+            source_hash.update(Path(source_path).expanduser().read_bytes())
+        except OSError:
+            return None
+    return source_hash.hexdigest()
+
+def generate_flattern_contrac():
+    # flattening is slow, so file is rewritten only when one of contract sources changed
+    flatten_cache = json.loads(FLATTEN_CACHE_PATH.read_text()) if FLATTEN_CACHE_PATH.exists() else {}
+    for output_path, contract_container in (("./rps_token.txt", RPS_Token), ("./rps_game.txt", RPS_Game)):
+        source_hash = get_source_hash(contract_container)
+        if source_hash is not None and flatten_cache.get(output_path) == source_hash and Path(output_path).exists():
+            continue
+        with open(output_path, 'w') as f:
+            f.write(contract_container.get_verification_info()["flattened_source"])
+        if source_hash is None:
+            flatten_cache.pop(output_path, None)
+        else:
+            flatten_cache[output_path] = source_hash
+    FLATTEN_CACHE_PATH.write_text(json.dumps(flatten_cache, indent=2) + "\n")
 
 def main():
-    deploy_rps_token_and_game()
\ No newline at end of file
+    # local chains start empty on every run, manifest of them would only point to contracts that are gone
+    deploy_rps_token_and_game(use_manifest=network.show_active() not in NON_FORKED_LOCAL_BLOCKCHAIN_ENVIRONMENTS)
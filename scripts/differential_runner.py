@@ -0,0 +1,85 @@
+import numpy as np
+from scripts.helpful_scripts import get_account
+from scripts.deploy import deploy_rps_token_and_game
+from scripts.reference_model import REJECTED, RPSGameModel, random_round
+from web3 import Web3
+
+PLAYERS_COUNT = 6
+PLAYER_DEPOSIT = Web3.toWei(20, 'ether')
+ROUNDS = 100000
+SAMPLE_SIZE = 30
+
+
+def simulate_rounds(rng, players_count, rounds):
+    # settles every round in reference model, returns all generated matches and their results as columns
+    model = RPSGameModel(players_count)
+    model.deposit(range(players_count), PLAYER_DEPOSIT)
+    generated_rounds = [random_round(rng, players_count) for _ in range(rounds)]
+    results = [model.play_matches(*generated_round) for generated_round in generated_rounds]
+    return [np.concatenate(column) for column in zip(*generated_rounds)] + [np.concatenate(results)]
+
+
+def sample_matches(rng, matches, sample_size):
+    # rejected matches would revert on chain, so only settled ones are replayed
+    settled_indices = np.flatnonzero(matches[-1] != REJECTED)
+    indices = np.sort(rng.choice(settled_indices, size=sample_size, replace=False))
+    return [tuple(int(column[index]) for column in matches) for index in indices]
+
+
+def split_into_rounds(matches):
+    # play_matches settles every player at most once per call, so new round starts when a player repeats
+    rounds = [[]]
+    round_players = set()
+    for match in matches:
+        if match[0] in round_players or match[2] in round_players:
+            rounds.append([])
+            round_players = set()
+        rounds[-1].append(match)
+        round_players.update((match[0], match[2]))
+    return rounds
+
+
+def create_model_for_game(rps_game, players_count):
+    return RPSGameModel(players_count,
+                        bid_values=[rps_game.getLinkBidWithValues(bid) for bid in range(3)],
+                        eth_rps_ratio=rps_game.getEthRpsRatio())
+
+
+def replay_matches(rps_token, rps_game, player_accounts, matches):
+    model = create_model_for_game(rps_game, len(player_accounts))
+    for player in player_accounts:
+        rps_game.depositFunds({"from": player, "value": PLAYER_DEPOSIT}).wait(1)
+        if not rps_game.isInternalLedgerEnabled():
+            rps_token.approve(rps_game.address, 2 ** 256 - 1, {"from": player}).wait(1)
+    model.deposit(range(len(player_accounts)), PLAYER_DEPOSIT)
+
+    # chain and model start from the same deposits, model settles every round with one play_matches call
+    for matches_round in split_into_rounds(matches):
+        model_results = model.play_matches(*list(zip(*matches_round))[:5])
+        for match, model_result in zip(matches_round, model_results):
+            player_1, symbol_1, player_2, symbol_2, bid, simulated_result = match
+            rps_game.joinGame(symbol_1, bid, {"from": player_accounts[player_1]}).wait(1)
+            join_tx = rps_game.joinGame(symbol_2, bid, {"from": player_accounts[player_2]})
+            join_tx.wait(1)
+            match_ended_event = join_tx.events['matchEndedEvent']
+            assert match_ended_event['_player1Address'] == player_accounts[player_1].address
+            assert match_ended_event['_player2Address'] == player_accounts[player_2].address
+            assert match_ended_event['_player1Symbol'] == symbol_1
+            assert match_ended_event['_player2Symbol'] == symbol_2
+            assert match_ended_event['_bidValue'] == bid
+            assert match_ended_event['_matchResult'] == model_result == simulated_result
+        for index, player in enumerate(player_accounts):
+            assert rps_game.getDepositedFundsValue(player.address) == model.balance_of(index)
+    # RPS_Token holds ETH of token mode deposits, RPS_Game of internal ledger ones
+    assert rps_game.balance() + rps_token.balance() == model.eth_held
+    return model
+
+
+def main():
+    rng = np.random.default_rng()
+    matches = simulate_rounds(rng, PLAYERS_COUNT, ROUNDS)
+    print(f"Reference model settled {matches[0].size} matches, replaying {SAMPLE_SIZE} of them on chain")
+    rps_token, rps_game, owner_acc = deploy_rps_token_and_game()
+    player_accounts = [get_account(index=index + 1) for index in range(PLAYERS_COUNT)]
+    replay_matches(rps_token, rps_game, player_accounts, sample_matches(rng, matches, SAMPLE_SIZE))
+    print("Chain state matches reference model")
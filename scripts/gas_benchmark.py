@@ -0,0 +1,170 @@
+import json
+from pathlib import Path
+from scripts.helpful_scripts import get_account
+from scripts.deploy import deploy_rps_token_and_game
+from scripts.batch_settlement import settle_matches, sign_matches
+from brownie import accounts, chain, config
+from web3 import Web3
+
+DEFAULT_BASELINE_PATH = "gas_baseline.json"
+DEFAULT_THRESHOLD_PERCENT = 2
+BATCH_SETTLEMENT_SIZE = 10
+SYMBOL_NAMES = ["rock", "paper", "scissors"]
+BID_NAMES = ["low", "medium", "high"]
+
+
+def get_benchmark_settings():
+    settings = config.get("gas_benchmark", {})
+    return (Path(settings.get("baseline", DEFAULT_BASELINE_PATH)),
+            float(settings.get("threshold_percent", DEFAULT_THRESHOLD_PERCENT)))
+
+
+def fund_players(rps_token, rps_game, players, amount_in_eth=20):
+    for player in players:
+        rps_game.depositFunds({"from": player, "value": Web3.toWei(amount_in_eth, 'ether')}).wait(1)
+        rps_token.approve(rps_game.address, rps_game.getHighBidValue(), {"from": player}).wait(1)
+
+
+def deposit_funds_scenario(rps_token, rps_game, owner_acc, player_1, player_2):
+    return rps_game.depositFunds({"from": player_1, "value": Web3.toWei(1, 'ether')})
+
+
+def withdraw_funds_scenario(rps_token, rps_game, owner_acc, player_1, player_2):
+    rps_game.depositFunds({"from": player_1, "value": Web3.toWei(1, 'ether')}).wait(1)
+    return rps_game.withdrawFunds({"from": player_1})
+
+
+def join_game_enqueue_scenario(rps_token, rps_game, owner_acc, player_1, player_2):
+    fund_players(rps_token, rps_game, [player_1])
+    return rps_game.joinGame(0, 0, {"from": player_1})
+
+
+def make_join_game_match_scenario(player_1_symbol, player_2_symbol):
+    def join_game_match_scenario(rps_token, rps_game, owner_acc, player_1, player_2):
+        fund_players(rps_token, rps_game, [player_1, player_2])
+        rps_game.joinGame(player_1_symbol, 0, {"from": player_1}).wait(1)
+        return rps_game.joinGame(player_2_symbol, 0, {"from": player_2})
+    return join_game_match_scenario
+
+
+def make_quite_queue_scenario(bid):
+    def quite_queue_scenario(rps_token, rps_game, owner_acc, player_1, player_2):
+        fund_players(rps_token, rps_game, [player_1])
+        rps_game.joinGame(0, bid, {"from": player_1}).wait(1)
+        return rps_game.quiteQueue({"from": player_1})
+    return quite_queue_scenario
+
+
+def make_update_bid_value_scenario(update_function_name):
+    def update_bid_value_scenario(rps_token, rps_game, owner_acc, player_1, player_2):
+        return getattr(rps_game, update_function_name)(Web3.toWei(2, 'ether'), {"from": owner_acc})
+    return update_bid_value_scenario
+
+
+def get_signing_players(owner_acc, amount_in_eth=21):
+    # moves are signed with private keys, fixed keys keep calldata and so gas the same between runs
+    players = [accounts.add(Web3.keccak(text=f"rps_gas_benchmark_player_{index}").hex()) for index in (1, 2)]
+    for player in players:
+        owner_acc.transfer(player, Web3.toWei(amount_in_eth, 'ether')).wait(1)
+    return players
+
+
+def batch_settlement_scenario(rps_token, rps_game, owner_acc, player_1, player_2):
+    player_1, player_2 = get_signing_players(owner_acc)
+    fund_players(rps_token, rps_game, [player_1, player_2])
+    matches = [(player_1, match_index % 3, player_2, (match_index // 3) % 3, 0)
+               for match_index in range(BATCH_SETTLEMENT_SIZE)]
+    return settle_matches(rps_game, sign_matches(rps_game, matches, chain.time() + 3600), owner_acc)
+
+
+def export_tokens_scenario(rps_token, rps_game, owner_acc, player_1, player_2):
+    rps_game.depositFunds({"from": player_1, "value": Web3.toWei(1, 'ether')}).wait(1)
+    return rps_game.exportTokens(rps_game.getLowBidValue(), {"from": player_1})
+
+
+def import_tokens_scenario(rps_token, rps_game, owner_acc, player_1, player_2):
+    rps_game.depositFunds({"from": player_1, "value": Web3.toWei(1, 'ether')}).wait(1)
+    rps_game.exportTokens(rps_game.getLowBidValue(), {"from": player_1}).wait(1)
+    return rps_game.importTokens(rps_game.getLowBidValue(), {"from": player_1})
+
+
+def get_scenarios(internal_ledger_enabled):
+    scenarios = {
+        "depositFunds": deposit_funds_scenario,
+        "withdrawFunds": withdraw_funds_scenario,
+        "joinGame_enqueue": join_game_enqueue_scenario,
+    }
+    for player_1_symbol, player_1_symbol_name in enumerate(SYMBOL_NAMES):
+        for player_2_symbol, player_2_symbol_name in enumerate(SYMBOL_NAMES):
+            scenarios[f"joinGame_match_{player_1_symbol_name}_vs_{player_2_symbol_name}"] = \
+                make_join_game_match_scenario(player_1_symbol, player_2_symbol)
+    for bid, bid_name in enumerate(BID_NAMES):
+        scenarios[f"quiteQueue_{bid_name}_bid"] = make_quite_queue_scenario(bid)
+    for bid_name in BID_NAMES:
+        update_function_name = f"update{bid_name.capitalize()}BidValue"
+        scenarios[update_function_name] = make_update_bid_value_scenario(update_function_name)
+    scenarios[f"settleMatches_{BATCH_SETTLEMENT_SIZE}"] = batch_settlement_scenario
+    if internal_ledger_enabled:
+        scenarios["exportTokens"] = export_tokens_scenario
+        scenarios["importTokens"] = import_tokens_scenario
+    return scenarios
+
+
+def measure_gas_usage():
+    gas_usage = measure_gas_usage_for_mode(internal_ledger_enabled=False)
+    for name, gas_used in measure_gas_usage_for_mode(internal_ledger_enabled=True).items():
+        gas_usage[f"ledger_{name}"] = gas_used
+    return gas_usage
+
+
+def measure_gas_usage_for_mode(internal_ledger_enabled):
+    rps_token, rps_game, owner_acc = deploy_rps_token_and_game(internal_ledger_enabled)
+    player_1 = get_account(index=1)
+    player_2 = get_account(index=2)
+    chain.snapshot()
+    gas_usage = {}
+    for name, scenario in get_scenarios(internal_ledger_enabled).items():
+        tx = scenario(rps_token, rps_game, owner_acc, player_1, player_2)
+        tx.wait(1)
+        gas_usage[name] = tx.gas_used
+        chain.revert()
+    return gas_usage
+
+
+def compare_with_baseline(gas_usage, baseline, threshold_percent):
+    regressions = []
+    print(f"{'path':<40}{'baseline':>12}{'current':>12}{'change':>10}")
+    for name, gas_used in gas_usage.items():
+        if name not in baseline:
+            print(f"{name:<40}{'-':>12}{gas_used:>12}{'new':>10}")
+            continue
+        change_percent = (gas_used - baseline[name]) * 100 / baseline[name]
+        print(f"{name:<40}{baseline[name]:>12}{gas_used:>12}{change_percent:>9.2f}%")
+        if change_percent > threshold_percent:
+            regressions.append(name)
+    return regressions
+
+
+def write_baseline(gas_usage, baseline_path):
+    with open(baseline_path, 'w') as f:
+        json.dump(gas_usage, f, indent=2, sort_keys=True)
+        f.write("\n")
+    print(f"Gas baseline written to {baseline_path}")
+
+
+def update_baseline():
+    baseline_path, _ = get_benchmark_settings()
+    write_baseline(measure_gas_usage(), baseline_path)
+
+
+def main():
+    baseline_path, threshold_percent = get_benchmark_settings()
+    if not baseline_path.exists():
+        raise SystemExit(f"Gas baseline {baseline_path} not found, create it with "
+                         f"`brownie run scripts/gas_benchmark.py update_baseline` and commit it")
+    gas_usage = measure_gas_usage()
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    regressions = compare_with_baseline(gas_usage, baseline, threshold_percent)
+    if regressions:
+        raise SystemExit(f"Gas usage regressed by more than {threshold_percent}% for: {', '.join(regressions)}")
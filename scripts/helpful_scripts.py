@@ -5,6 +5,9 @@ from brownie import (
     Contract
 )
 from web3 import Web3
+from eth_keys import keys
+from hexbytes import HexBytes
+from scripts.rps_abi import encode_abi
 
 NON_FORKED_LOCAL_BLOCKCHAIN_ENVIRONMENTS = ["hardhat", "development", "ganache"]
 LOCAL_BLOCKCHAIN_ENVIRONMENTS = NON_FORKED_LOCAL_BLOCKCHAIN_ENVIRONMENTS + [
@@ -20,6 +23,12 @@ LOCAL_BLOCKCHAIN_ENVIRONMENTS = NON_FORKED_LOCAL_BLOCKCHAIN_ENVIRONMENTS + [
 #     "weth_token": MockWETH
 # }
 
+# matchEndedEvent._matchResult codes, same order as RPS_Game.RPS_MATCH_RESULT
+MATCH_RESULT_DESCRIPTIONS = ["Draw", "Winner: player1", "Winner: player2"]
+
+# EIP-2612 Permit struct, signed by token owner and passed to RPS_Game.joinGameWithPermit
+PERMIT_TYPEHASH = Web3.keccak(text="Permit(address owner,address spender,uint256 value,uint256 nonce,uint256 deadline)")
+
 DECIMALS = 18
 INITIAL_VALUE = Web3.toWei(2000, "ether")
 
@@ -34,6 +43,26 @@ def get_account(index=None, id=None):
     return accounts.add(config["wallets"][network.show_active()]["private_key"])
 
 
+def sign_permit(rps_token, owner_account, spender, value, deadline):
+    """Signs EIP-2612 permit with private key of local account, returns (v, r, s).
+
+    Digest is built from DOMAIN_SEPARATOR read from token, so signature matches chain id
+    seen by contract even on nodes returning different id from eth_chainId.
+    """
+    struct_hash = Web3.keccak(encode_abi(
+        ["bytes32", "address", "address", "uint256", "uint256", "uint256"],
+        [PERMIT_TYPEHASH, owner_account.address, str(spender), value, rps_token.nonces(owner_account.address), deadline]))
+    return sign_typed_data_hash(owner_account, rps_token.DOMAIN_SEPARATOR(), struct_hash)
+
+
+def sign_typed_data_hash(account, domain_separator, struct_hash):
+    """Signs EIP-712 digest of struct hash with private key of local account, returns (v, r, s)."""
+    private_key = getattr(account, "private_key", None) or account.key
+    digest = Web3.keccak(b"\x19\x01" + bytes(HexBytes(domain_separator)) + struct_hash)
+    signature = keys.PrivateKey(HexBytes(private_key)).sign_msg_hash(digest)
+    return signature.v + 27, signature.r.to_bytes(32, "big"), signature.s.to_bytes(32, "big")
+
+
 # def get_contract(contract_name):
 #     """If you want to use this function, go to the brownie config and add a new entry for
 #     the contract that you want to be able to 'get'. Then add an entry in the in the variable 'contract_to_mock'.
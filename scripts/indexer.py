@@ -0,0 +1,219 @@
+import sqlite3
+import time
+from functools import partial
+from eth_utils import event_abi_to_log_topic
+from brownie import RPS_Game, network, web3
+
+INDEXED_EVENT_NAMES = [
+    "fundsDepositedEvent",
+    "fundsWithdrawnEvent",
+    "joinedQueueEvent",
+    "quiteQueueEvent",
+    "matchEndedEvent",
+]
+INITIAL_CHUNK_SIZE = 1000
+MAX_CHUNK_SIZE = 100000
+# chunk shrinks when a single get_logs call returns more logs than this
+TARGET_LOGS_PER_CHUNK = 5000
+REORG_ROLLBACK_BLOCKS = 12
+POLL_INTERVAL = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    contract_address TEXT NOT NULL,
+    block_number INTEGER NOT NULL,
+    block_hash TEXT NOT NULL,
+    transaction_hash TEXT NOT NULL,
+    log_index INTEGER NOT NULL,
+    event_name TEXT NOT NULL,
+    player_address TEXT,
+    opponent_address TEXT,
+    bid INTEGER,
+    amount TEXT,
+    player_symbol INTEGER,
+    opponent_symbol INTEGER,
+    match_result INTEGER,
+    PRIMARY KEY (transaction_hash, log_index)
+);
+CREATE INDEX IF NOT EXISTS events_by_block ON events (contract_address, block_number);
+CREATE INDEX IF NOT EXISTS events_by_name ON events (contract_address, event_name, block_number);
+CREATE INDEX IF NOT EXISTS events_by_player ON events (player_address, block_number);
+CREATE INDEX IF NOT EXISTS events_by_opponent ON events (opponent_address, block_number);
+CREATE TABLE IF NOT EXISTS cursors (
+    contract_address TEXT PRIMARY KEY,
+    block_number INTEGER NOT NULL,
+    block_hash TEXT
+);
+"""
+
+
+def build_event_decoders(abi, event_names=INDEXED_EVENT_NAMES):
+    contract_events = web3.eth.contract(abi=abi).events
+    return {
+        event_abi_to_log_topic(event_abi): contract_events[event_abi["name"]]()
+        for event_abi in abi
+        if event_abi["type"] == "event" and event_abi["name"] in event_names
+    }
+
+
+def decode_logs(event_decoders, logs):
+    decoded_logs = []
+    for log in logs:
+        if not log["topics"]:
+            continue
+        event = event_decoders.get(bytes(log["topics"][0]))
+        if event is not None:
+            decoded_logs.append(event.processLog(log))
+    return decoded_logs
+
+
+def event_to_row(contract_address, event):
+    args = event["args"]
+    row = {
+        "contract_address": contract_address,
+        "block_number": event["blockNumber"],
+        "block_hash": event["blockHash"].hex(),
+        "transaction_hash": event["transactionHash"].hex(),
+        "log_index": event["logIndex"],
+        "event_name": event["event"],
+        "player_address": None,
+        "opponent_address": None,
+        "bid": None,
+        "amount": None,
+        "player_symbol": None,
+        "opponent_symbol": None,
+        "match_result": None,
+    }
+    if event["event"] == "fundsDepositedEvent":
+        row.update(player_address=args["_addressOfAccount"], amount=str(args["_amountDepositedInEth"]))
+    elif event["event"] == "fundsWithdrawnEvent":
+        row.update(player_address=args["_addressOfAccount"], amount=str(args["_amountWithdrawnInEth"]))
+    elif event["event"] in ("joinedQueueEvent", "quiteQueueEvent"):
+        row.update(player_address=args["_addressOfPlayer"], bid=args["_chosenBid"])
+    elif event["event"] == "matchEndedEvent":
+        row.update(player_address=args["_player1Address"],
+                   opponent_address=args["_player2Address"],
+                   player_symbol=args["_player1Symbol"],
+                   opponent_symbol=args["_player2Symbol"],
+                   bid=args["_bidValue"],
+                   match_result=args["_matchResult"])
+    return row
+
+
+def open_database(database_path):
+    connection = sqlite3.connect(database_path)
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def get_cursor(connection, contract_address):
+    return connection.execute("SELECT block_number, block_hash FROM cursors WHERE contract_address = ?",
+                              (contract_address,)).fetchone()
+
+
+def set_cursor(connection, contract_address, block_number, block_hash):
+    connection.execute("INSERT OR REPLACE INTO cursors (contract_address, block_number, block_hash) VALUES (?, ?, ?)",
+                       (contract_address, block_number, block_hash))
+
+
+def rollback_reorged_blocks(connection, contract_address, cursor_block_number, rollback_blocks):
+    rollback_to = max(cursor_block_number - rollback_blocks, -1)
+    with connection:
+        connection.execute("DELETE FROM events WHERE contract_address = ? AND block_number > ?",
+                           (contract_address, rollback_to))
+        set_cursor(connection, contract_address, rollback_to, None)
+    return rollback_to
+
+
+def get_start_block(connection, contract_address, start_block, rollback_blocks):
+    cursor = get_cursor(connection, contract_address)
+    if cursor is None:
+        return start_block
+    cursor_block_number, cursor_block_hash = cursor
+    if cursor_block_hash is not None and web3.eth.get_block(cursor_block_number).hash.hex() != cursor_block_hash:
+        cursor_block_number = rollback_reorged_blocks(connection, contract_address, cursor_block_number, rollback_blocks)
+    return cursor_block_number + 1
+
+
+def fetch_logs(contract_address, from_block, to_block):
+    return web3.eth.get_logs({"address": contract_address, "fromBlock": from_block, "toBlock": to_block})
+
+
+def fetch_logs_with_block_hash(contract_address, from_block, to_block):
+    # hash is read before logs, so reorg of to_block while logs are fetched is seen by reading it again afterwards
+    block_hash = web3.eth.get_block(to_block).hash.hex()
+    return block_hash, fetch_logs(contract_address, from_block, to_block)
+
+
+def is_block_reorged(block_number, block_hash, logs):
+    return web3.eth.get_block(block_number).hash.hex() != block_hash or \
+        any(log["blockNumber"] == block_number and log["blockHash"].hex() != block_hash for log in logs)
+
+
+def fetch_shrinking_range(fetch, from_block, to_block, block_range, newest_first=False):
+    """Calls fetch(range_from_block, range_to_block) for at most block_range blocks, halving the range while node refuses it.
+
+    Range starts at from_block, or ends at to_block when newest_first. Returns (result, range_from_block,
+    range_to_block, block_range accepted by node).
+    """
+    while True:
+        if newest_first:
+            range_from_block, range_to_block = max(to_block - block_range + 1, from_block), to_block
+        else:
+            range_from_block, range_to_block = from_block, min(from_block + block_range - 1, to_block)
+        try:
+            return fetch(range_from_block, range_to_block), range_from_block, range_to_block, block_range
+        except ValueError:
+            # node refused the range (too many results or timeout), retry with smaller one
+            if block_range == 1:
+                raise
+            block_range = max(block_range // 2, 1)
+
+
+def index_events(contract_address, abi, database_path, start_block=0, confirmations=0,
+                 rollback_blocks=REORG_ROLLBACK_BLOCKS, chunk_size=INITIAL_CHUNK_SIZE):
+    connection = open_database(database_path)
+    event_decoders = build_event_decoders(abi)
+    from_block = get_start_block(connection, contract_address, start_block, rollback_blocks)
+    head_block = web3.eth.block_number - confirmations
+    indexed_events = 0
+    while from_block <= head_block:
+        (to_block_hash, logs), _, to_block, chunk_size = fetch_shrinking_range(
+            partial(fetch_logs_with_block_hash, contract_address), from_block, head_block, chunk_size)
+        if is_block_reorged(to_block, to_block_hash, logs):
+            # logs may come from the other branch than cursor hash, fetch the chunk again
+            continue
+        rows = [event_to_row(contract_address, event) for event in decode_logs(event_decoders, logs)]
+        with connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO events VALUES (:contract_address, :block_number, :block_hash, "
+                ":transaction_hash, :log_index, :event_name, :player_address, :opponent_address, :bid, "
+                ":amount, :player_symbol, :opponent_symbol, :match_result)", rows)
+            set_cursor(connection, contract_address, to_block, to_block_hash)
+        indexed_events += len(rows)
+        from_block = to_block + 1
+        if len(logs) > TARGET_LOGS_PER_CHUNK:
+            chunk_size = max(chunk_size // 2, 1)
+        elif len(logs) < TARGET_LOGS_PER_CHUNK // 4:
+            chunk_size = min(chunk_size * 2, MAX_CHUNK_SIZE)
+    connection.close()
+    return indexed_events
+
+
+def get_database_path():
+    return f"rps_events_{network.show_active()}.sqlite"
+
+
+def follow():
+    rps_game = RPS_Game[-1]
+    while True:
+        indexed_events = index_events(rps_game.address, rps_game.abi, get_database_path())
+        if indexed_events:
+            print(f"Indexed {indexed_events} new events")
+        time.sleep(POLL_INTERVAL)
+
+
+def main():
+    rps_game = RPS_Game[-1]
+    indexed_events = index_events(rps_game.address, rps_game.abi, get_database_path())
+    print(f"Indexed {indexed_events} events of RPS_Game at {rps_game.address} into {get_database_path()}")
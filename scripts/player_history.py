@@ -0,0 +1,94 @@
+from functools import partial
+from eth_utils import event_abi_to_log_topic
+from scripts.indexer import build_event_decoders, decode_logs, fetch_shrinking_range
+from scripts.helpful_scripts import MATCH_RESULT_DESCRIPTIONS
+from brownie import RPS_Game, web3
+
+HISTORY_EVENT_NAMES = ["fundsDepositedEvent", "fundsWithdrawnEvent", "matchEndedEvent"]
+DEFAULT_BLOCK_RANGE = 10000
+
+
+def address_to_topic(address):
+    return "0x" + str(address)[2:].lower().rjust(64, "0")
+
+
+class PlayerHistory:
+    """Fetches deposits, withdrawals and match outcomes of one player from RPS_Game logs.
+
+    Player address is indexed topic of every history event, so node returns only logs of given
+    player. matchEndedEvent indexes player as either first or second topic, which needs second query.
+    """
+
+    def __init__(self, rps_game_address, rps_game_abi):
+        self.rps_game_address = rps_game_address
+        self.event_decoders = build_event_decoders(rps_game_abi, HISTORY_EVENT_NAMES)
+        self.event_topics = {event_abi["name"]: "0x" + event_abi_to_log_topic(event_abi).hex()
+                             for event_abi in self.event_decoders.values()}
+
+    def get_topic_filters(self, player_address):
+        player_topic = address_to_topic(player_address)
+        return [
+            [list(self.event_topics.values()), player_topic],
+            [self.event_topics["matchEndedEvent"], None, player_topic],
+        ]
+
+    def fetch_events(self, player_address, from_block, to_block):
+        logs = []
+        for topics in self.get_topic_filters(player_address):
+            logs += web3.eth.get_logs({"address": self.rps_game_address, "fromBlock": from_block,
+                                       "toBlock": to_block, "topics": topics})
+        events = [event_to_history_entry(event, player_address) for event in decode_logs(self.event_decoders, logs)]
+        return sorted(events, key=lambda entry: (entry["block_number"], entry["log_index"]), reverse=True)
+
+    def get_page(self, player_address, to_block=None, block_range=DEFAULT_BLOCK_RANGE, from_block=0):
+        """Returns (entries newest first, to_block of next page or None when from_block was reached)."""
+        to_block = web3.eth.block_number if to_block is None else to_block
+        entries, page_from_block, _, _ = fetch_shrinking_range(
+            partial(self.fetch_events, player_address), from_block, to_block, block_range, newest_first=True)
+        next_to_block = page_from_block - 1 if page_from_block > from_block else None
+        return entries, next_to_block
+
+    def get_history(self, player_address, from_block=0, to_block=None, block_range=DEFAULT_BLOCK_RANGE):
+        entries = []
+        while to_block is None or to_block >= from_block:
+            page_entries, to_block = self.get_page(player_address, to_block, block_range, from_block)
+            entries += page_entries
+            if to_block is None:
+                break
+        return entries
+
+
+def event_to_history_entry(event, player_address):
+    args = event["args"]
+    entry = {
+        "event": event["event"],
+        "block_number": event["blockNumber"],
+        "transaction_hash": event["transactionHash"].hex(),
+        "log_index": event["logIndex"],
+    }
+    if event["event"] == "fundsDepositedEvent":
+        entry["amount_in_eth"] = args["_amountDepositedInEth"]
+    elif event["event"] == "fundsWithdrawnEvent":
+        entry["amount_in_eth"] = args["_amountWithdrawnInEth"]
+    else:
+        is_player_1 = args["_player1Address"].lower() == str(player_address).lower()
+        match_result = args["_matchResult"]
+        if match_result == 0:
+            outcome = "draw"
+        else:
+            # match result codes are 1 when player1 won and 2 when player2 won
+            outcome = "won" if match_result == (1 if is_player_1 else 2) else "lost"
+        entry.update(
+            opponent=args["_player2Address"] if is_player_1 else args["_player1Address"],
+            symbol=args["_player1Symbol"] if is_player_1 else args["_player2Symbol"],
+            opponent_symbol=args["_player2Symbol"] if is_player_1 else args["_player1Symbol"],
+            bid=args["_bidValue"],
+            result=MATCH_RESULT_DESCRIPTIONS[match_result],
+            outcome=outcome)
+    return entry
+
+
+def main(player_address):
+    rps_game = RPS_Game[-1]
+    for entry in PlayerHistory(rps_game.address, rps_game.abi).get_history(player_address):
+        print(entry)
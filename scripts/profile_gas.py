@@ -0,0 +1,170 @@
+import json
+import re
+from collections import defaultdict
+from pathlib import Path
+from scripts.helpful_scripts import get_account
+from scripts.deploy import deploy_rps_token_and_game
+from scripts.gas_benchmark import get_scenarios
+from brownie import chain
+
+DEFAULT_SCENARIO = "joinGame_match_rock_vs_paper"
+CALL_OPCODES = {"CALL", "CALLCODE", "DELEGATECALL", "STATICCALL", "CREATE", "CREATE2"}
+STORAGE_OPCODES = {"SLOAD", "SSTORE"}
+SOURCE_IDENTIFIER = re.compile(r"(?:delete\s+)?([A-Za-z_]\w*)")
+UNKNOWN = "<unknown>"
+
+
+def get_step_costs(trace):
+    """Returns gas spent by every step, calls include everything spent inside of them.
+
+    Cost is taken from gas left before the next step in the same frame, which also covers memory
+    expansion and gas forwarded to callee. Last step of a frame has no such step and keeps its gasCost.
+    """
+    costs = [step["gasCost"] for step in trace]
+    pending_calls = []
+    for index, step in enumerate(trace[:-1]):
+        next_step = trace[index + 1]
+        if next_step["depth"] == step["depth"]:
+            costs[index] = step["gas"] - next_step["gas"]
+        elif next_step["depth"] > step["depth"]:
+            pending_calls.append(index)
+        while pending_calls and next_step["depth"] <= trace[pending_calls[-1]]["depth"]:
+            call_index = pending_calls.pop()
+            if next_step["depth"] == trace[call_index]["depth"]:
+                costs[call_index] = trace[call_index]["gas"] - next_step["gas"]
+    return costs
+
+
+class SourceResolver:
+    """Names storage variable accessed by a step after leading identifier of its source snippet.
+
+    Solidity source maps point SLOAD/SSTORE to expression reading or writing the variable,
+    e.g. `linkBidWithWaitingPlayer[_chosenBid].playerAddress`, so its first identifier is the variable.
+    """
+
+    def __init__(self):
+        self.sources = {}
+
+    def get_source(self, filename):
+        if filename not in self.sources:
+            path = Path(filename)
+            self.sources[filename] = path.read_text() if path.exists() else None
+        return self.sources[filename]
+
+    def get_variable_name(self, step):
+        source = step.get("source")
+        if not source:
+            return None
+        text = self.get_source(source["filename"])
+        if text is None:
+            return None
+        start, stop = source["offset"]
+        match = SOURCE_IDENTIFIER.match(text[start:stop].strip())
+        return match.group(1) if match else None
+
+
+def profile_trace(trace, gas_used):
+    costs = get_step_costs(trace)
+    resolver = SourceResolver()
+    functions = defaultdict(lambda: {"gas": 0, "steps": 0})
+    storage = defaultdict(lambda: {"SLOAD": 0, "SSTORE": 0, "gas": 0, "cold": 0, "warm": 0})
+    calls = []
+    accessed_slots = set()
+    # frames of currently executing calls: [call step index, gas spent by steps inside callee]
+    frames = [[None, 0]]
+
+    for index, step in enumerate(trace):
+        while len(frames) > 1 and step["depth"] <= trace[frames[-1][0]]["depth"]:
+            call_index, callee_gas = frames.pop()
+            call_step = trace[call_index]
+            overhead = costs[call_index] - callee_gas
+            calls.append({"caller": call_step.get("fn") or UNKNOWN, "op": call_step["op"],
+                          "callee": step_callee(trace, call_index), "gas": costs[call_index],
+                          "callee_gas": callee_gas, "overhead": overhead})
+            functions[call_step.get("fn") or UNKNOWN]["gas"] += overhead
+        frames[-1][1] += costs[index]
+        entered_call = index + 1 < len(trace) and trace[index + 1]["depth"] > step["depth"]
+        if entered_call:
+            frames.append([index, 0])
+        else:
+            functions[step.get("fn") or UNKNOWN]["gas"] += costs[index]
+        functions[step.get("fn") or UNKNOWN]["steps"] += 1
+
+        if step["op"] in STORAGE_OPCODES:
+            slot = step["stack"][-1]
+            variable = resolver.get_variable_name(step) or f"slot 0x{slot.lstrip('0') or '0'}"
+            variable_stats = storage[f"{step.get('contractName') or UNKNOWN}.{variable}"]
+            variable_stats[step["op"]] += 1
+            variable_stats["gas"] += costs[index]
+            slot_key = (step.get("address"), slot)
+            variable_stats["warm" if slot_key in accessed_slots else "cold"] += 1
+            accessed_slots.add(slot_key)
+
+    execution_gas = sum(costs[index] for index, step in enumerate(trace) if step["depth"] == trace[0]["depth"])
+    return {
+        "gas_used": gas_used,
+        "execution_gas": execution_gas,
+        "intrinsic_and_refund_gas": gas_used - execution_gas,
+        "functions": dict(functions),
+        "storage": dict(storage),
+        "calls": calls,
+    }
+
+
+def step_callee(trace, call_index):
+    callee_step = trace[call_index + 1]
+    return callee_step.get("fn") or callee_step.get("contractName") or UNKNOWN
+
+
+def profile_transaction(tx):
+    return profile_trace(tx.trace, tx.gas_used)
+
+
+def format_report(name, profile):
+    lines = [f"Gas profile of {name}",
+             f"gas used: {profile['gas_used']}  execution: {profile['execution_gas']}  "
+             f"intrinsic and refund: {profile['intrinsic_and_refund_gas']}", "",
+             f"{'function':<50}{'self gas':>10}{'steps':>8}"]
+    for function, stats in sorted(profile["functions"].items(), key=lambda item: -item[1]["gas"]):
+        lines.append(f"{function:<50}{stats['gas']:>10}{stats['steps']:>8}")
+    lines += ["", f"{'storage variable':<50}{'SLOAD':>7}{'SSTORE':>8}{'cold':>6}{'warm':>6}{'gas':>8}"]
+    for variable, stats in sorted(profile["storage"].items(), key=lambda item: -item[1]["gas"]):
+        lines.append(f"{variable:<50}{stats['SLOAD']:>7}{stats['SSTORE']:>8}"
+                     f"{stats['cold']:>6}{stats['warm']:>6}{stats['gas']:>8}")
+    lines += ["", f"{'external call':<50}{'op':>12}{'gas':>8}{'callee':>8}{'overhead':>10}"]
+    for call in sorted(profile["calls"], key=lambda call: -call["overhead"]):
+        lines.append(f"{call['caller'] + ' -> ' + call['callee']:<50}{call['op']:>12}"
+                     f"{call['gas']:>8}{call['callee_gas']:>8}{call['overhead']:>10}")
+    return "\n".join(lines)
+
+
+def write_profile(name, profile, output_path=None):
+    output_path = Path(output_path or f"gas_profile_{name}.json")
+    with open(output_path, "w") as f:
+        json.dump({"name": name, **profile}, f, indent=2)
+        f.write("\n")
+    return output_path
+
+
+def run_scenario(scenario_name):
+    # scenario names are the same as in gas_benchmark, "ledger_" prefix selects internal ledger mode
+    internal_ledger_enabled = scenario_name.startswith("ledger_")
+    scenarios = get_scenarios(internal_ledger_enabled)
+    scenario = scenarios.get(scenario_name[len("ledger_"):] if internal_ledger_enabled else scenario_name)
+    if scenario is None:
+        raise SystemExit(f"Unknown scenario {scenario_name}, available: {', '.join(scenarios)}")
+    rps_token, rps_game, owner_acc = deploy_rps_token_and_game(internal_ledger_enabled)
+    tx = scenario(rps_token, rps_game, owner_acc, get_account(index=1), get_account(index=2))
+    tx.wait(1)
+    return tx
+
+
+def main(target=DEFAULT_SCENARIO, output_path=None):
+    """Profiles transaction given by hash or gas_benchmark scenario run on fresh contracts."""
+    if re.fullmatch(r"0x[0-9a-fA-F]{64}", target):
+        tx = chain.get_transaction(target)
+    else:
+        tx = run_scenario(target)
+    profile = profile_transaction(tx)
+    print(format_report(target, profile))
+    print(f"\nJSON profile written to {write_profile(target, profile, output_path)}")
@@ -0,0 +1,78 @@
+import time
+from scripts.indexer import build_event_decoders, decode_logs
+from brownie import web3
+from web3 import Web3
+
+DEFAULT_REFRESH_INTERVAL = 1.0
+CONFIG_EVENT_NAMES = ["bidValueUpdatedEvent"]
+# event name -> arguments holding addresses of players whose state the event changes
+PLAYER_EVENT_ARGUMENTS = {
+    "fundsDepositedEvent": ["_addressOfAccount"],
+    "fundsWithdrawnEvent": ["_addressOfAccount"],
+    "tokensExportedEvent": ["_addressOfAccount"],
+    "tokensImportedEvent": ["_addressOfAccount"],
+    "joinedQueueEvent": ["_addressOfPlayer"],
+    "quiteQueueEvent": ["_addressOfPlayer"],
+    "matchEndedEvent": ["_player1Address", "_player2Address"],
+    # in token mode balances are RPS_Token balances, which change with every transfer
+    "Transfer": ["from", "to"],
+}
+
+
+class GameReadCache:
+    """Serves getGameConfig and getPlayersState values locally.
+
+    Cached values are dropped only when RPS_Game (and RPS_Token, if game does not use internal
+    ledger) emits event changing them. Logs are polled at most once per `refresh_interval`
+    seconds and every value is read at the last polled block, so no event can be missed
+    between reading value and invalidating it.
+    """
+
+    def __init__(self, rps_game, rps_token, refresh_interval=DEFAULT_REFRESH_INTERVAL):
+        self.rps_game = rps_game
+        self.refresh_interval = refresh_interval
+        self.watched_addresses = [rps_game.address]
+        event_names = CONFIG_EVENT_NAMES + list(PLAYER_EVENT_ARGUMENTS)
+        self.event_decoders = build_event_decoders(rps_game.abi, event_names)
+        if not rps_game.isInternalLedgerEnabled():
+            self.watched_addresses.append(rps_token.address)
+            self.event_decoders.update(build_event_decoders(rps_token.abi, ["Transfer"]))
+        self.last_block = web3.eth.block_number
+        self.last_refresh = time.monotonic()
+        self.config = None
+        self.players_state = {}
+
+    def refresh(self, force=False):
+        if not force and time.monotonic() - self.last_refresh < self.refresh_interval:
+            return
+        head_block = web3.eth.block_number
+        if head_block > self.last_block:
+            logs = web3.eth.get_logs({"address": self.watched_addresses,
+                                      "fromBlock": self.last_block + 1, "toBlock": head_block})
+            for event in decode_logs(self.event_decoders, logs):
+                self.invalidate(event)
+            self.last_block = head_block
+        self.last_refresh = time.monotonic()
+
+    def invalidate(self, event):
+        if event["event"] in CONFIG_EVENT_NAMES:
+            self.config = None
+            return
+        for argument in PLAYER_EVENT_ARGUMENTS.get(event["event"], []):
+            self.players_state.pop(event["args"][argument], None)
+
+    def get_game_config(self):
+        self.refresh()
+        if self.config is None:
+            self.config = self.rps_game.getGameConfig(block_identifier=self.last_block)
+        return self.config
+
+    def get_players_state(self, addresses):
+        """Returns {address: (deposited funds, is in queue)} for given addresses."""
+        self.refresh()
+        addresses = [Web3.toChecksumAddress(str(address)) for address in addresses]
+        missing_addresses = list(dict.fromkeys(address for address in addresses if address not in self.players_state))
+        if missing_addresses:
+            deposited_funds, in_queue = self.rps_game.getPlayersState(missing_addresses, block_identifier=self.last_block)
+            self.players_state.update(zip(missing_addresses, zip(deposited_funds, in_queue)))
+        return {address: self.players_state[address] for address in addresses}
@@ -0,0 +1,167 @@
+import math
+import time
+import numpy as np
+
+# values mirror RPS_Game
+ETH_RPS_RATIO = 10000
+MINIMAL_DEPOSIT = 100000000000000
+DEFAULT_BID_VALUES = [1000000000000000000, 5000000000000000000, 10000000000000000000]
+DRAW, PLAYER1_WON, PLAYER2_WON = 0, 1, 2
+REJECTED = -1
+NO_PLAYER = -1
+INT64_MAX = np.iinfo(np.int64).max
+
+
+class RPSGameModel:
+    """Off-chain model of RPS_Game for players numbered 0..players_count-1.
+
+    Balances are kept in int64 as multiples of `unit` (by default gcd of the bid values). Deposit not divisible
+    by it makes unit finer and when balances could overflow int64 in the finer unit, arrays switch to Python
+    ints, so every amount of RPS-wei accepted by the contract stays exact.
+    """
+
+    def __init__(self, players_count, bid_values=DEFAULT_BID_VALUES, eth_rps_ratio=ETH_RPS_RATIO, unit=None):
+        self.eth_rps_ratio = eth_rps_ratio
+        self.unit = math.gcd(unit or 0, *bid_values)
+        self.bid_values = np.array([self.to_units(bid_value) for bid_value in bid_values], dtype=np.int64)
+        self.balances = np.zeros(players_count, dtype=np.int64)
+        self.waiting_symbol = np.full(players_count, NO_PLAYER, dtype=np.int64)
+        self.waiting_bid = np.full(players_count, NO_PLAYER, dtype=np.int64)
+        self.waiting_player_for_bid = [NO_PLAYER] * len(bid_values)
+        self.eth_held = 0
+
+    def to_units(self, value_in_rps):
+        if value_in_rps % self.unit:
+            raise ValueError(f"{value_in_rps} is not a multiple of model unit {self.unit}")
+        return value_in_rps // self.unit
+
+    def set_unit(self, unit):
+        factor = self.unit // unit
+        if factor == 1:
+            return
+        largest_units = max(int(self.balances.sum()), int(self.bid_values.max())) * factor
+        if self.balances.dtype != object and largest_units > INT64_MAX:
+            self.balances = self.balances.astype(object)
+            self.bid_values = self.bid_values.astype(object)
+        self.balances *= factor
+        self.bid_values *= factor
+        self.unit = unit
+
+    def balance_of(self, player):
+        return int(self.balances[player]) * self.unit
+
+    def deposit(self, players, values_in_wei):
+        players = np.asarray(players, dtype=np.int64)
+        if isinstance(values_in_wei, int):
+            values_in_wei = [values_in_wei] * players.size
+        values_in_wei = [int(value) for value in values_in_wei]
+        if any(value < MINIMAL_DEPOSIT for value in values_in_wei):
+            raise ValueError("Minimal value to deposit is 0.0001 ETH!")
+        values_in_rps = [value * self.eth_rps_ratio for value in values_in_wei]
+        self.set_unit(math.gcd(self.unit, *values_in_rps))
+        units = [self.to_units(value) for value in values_in_rps]
+        # sum of balances only grows with deposits, so it bounds every balance
+        if self.balances.dtype != object and int(self.balances.sum()) + sum(units) > INT64_MAX:
+            self.balances = self.balances.astype(object)
+            self.bid_values = self.bid_values.astype(object)
+        np.add.at(self.balances, players, np.array(units, dtype=self.balances.dtype))
+        self.eth_held += sum(values_in_wei)
+
+    def withdraw(self, player):
+        if self.balances[player] == 0:
+            raise ValueError("You dont have funds deposited in this contract!")
+        if self.waiting_bid[player] != NO_PLAYER:
+            raise ValueError("To withdraw money, you cant be waiting for game. Please quite game!")
+        amount_to_withdraw = self.balance_of(player) // self.eth_rps_ratio
+        self.balances[player] = 0
+        self.eth_held -= amount_to_withdraw
+        return amount_to_withdraw
+
+    def join_game(self, player, symbol, bid):
+        """Returns None when player waits for opponent, otherwise (player1, match result)."""
+        if self.balances[player] < self.bid_values[bid]:
+            raise ValueError("You dont have enough funds to join game with this bid!")
+        if self.waiting_bid[player] != NO_PLAYER:
+            raise ValueError("You cant wait for 2 games at the same time! Quite queue or wait for match!")
+        waiting_player = self.waiting_player_for_bid[bid]
+        if waiting_player == NO_PLAYER:
+            self.waiting_player_for_bid[bid] = player
+            self.waiting_symbol[player] = symbol
+            self.waiting_bid[player] = bid
+            return None
+        self.waiting_player_for_bid[bid] = NO_PLAYER
+        waiting_symbol = int(self.waiting_symbol[waiting_player])
+        self.waiting_symbol[waiting_player] = NO_PLAYER
+        self.waiting_bid[waiting_player] = NO_PLAYER
+        self.transfer_rewards(np.array([waiting_player]), np.array([player]),
+                              match_results(waiting_symbol, symbol), self.bid_values[[bid]])
+        return waiting_player, int(match_results(waiting_symbol, symbol))
+
+    def quite_queue(self, player):
+        bid = int(self.waiting_bid[player])
+        if bid == NO_PLAYER:
+            raise ValueError("You cant quite queue, if you arent in it!")
+        self.waiting_player_for_bid[bid] = NO_PLAYER
+        self.waiting_symbol[player] = NO_PLAYER
+        self.waiting_bid[player] = NO_PLAYER
+        return bid
+
+    def play_matches(self, players_1, symbols_1, players_2, symbols_2, bids):
+        """Settles array of matches at once, each player may appear in at most one of them.
+
+        Matches breaking joinGame rules (funds below bid, player waiting in queue) are
+        skipped and get REJECTED result code.
+        """
+        players_1, symbols_1, players_2, symbols_2, bids = (
+            np.asarray(values, dtype=np.int64) for values in (players_1, symbols_1, players_2, symbols_2, bids))
+        all_players = np.concatenate([players_1, players_2])
+        if np.bincount(all_players, minlength=self.balances.size).max(initial=0) > 1:
+            raise ValueError("Every player can play at most one match in single play_matches call")
+        bid_values = self.bid_values[bids]
+        valid = ((self.balances[players_1] >= bid_values) & (self.balances[players_2] >= bid_values)
+                 & (self.waiting_bid[players_1] == NO_PLAYER) & (self.waiting_bid[players_2] == NO_PLAYER))
+        results = np.where(valid, match_results(symbols_1, symbols_2), REJECTED)
+        self.transfer_rewards(players_1, players_2, results, bid_values)
+        return results
+
+    def transfer_rewards(self, players_1, players_2, results, bid_values):
+        player_1_change = np.where(results == PLAYER1_WON, bid_values, 0) - np.where(results == PLAYER2_WON, bid_values, 0)
+        # players are unique, so fancy indexed += is safe here
+        self.balances[players_1] += player_1_change
+        self.balances[players_2] -= player_1_change
+
+
+def match_results(symbols_1, symbols_2):
+    # same formula as RPS_Game.chooseWinnerAndTransferReward
+    return (3 + np.asarray(symbols_1) - np.asarray(symbols_2)) % 3
+
+
+def random_round(rng, players_count, bids_count=3):
+    """Random matches where every player plays exactly once (players_count // 2 matches)."""
+    players = rng.permutation(players_count)
+    matches_count = players_count // 2
+    return (players[:matches_count], rng.integers(0, 3, matches_count),
+            players[matches_count:2 * matches_count], rng.integers(0, 3, matches_count),
+            rng.integers(0, bids_count, matches_count))
+
+
+def measure_throughput(players_count=1000000, rounds=20, seed=0):
+    rng = np.random.default_rng(seed)
+    model = RPSGameModel(players_count)
+    model.deposit(np.arange(players_count), 10 ** 18)
+    generated_rounds = [random_round(rng, players_count) for _ in range(rounds)]
+    start = time.perf_counter()
+    matches = 0
+    for generated_round in generated_rounds:
+        matches += model.play_matches(*generated_round).size
+    elapsed = time.perf_counter() - start
+    print(f"Settled {matches} matches in {elapsed:.2f}s ({matches / elapsed:,.0f} matches/s)")
+    return matches / elapsed
+
+
+def main():
+    measure_throughput()
+
+
+if __name__ == "__main__":
+    main()
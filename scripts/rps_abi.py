@@ -0,0 +1,37 @@
+import json
+from pathlib import Path
+from eth_utils import function_abi_to_4byte_selector, to_checksum_address
+
+try:
+    from eth_abi import encode as encode_abi, decode as decode_abi
+except ImportError:  # eth-abi < 4
+    from eth_abi import encode_abi, decode_abi
+
+BUILD_CONTRACTS_PATH = Path("build/contracts")
+
+
+def load_abi(contract_name, build_path=BUILD_CONTRACTS_PATH):
+    with open(Path(build_path) / f"{contract_name}.json") as f:
+        return json.load(f)["abi"]
+
+
+class ContractAbi:
+    """Encodes calls and decodes results of contract functions without web3 contract objects."""
+
+    def __init__(self, abi):
+        self.functions = {item["name"]: item for item in abi if item["type"] == "function"}
+        self.selectors = {name: function_abi_to_4byte_selector(item) for name, item in self.functions.items()}
+
+    def encode_call(self, function_name, *args):
+        function_abi = self.functions[function_name]
+        input_types = [argument["type"] for argument in function_abi["inputs"]]
+        if len(args) != len(input_types):
+            raise TypeError(f"{function_name} takes {len(input_types)} arguments, got {len(args)}")
+        return "0x" + (self.selectors[function_name] + encode_abi(input_types, list(args))).hex()
+
+    def decode_result(self, function_name, result):
+        output_types = [output["type"] for output in self.functions[function_name]["outputs"]]
+        values = decode_abi(output_types, bytes.fromhex(result[2:] if result.startswith("0x") else result))
+        values = [to_checksum_address(value) if output_type == "address" else value
+                  for output_type, value in zip(output_types, values)]
+        return values[0] if len(values) == 1 else tuple(values)
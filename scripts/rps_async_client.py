@@ -0,0 +1,250 @@
+import asyncio
+import itertools
+import json
+import time
+import aiohttp
+from eth_account import Account
+from scripts.rps_abi import ContractAbi
+
+DEFAULT_MAX_CONNECTIONS = 20
+DEFAULT_GAS_LIMIT = 300000
+RECEIPT_POLL_INTERVAL = 0.1
+RECEIPT_TIMEOUT = 120
+REQUEST_TIMEOUT = 30
+
+
+class RpcError(Exception):
+    pass
+
+
+class HttpTransport:
+    """JSON-RPC over pooled keep-alive HTTP connections."""
+
+    def __init__(self, url, max_connections=DEFAULT_MAX_CONNECTIONS):
+        self.url = url
+        self.max_connections = max_connections
+        self.request_ids = itertools.count()
+        self.session = None
+
+    async def open(self):
+        connector = aiohttp.TCPConnector(limit=self.max_connections)
+        self.session = aiohttp.ClientSession(connector=connector)
+
+    async def close(self):
+        await self.session.close()
+
+    async def request(self, method, params):
+        payload = {"jsonrpc": "2.0", "id": next(self.request_ids), "method": method, "params": params}
+        async with self.session.post(self.url, json=payload) as response:
+            return get_rpc_result(await response.json(content_type=None))
+
+
+class WebSocketTransport:
+    """JSON-RPC over pool of WebSocket connections, responses are matched to requests by id.
+
+    Requests waiting on a connection fail with ConnectionError when it closes, and with
+    asyncio.TimeoutError when node doesn't answer in request_timeout seconds.
+    """
+
+    def __init__(self, url, max_connections=4, request_timeout=REQUEST_TIMEOUT):
+        self.url = url
+        self.max_connections = max_connections
+        self.request_timeout = request_timeout
+        self.request_ids = itertools.count()
+        self.session = None
+        self.connections = []
+        # pending requests of every connection, so closed connection fails only its own requests
+        self.pending_requests = []
+        self.reader_tasks = []
+
+    async def open(self):
+        self.session = aiohttp.ClientSession()
+        for _ in range(self.max_connections):
+            connection = await self.session.ws_connect(self.url, max_msg_size=0)
+            pending_requests = {}
+            self.connections.append(connection)
+            self.pending_requests.append(pending_requests)
+            self.reader_tasks.append(asyncio.ensure_future(self.read_responses(connection, pending_requests)))
+
+    async def close(self):
+        for reader_task in self.reader_tasks:
+            reader_task.cancel()
+        for connection in self.connections:
+            await connection.close()
+        await self.session.close()
+
+    async def read_responses(self, connection, pending_requests):
+        try:
+            async for message in connection:
+                response = json.loads(message.data)
+                future = pending_requests.pop(response.get("id"), None)
+                if future is not None and not future.done():
+                    future.set_result(response)
+        finally:
+            for future in pending_requests.values():
+                if not future.done():
+                    future.set_exception(ConnectionError(f"WebSocket connection to {self.url} was closed"))
+            pending_requests.clear()
+
+    async def request(self, method, params):
+        request_id = next(self.request_ids)
+        connection_index = request_id % len(self.connections)
+        pending_requests = self.pending_requests[connection_index]
+        if self.reader_tasks[connection_index].done():
+            raise ConnectionError(f"WebSocket connection to {self.url} was closed")
+        future = asyncio.get_running_loop().create_future()
+        pending_requests[request_id] = future
+        try:
+            await self.connections[connection_index].send_str(
+                json.dumps({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}))
+            return get_rpc_result(await asyncio.wait_for(future, self.request_timeout))
+        finally:
+            pending_requests.pop(request_id, None)
+
+
+def get_rpc_result(response):
+    if "error" in response:
+        raise RpcError(response["error"].get("message", response["error"]))
+    return response["result"]
+
+
+def create_transport(url, max_connections=None):
+    transport_class = WebSocketTransport if url.startswith(("ws://", "wss://")) else HttpTransport
+    if max_connections is None:
+        return transport_class(url)
+    return transport_class(url, max_connections)
+
+
+class NonceManager:
+    """Hands out consecutive nonces per account, so transactions can be sent without waiting for receipts."""
+
+    def __init__(self, transport):
+        self.transport = transport
+        self.nonces = {}
+        self.locks = {}
+
+    async def next_nonce(self, address):
+        lock = self.locks.setdefault(address, asyncio.Lock())
+        async with lock:
+            if address not in self.nonces:
+                self.nonces[address] = int(await self.transport.request("eth_getTransactionCount", [address, "pending"]), 16)
+            nonce = self.nonces[address]
+            self.nonces[address] += 1
+            return nonce
+
+    def reset(self, address):
+        self.nonces.pop(address, None)
+
+
+class RPSAsyncClient:
+    """Asyncio client of RPS_Game and RPS_Token.
+
+    Accounts passed to transaction methods are either eth_account LocalAccount objects, which are
+    signed locally with managed nonces, or addresses of accounts unlocked on the node.
+    Transaction methods return transaction hash right after sending, use `wait_for_receipt`
+    or `wait_for_receipts` to await them.
+    """
+
+    def __init__(self, transport, rps_game_address, rps_game_abi, rps_token_address, rps_token_abi):
+        self.transport = transport
+        self.rps_game_address = rps_game_address
+        self.rps_token_address = rps_token_address
+        self.rps_game = ContractAbi(rps_game_abi)
+        self.rps_token = ContractAbi(rps_token_abi)
+        self.nonce_manager = NonceManager(transport)
+        self.chain_id = None
+        self.gas_price = None
+
+    async def __aenter__(self):
+        await self.transport.open()
+        self.chain_id, self.gas_price = await asyncio.gather(
+            self.transport.request("eth_chainId", []), self.transport.request("eth_gasPrice", []))
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.transport.close()
+
+    async def call(self, to, contract_abi, function_name, *args):
+        result = await self.transport.request(
+            "eth_call", [{"to": to, "data": contract_abi.encode_call(function_name, *args)}, "latest"])
+        return contract_abi.decode_result(function_name, result)
+
+    async def send_transaction(self, account, to, data, value=0, gas=DEFAULT_GAS_LIMIT):
+        tx = {"to": to, "data": data, "value": hex(value), "gas": hex(gas), "gasPrice": self.gas_price}
+        if isinstance(account, str):
+            tx["from"] = account
+            return await self.transport.request("eth_sendTransaction", [tx])
+        tx.update(value=value, gas=gas, gasPrice=int(self.gas_price, 16), chainId=int(self.chain_id, 16),
+                  nonce=await self.nonce_manager.next_nonce(account.address))
+        signed_tx = Account.sign_transaction(tx, account.key)
+        try:
+            return await self.transport.request("eth_sendRawTransaction", ["0x" + bytes(signed_tx.rawTransaction).hex()])
+        except RpcError:
+            self.nonce_manager.reset(account.address)
+            raise
+
+    async def wait_for_receipt(self, tx_hash, timeout=RECEIPT_TIMEOUT):
+        deadline = time.monotonic() + timeout
+        while True:
+            receipt = await self.transport.request("eth_getTransactionReceipt", [tx_hash])
+            if receipt is not None:
+                return receipt
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Transaction {tx_hash} was not mined in {timeout} seconds")
+            await asyncio.sleep(RECEIPT_POLL_INTERVAL)
+
+    async def wait_for_receipts(self, tx_hashes, timeout=RECEIPT_TIMEOUT):
+        return await asyncio.gather(*[self.wait_for_receipt(tx_hash, timeout) for tx_hash in tx_hashes])
+
+    async def pipeline(self, *tx_coroutines):
+        # coroutines are sent in given order, so nonces of one account stay in order,
+        # receipts are awaited concurrently afterwards
+        tx_hashes = [await tx_coroutine for tx_coroutine in tx_coroutines]
+        return await self.wait_for_receipts(tx_hashes)
+
+    async def deposit(self, account, value_in_wei):
+        return await self.send_transaction(account, self.rps_game_address,
+                                           self.rps_game.encode_call("depositFunds"), value_in_wei)
+
+    async def approve(self, account, amount):
+        return await self.send_transaction(account, self.rps_token_address,
+                                           self.rps_token.encode_call("approve", self.rps_game_address, amount))
+
+    async def join_game(self, account, symbol, bid):
+        return await self.send_transaction(account, self.rps_game_address,
+                                           self.rps_game.encode_call("joinGame", symbol, bid))
+
+    async def join_game_with_permit(self, account, symbol, bid, permit_value, deadline, v, r, s):
+        return await self.send_transaction(account, self.rps_game_address, self.rps_game.encode_call(
+            "joinGameWithPermit", symbol, bid, permit_value, deadline, v, r, s))
+
+    async def quite_queue(self, account):
+        return await self.send_transaction(account, self.rps_game_address, self.rps_game.encode_call("quiteQueue"))
+
+    async def withdraw(self, account):
+        return await self.send_transaction(account, self.rps_game_address, self.rps_game.encode_call("withdrawFunds"))
+
+    async def get_bid_values(self):
+        return list(await asyncio.gather(*[
+            self.call(self.rps_game_address, self.rps_game, "getLinkBidWithValues", bid) for bid in range(3)]))
+
+    async def get_eth_rps_ratio(self):
+        return await self.call(self.rps_game_address, self.rps_game, "getEthRpsRatio")
+
+    async def get_deposited_funds_value(self, address):
+        return await self.call(self.rps_game_address, self.rps_game, "getDepositedFundsValue", address)
+
+    async def is_player_in_queue(self, address):
+        return await self.call(self.rps_game_address, self.rps_game, "isPlayerInQueue", address)
+
+    async def get_queue_depths(self):
+        return list(await self.call(self.rps_game_address, self.rps_game, "getQueueDepths"))
+
+    async def get_game_config(self):
+        eth_rps_ratio, bid_values, internal_ledger_enabled = await self.call(
+            self.rps_game_address, self.rps_game, "getGameConfig")
+        return eth_rps_ratio, list(bid_values), internal_ledger_enabled
+
+    async def get_players_state(self, addresses):
+        deposited_funds, in_queue = await self.call(self.rps_game_address, self.rps_game, "getPlayersState", addresses)
+        return list(deposited_funds), list(in_queue)
@@ -0,0 +1,261 @@
+"""Lightweight RPS_Game command line client.
+
+Talks JSON-RPC to the node directly with ABI read from cached build artifacts, so it does not load
+brownie project. Only standard library is imported on the hot path, eth_account is imported only
+when transactions are signed locally and eth_utils only when ABI cache is rebuilt.
+
+    python -m scripts.rps_cli --game 0x... --from 0x... deposit 0.5
+    python -m scripts.rps_cli join rock low
+    python -m scripts.rps_cli status 0x...
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import urllib.request
+from decimal import Decimal
+from pathlib import Path
+
+DEFAULT_RPC_URL = "http://127.0.0.1:8545"
+BUILD_PATH = Path("build")
+CACHE_PATH = BUILD_PATH / "rps_cli_cache.json"
+CACHED_CONTRACTS = ["RPS_Game"]
+SYMBOLS = ["rock", "paper", "scissors"]
+BIDS = ["low", "medium", "high"]
+RECEIPT_POLL_INTERVAL = 0.2
+RECEIPT_TIMEOUT = 120
+
+
+class RpcError(Exception):
+    pass
+
+
+class RpcClient:
+    def __init__(self, url):
+        self.url = url
+        self.request_id = 0
+
+    def request(self, method, params):
+        self.request_id += 1
+        payload = json.dumps({"jsonrpc": "2.0", "id": self.request_id, "method": method, "params": params}).encode()
+        http_request = urllib.request.Request(self.url, payload, {"Content-Type": "application/json"})
+        with urllib.request.urlopen(http_request) as response:
+            body = json.load(response)
+        if "error" in body:
+            raise RpcError(body["error"].get("message", body["error"]))
+        return body["result"]
+
+
+def get_artifact_paths():
+    paths = [BUILD_PATH / "contracts" / f"{name}.json" for name in CACHED_CONTRACTS]
+    return paths + [BUILD_PATH / "deployments" / "map.json"]
+
+
+def get_artifacts_fingerprint():
+    return {str(path): path.stat().st_mtime for path in get_artifact_paths() if path.exists()}
+
+
+def build_cache():
+    # selectors need keccak, so eth_utils is imported only here
+    from eth_utils import function_abi_to_4byte_selector
+    contracts = {}
+    for name in CACHED_CONTRACTS:
+        with open(BUILD_PATH / "contracts" / f"{name}.json") as f:
+            abi = json.load(f)["abi"]
+        contracts[name] = {
+            item["name"]: {
+                "selector": function_abi_to_4byte_selector(item).hex(),
+                "inputs": [argument["type"] for argument in item["inputs"]],
+                "outputs": [output["type"] for output in item["outputs"]],
+            }
+            for item in abi if item["type"] == "function"
+        }
+    deployments_path = BUILD_PATH / "deployments" / "map.json"
+    deployments = json.loads(deployments_path.read_text()) if deployments_path.exists() else {}
+    return {"fingerprint": get_artifacts_fingerprint(), "contracts": contracts, "deployments": deployments}
+
+
+def load_cache():
+    if CACHE_PATH.exists():
+        with open(CACHE_PATH) as f:
+            cache = json.load(f)
+        if cache["fingerprint"] == get_artifacts_fingerprint():
+            return cache
+    cache = build_cache()
+    with open(CACHE_PATH, "w") as f:
+        json.dump(cache, f)
+    return cache
+
+
+def encode_argument(abi_type, value):
+    if abi_type == "address":
+        return int(value, 16).to_bytes(32, "big")
+    if abi_type == "bool":
+        return int(bool(value)).to_bytes(32, "big")
+    if abi_type.startswith("uint"):
+        return int(value).to_bytes(32, "big")
+    if abi_type.startswith("int"):
+        return int(value).to_bytes(32, "big", signed=True)
+    raise ValueError(f"Unsupported argument type {abi_type}")
+
+
+def decode_word(abi_type, word):
+    if abi_type == "address":
+        return "0x" + word[12:].hex()
+    if abi_type == "bool":
+        return word[-1] == 1
+    if abi_type.startswith("uint"):
+        return int.from_bytes(word, "big")
+    if abi_type.startswith("int"):
+        return int.from_bytes(word, "big", signed=True)
+    raise ValueError(f"Unsupported result type {abi_type}")
+
+
+def decode_result(output_types, result):
+    # only static types and fixed size arrays of them are used by this client
+    data = bytes.fromhex(result[2:])
+    words = [data[index:index + 32] for index in range(0, len(data), 32)]
+    values = []
+    position = 0
+    for output_type in output_types:
+        if output_type.endswith("]"):
+            base_type, size = output_type[:-1].split("[")
+            values.append([decode_word(base_type, word) for word in words[position:position + int(size)]])
+            position += int(size)
+        else:
+            values.append(decode_word(output_type, words[position]))
+            position += 1
+    return values[0] if len(values) == 1 else values
+
+
+class RPSGameCli:
+    def __init__(self, rpc, functions, game_address, sender=None, private_key=None):
+        self.rpc = rpc
+        self.functions = functions
+        self.game_address = game_address
+        self.sender = sender
+        self.private_key = private_key
+
+    def encode_call(self, function_name, *args):
+        function = self.functions[function_name]
+        encoded_args = b"".join(encode_argument(abi_type, value) for abi_type, value in zip(function["inputs"], args))
+        return "0x" + function["selector"] + encoded_args.hex()
+
+    def call(self, function_name, *args):
+        result = self.rpc.request("eth_call", [{"to": self.game_address,
+                                                "data": self.encode_call(function_name, *args)}, "latest"])
+        return decode_result(self.functions[function_name]["outputs"], result)
+
+    def transact(self, function_name, *args, value=0):
+        tx = {"to": self.game_address, "data": self.encode_call(function_name, *args), "value": hex(value)}
+        tx["from"] = self.get_sender_address()
+        if tx["from"] is None:
+            raise SystemExit("Transactions need --from address unlocked on node or RPS_PRIVATE_KEY")
+        # nodes fill missing gas of unlocked accounts with their own default, which joinGame match can exceed
+        tx["gas"] = self.rpc.request("eth_estimateGas", [tx])
+        if self.private_key is None:
+            return self.rpc.request("eth_sendTransaction", [tx])
+        return self.rpc.request("eth_sendRawTransaction", [self.sign_transaction(tx)])
+
+    def sign_transaction(self, tx):
+        from eth_account import Account
+        account = Account.from_key(self.private_key)
+        nonce, gas_price, chain_id = [int(self.rpc.request(method, params), 16) for method, params in (
+            ("eth_getTransactionCount", [account.address, "pending"]), ("eth_gasPrice", []), ("eth_chainId", []))]
+        signed_tx = account.sign_transaction({
+            "to": tx["to"], "data": tx["data"], "value": int(tx["value"], 16), "gas": int(tx["gas"], 16),
+            "gasPrice": gas_price, "nonce": nonce, "chainId": chain_id})
+        return "0x" + bytes(signed_tx.rawTransaction).hex()
+
+    def wait_for_receipt(self, tx_hash, timeout=RECEIPT_TIMEOUT):
+        deadline = time.monotonic() + timeout
+        while True:
+            receipt = self.rpc.request("eth_getTransactionReceipt", [tx_hash])
+            if receipt is not None:
+                return receipt
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Transaction {tx_hash} was not mined in {timeout} seconds")
+            time.sleep(RECEIPT_POLL_INTERVAL)
+
+    def get_sender_address(self):
+        if self.private_key is not None:
+            from eth_account import Account
+            return Account.from_key(self.private_key).address
+        return self.sender
+
+
+def parse_choice(value, names):
+    return int(value) if value.isdigit() else names.index(value.lower())
+
+
+def get_game_address(args, cache, rpc):
+    if args.game:
+        return args.game
+    chain_id = str(int(rpc.request("eth_chainId", []), 16))
+    game_addresses = cache["deployments"].get(chain_id, {}).get("RPS_Game")
+    if not game_addresses:
+        raise SystemExit(f"No RPS_Game deployment for chain {chain_id} in build artifacts, pass --game")
+    return game_addresses[0]
+
+
+def run_command(cli, args):
+    if args.command == "bids":
+        return dict(zip(BIDS, [cli.call("getLinkBidWithValues", bid) for bid in range(len(BIDS))]))
+    if args.command == "status":
+        address = args.address or cli.get_sender_address()
+        if address is None:
+            raise SystemExit("Pass address or --from")
+        return {"address": address, "deposited_funds": cli.call("getDepositedFundsValue", address),
+                "in_queue": cli.call("isPlayerInQueue", address), "queue_depths": cli.call("getQueueDepths")}
+    if args.command == "deposit":
+        tx_hash = cli.transact("depositFunds", value=int(Decimal(args.amount_in_eth) * 10 ** 18))
+    elif args.command == "join":
+        tx_hash = cli.transact("joinGame", parse_choice(args.symbol, SYMBOLS), parse_choice(args.bid, BIDS))
+    elif args.command == "quit":
+        tx_hash = cli.transact("quiteQueue")
+    else:
+        tx_hash = cli.transact("withdrawFunds")
+    if args.no_wait:
+        return {"transaction_hash": tx_hash}
+    receipt = cli.wait_for_receipt(tx_hash)
+    return {"transaction_hash": tx_hash, "status": int(receipt["status"], 16), "gas_used": int(receipt["gasUsed"], 16)}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="rps_cli", description="Lightweight RPS_Game client")
+    parser.add_argument("--rpc-url", default=os.environ.get("RPS_RPC_URL", DEFAULT_RPC_URL))
+    parser.add_argument("--game", default=os.environ.get("RPS_GAME_ADDRESS"),
+                        help="RPS_Game address, latest deployment from build/deployments is used by default")
+    parser.add_argument("--from", dest="sender", default=os.environ.get("RPS_FROM"),
+                        help="account unlocked on node, RPS_PRIVATE_KEY environment variable signs locally instead")
+    parser.add_argument("--no-wait", action="store_true", help="print transaction hash without waiting for receipt")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("deposit").add_argument("amount_in_eth")
+    join_parser = subparsers.add_parser("join")
+    join_parser.add_argument("symbol", help="rock, paper, scissors or 0-2")
+    join_parser.add_argument("bid", help="low, medium, high or 0-2")
+    subparsers.add_parser("quit")
+    subparsers.add_parser("withdraw")
+    subparsers.add_parser("status").add_argument("address", nargs="?")
+    subparsers.add_parser("bids")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    rpc = RpcClient(args.rpc_url)
+    cache = load_cache()
+    cli = RPSGameCli(rpc, cache["contracts"]["RPS_Game"], get_game_address(args, cache, rpc),
+                     args.sender, os.environ.get("RPS_PRIVATE_KEY"))
+    try:
+        result = run_command(cli, args)
+    except RpcError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print(json.dumps(result))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+from brownie import RPS_Token
+
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+
+class ShardRouter:
+    """Routes players joining a game to one of RPS_Game shards created by RPS_GameFactory.
+
+    Shard where somebody is already waiting for the chosen bid is preferred, so joining player is
+    matched right away. Otherwise player goes to the least-loaded shard, the one with fewest players
+    waiting in all bid queues. Only shards where player has enough funds are considered, in token
+    mode loser pays with transferFrom, so both player and the one waiting for the bid need allowance
+    for the shard.
+    """
+
+    def __init__(self, shards):
+        self.shards = list(shards)
+        self.internal_ledger_enabled = self.shards[0].isInternalLedgerEnabled()
+        # all shards of one factory share the token
+        self.rps_token = None if self.internal_ledger_enabled else RPS_Token.at(self.shards[0].rpsToken())
+
+    def get_candidate_shards(self, player_address, bid):
+        candidate_shards = []
+        for shard in self.shards:
+            (deposited_funds,), (in_queue,) = shard.getPlayersState([player_address])
+            if in_queue:
+                continue
+            # in token mode deposited funds are RPS balance of player, which all shards share
+            bid_value = shard.getLinkBidWithValues(bid)
+            if deposited_funds < bid_value:
+                continue
+            if not self.internal_ledger_enabled and not self.has_allowance(shard, player_address, bid, bid_value):
+                continue
+            candidate_shards.append(shard)
+        return candidate_shards
+
+    def has_allowance(self, shard, player_address, bid, bid_value):
+        if self.rps_token.allowance(player_address, shard.address) < bid_value:
+            return False
+        waiting_player_address = shard.getWaitingPlayerAddress(bid)
+        if waiting_player_address == ZERO_ADDRESS:
+            return True
+        # joining would revert if waiting player loses without allowance
+        return self.rps_token.allowance(waiting_player_address, shard.address) >= bid_value
+
+    def choose_shard(self, player_address, bid):
+        shards_with_load = [(shard, shard.getQueueDepths()) for shard in self.get_candidate_shards(player_address, bid)]
+        if not shards_with_load:
+            raise ValueError(f"No shard can take player {player_address} with bid {bid}")
+        for shard, queue_depths in shards_with_load:
+            if queue_depths[bid] > 0:
+                return shard
+        return min(shards_with_load, key=lambda shard_with_load: sum(shard_with_load[1]))[0]
+
+    def join_game(self, player, symbol, bid):
+        shard = self.choose_shard(player.address, bid)
+        return shard, shard.joinGame(symbol, bid, {"from": player})
@@ -0,0 +1,210 @@
+import queue
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from scripts.helpful_scripts import get_account
+from scripts.deploy import deploy_rps_token_and_game
+from scripts.indexer import build_event_decoders, decode_logs
+from brownie import accounts, web3
+from web3 import Web3
+from web3.exceptions import TimeExhausted
+
+ACCOUNTS_COUNT = 20
+ROUNDS = 2000
+WORKERS = 8
+ACCOUNT_FUNDING = Web3.toWei(100, 'ether')
+ACCOUNT_DEPOSIT = Web3.toWei(50, 'ether')
+TX_GAS_LIMIT = 500000
+RECEIPT_TIMEOUT = 120
+
+
+class NonceTracker:
+    def __init__(self):
+        self._nonces = {}
+        self._lock = threading.Lock()
+
+    def next_nonce(self, address):
+        with self._lock:
+            if address not in self._nonces:
+                self._nonces[address] = web3.eth.get_transaction_count(address, "pending")
+            nonce = self._nonces[address]
+            self._nonces[address] += 1
+            return nonce
+
+    def reset(self, address):
+        # next nonce is read from the node again, e.g. after transaction was rejected
+        with self._lock:
+            self._nonces.pop(address, None)
+
+
+class TransactionSender:
+    def __init__(self, nonce_tracker):
+        self.nonce_tracker = nonce_tracker
+        self.chain_id = web3.eth.chain_id
+        self.gas_price = web3.eth.gas_price
+
+    def send(self, account, to, data="0x", value=0):
+        tx = {
+            "from": account.address,
+            "to": to,
+            "data": data,
+            "value": value,
+            "gas": TX_GAS_LIMIT,
+            "gasPrice": self.gas_price,
+            "nonce": self.nonce_tracker.next_nonce(account.address),
+            "chainId": self.chain_id,
+        }
+        signed_tx = web3.eth.account.sign_transaction(tx, account.private_key)
+        try:
+            return web3.eth.send_raw_transaction(signed_tx.rawTransaction)
+        except ValueError:
+            self.nonce_tracker.reset(account.address)
+            raise
+
+    @staticmethod
+    def wait_for_receipts(tx_hashes):
+        return [web3.eth.wait_for_transaction_receipt(tx_hash, timeout=RECEIPT_TIMEOUT) for tx_hash in tx_hashes]
+
+
+class SimulationStats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.submitted = 0
+        self.reverted = 0
+        self.timed_out = 0
+        self.matches = 0
+        self.match_latencies = []
+
+    def record(self, reverted, match_latency=None, timed_out=False):
+        with self.lock:
+            self.submitted += 1
+            self.reverted += int(reverted)
+            self.timed_out += int(timed_out)
+            if match_latency is not None:
+                self.matches += 1
+                self.match_latencies.append(match_latency)
+
+
+def percentile(sorted_values, percent):
+    if not sorted_values:
+        return 0.0
+    index = min(int(round(percent / 100 * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+def create_funded_accounts(sender, accounts_count):
+    funder = get_account()
+    players = [accounts.add() for _ in range(accounts_count)]
+    # funder may be unlocked node account without private key, so brownie sends these
+    funding_txs = [funder.transfer(player, ACCOUNT_FUNDING, required_confs=0) for player in players]
+    sender.wait_for_receipts([funding_tx.txid for funding_tx in funding_txs])
+    return players
+
+
+def deposit_and_approve(sender, rps_token, rps_game, players):
+    tx_hashes = []
+    approve_data = rps_token.approve.encode_input(rps_game.address, 2 ** 256 - 1)
+    deposit_data = rps_game.depositFunds.encode_input()
+    for player in players:
+        # both transactions are pipelined, nonces come from the tracker instead of the node
+        tx_hashes.append(sender.send(player, rps_game.address, deposit_data, ACCOUNT_DEPOSIT))
+        tx_hashes.append(sender.send(player, rps_token.address, approve_data))
+    sender.wait_for_receipts(tx_hashes)
+
+
+class MatchmakingSimulation:
+    def __init__(self, sender, rps_game, players, rounds):
+        self.sender = sender
+        self.rps_game = rps_game
+        self.event_decoders = build_event_decoders(rps_game.abi)
+        self.free_players = queue.Queue()
+        for player in players:
+            self.free_players.put(player)
+        self.players_by_address = {player.address: player for player in players}
+        # set before sending, so it is known even if the matching join is processed first
+        self.join_submitted_at = {}
+        self.rounds_left = rounds
+        self.rounds_lock = threading.Lock()
+        self.stats = SimulationStats()
+
+    def take_round(self):
+        with self.rounds_lock:
+            if self.rounds_left == 0:
+                return False
+            self.rounds_left -= 1
+            return True
+
+    def play_round(self, player):
+        join_data = self.rps_game.joinGame.encode_input(random.randrange(3), random.randrange(3))
+        self.join_submitted_at[player.address] = time.perf_counter()
+        try:
+            receipt = self.sender.wait_for_receipts([self.sender.send(player, self.rps_game.address, join_data)])[0]
+        except ValueError:
+            receipt = None
+        except TimeExhausted:
+            # join may still be mined later, player goes back so the pool of free players doesn't shrink
+            self.stats.record(reverted=False, timed_out=True)
+            self.free_players.put(player)
+            return
+        if receipt is None or receipt.status == 0:
+            self.stats.record(reverted=True)
+            self.free_players.put(player)
+            return
+        events = {event["event"]: event for event in decode_logs(self.event_decoders, receipt.logs)}
+        if "matchEndedEvent" not in events:
+            # player stays in queue until other join matches him
+            self.stats.record(reverted=False)
+            return
+        waiting_player_address = events["matchEndedEvent"]["args"]["_player1Address"]
+        match_latency = time.perf_counter() - self.join_submitted_at[waiting_player_address]
+        self.stats.record(reverted=False, match_latency=match_latency)
+        self.free_players.put(self.players_by_address[waiting_player_address])
+        self.free_players.put(player)
+
+    def worker(self):
+        while self.take_round():
+            self.play_round(self.free_players.get())
+
+    def run(self, workers):
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for future in [executor.submit(self.worker) for _ in range(workers)]:
+                future.result()
+        return time.perf_counter() - start
+
+    def quite_waiting_players(self):
+        quite_data = self.rps_game.quiteQueue.encode_input()
+        tx_hashes = [self.sender.send(player, self.rps_game.address, quite_data)
+                     for player in self.players_by_address.values()
+                     if self.rps_game.isPlayerInQueue(player.address)]
+        self.sender.wait_for_receipts(tx_hashes)
+
+
+def print_report(stats, elapsed):
+    latencies = sorted(stats.match_latencies)
+    print(f"join transactions: {stats.submitted} in {elapsed:.2f}s ({stats.submitted / elapsed:.2f} tx/s)")
+    print(f"matches: {stats.matches}, reverted: {stats.reverted} "
+          f"({stats.reverted * 100 / max(stats.submitted, 1):.2f}%), timed out: {stats.timed_out}")
+    print(f"match latency p50: {percentile(latencies, 50) * 1000:.1f}ms, "
+          f"p95: {percentile(latencies, 95) * 1000:.1f}ms, "
+          f"p99: {percentile(latencies, 99) * 1000:.1f}ms")
+
+
+def simulate(accounts_count=ACCOUNTS_COUNT, rounds=ROUNDS, workers=WORKERS):
+    # at most one player per bid waits in queue, so every worker always finds a free player
+    if accounts_count < workers + 3:
+        raise ValueError("Simulation needs at least workers + 3 accounts")
+    rps_token, rps_game, owner_acc = deploy_rps_token_and_game()
+    sender = TransactionSender(NonceTracker())
+    players = create_funded_accounts(sender, accounts_count)
+    deposit_and_approve(sender, rps_token, rps_game, players)
+    simulation = MatchmakingSimulation(sender, rps_game, players, rounds)
+    elapsed = simulation.run(workers)
+    simulation.quite_waiting_players()
+    print_report(simulation.stats, elapsed)
+    return simulation.stats
+
+
+def main():
+    simulate()
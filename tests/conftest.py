@@ -0,0 +1,66 @@
+from scripts.deploy import deploy_rps_token_and_game
+from brownie import network
+import pytest
+from web3 import Web3
+
+
+def pytest_addoption(parser):
+    parser.addoption("--deploy-per-test", action="store_true", default=False,
+                     help="Deploy fresh RPS_Token/RPS_Game for every test instead of sharing one deployment.")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def worker_chain(request):
+    # with `brownie test -n N` every xdist worker launches its own ganache on port shifted by worker id,
+    # chain attached by host (e.g. ganache_local) would be shared and snapshots of workers would collide
+    if hasattr(request.config, "workerinput") and not network.rpc.is_child():
+        pytest.exit(f"Parallel tests need chain launched by brownie for every worker, "
+                    f"'{network.show_active()}' is attached to running node. Use development network.")
+
+
+@pytest.fixture(scope="module")
+def shared_rps_contracts(request, worker_chain):
+    # module_isolation resets the chain before every module, then module scoped fixtures deploy
+    # before fn_isolation takes its snapshot, so the deployment survives every revert of the module
+    if request.config.getoption("--deploy-per-test"):
+        return None
+    return deploy_rps_token_and_game()
+
+
+@pytest.fixture(scope="module")
+def shared_rps_ledger_contracts(request, worker_chain):
+    if request.config.getoption("--deploy-per-test"):
+        return None
+    return deploy_rps_token_and_game(internal_ledger_enabled=True)
+
+
+@pytest.fixture(autouse=True)
+def isolation(fn_isolation):
+    pass
+
+
+@pytest.fixture
+def rps_contracts(shared_rps_contracts):
+    if shared_rps_contracts is None:
+        return deploy_rps_token_and_game()
+    return shared_rps_contracts
+
+
+@pytest.fixture
+def rps_ledger_contracts(shared_rps_ledger_contracts):
+    if shared_rps_ledger_contracts is None:
+        return deploy_rps_token_and_game(internal_ledger_enabled=True)
+    return shared_rps_ledger_contracts
+
+
+@pytest.fixture
+def play_low_bid_match():
+    # returns helper playing one low bid match, players deposit deposit_in_eth first when given
+    def play(rps_token, rps_game, player_account_1, player_account_2, symbol_1=0, symbol_2=2, deposit_in_eth=0):
+        for player in (player_account_1, player_account_2):
+            if deposit_in_eth:
+                rps_game.depositFunds({"from": player, "value": Web3.toWei(deposit_in_eth, 'ether')}).wait(1)
+            rps_token.approve(rps_game.address, rps_game.getLowBidValue(), {'from': player}).wait(1)
+        rps_game.joinGame(symbol_1, 0, {'from': player_account_1}).wait(1)
+        rps_game.joinGame(symbol_2, 0, {'from': player_account_2}).wait(1)
+    return play
@@ -0,0 +1,77 @@
+from scripts import deploy
+from scripts.deploy import deploy_rps_token_and_game
+import json
+import pytest
+
+
+@pytest.fixture
+def manifest_directory(tmp_path, monkeypatch):
+    monkeypatch.setattr(deploy, "MANIFEST_DIRECTORY", tmp_path)
+    return tmp_path
+
+
+@pytest.mark.require_network("development", "ganache", "ganache_local")
+def test_deploy_wires_token_in_constructor():
+    # Arrange / Act
+    rps_token, rps_game, owner_acc = deploy_rps_token_and_game()
+    # Assert
+    assert rps_token.isRPSGame(rps_game.address)
+    assert rps_game.rpsToken() == rps_token.address
+    assert [tx.contract_address for tx in owner_acc.history[-2:]] == [rps_token.address, rps_game.address]
+
+
+@pytest.mark.require_network("development", "ganache", "ganache_local")
+def test_deploy_reuses_manifest_positive(manifest_directory):
+    # Arrange
+    rps_token, rps_game, owner_acc = deploy_rps_token_and_game(use_manifest=True)
+    nonce_after_deploy = owner_acc.nonce
+    # Act
+    reused_rps_token, reused_rps_game, _ = deploy_rps_token_and_game(use_manifest=True)
+    # Assert
+    assert owner_acc.nonce == nonce_after_deploy
+    assert (reused_rps_token.address, reused_rps_game.address) == (rps_token.address, rps_game.address)
+    manifest = json.loads(deploy.get_manifest_path().read_text())
+    assert manifest["RPS_Game"]["address"] == rps_game.address
+    assert manifest["RPS_Token"]["bytecode_hash"] == deploy.get_bytecode_hash(deploy.RPS_Token)
+
+
+@pytest.mark.require_network("development", "ganache", "ganache_local")
+def test_deploy_redeploys_other_ledger_mode(manifest_directory):
+    # Arrange
+    rps_token, rps_game, owner_acc = deploy_rps_token_and_game(use_manifest=True)
+    # Act
+    ledger_rps_token, ledger_rps_game, _ = deploy_rps_token_and_game(internal_ledger_enabled=True, use_manifest=True)
+    # Assert
+    assert ledger_rps_game.address != rps_game.address
+    assert ledger_rps_game.isInternalLedgerEnabled()
+    assert json.loads(deploy.get_manifest_path().read_text())["RPS_Game"]["internal_ledger_enabled"]
+
+
+class FlattenedContract:
+    def __init__(self, source_paths):
+        self._build = {"allSourcePaths": {str(index): str(path) for index, path in enumerate(source_paths)}}
+        self.flatten_calls = 0
+
+    def get_verification_info(self):
+        self.flatten_calls += 1
+        return {"flattened_source": "contract Flattened {}"}
+
+
+def test_generate_flattern_contrac_skips_cache_for_unreadable_source(tmp_path, monkeypatch):
+    # Arrange
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(deploy, "FLATTEN_CACHE_PATH", tmp_path / "flatten_cache.json")
+    source_path = tmp_path / "RPS_Token.sol"
+    source_path.write_text("contract RPS_Token {}")
+    rps_token = FlattenedContract([source_path])
+    rps_game = FlattenedContract([source_path, tmp_path / "missing" / "Dependency.sol"])
+    monkeypatch.setattr(deploy, "RPS_Token", rps_token)
+    monkeypatch.setattr(deploy, "RPS_Game", rps_game)
+    # Act
+    deploy.generate_flattern_contrac()
+    deploy.generate_flattern_contrac()
+    # Assert
+    assert rps_token.flatten_calls == 1
+    assert rps_game.flatten_calls == 2
+    assert deploy.get_source_hash(rps_game) is None
+    assert list(json.loads(deploy.FLATTEN_CACHE_PATH.read_text())) == ["./rps_token.txt"]
@@ -0,0 +1,13 @@
+from scripts.gas_benchmark import compare_with_baseline
+
+
+def test_compare_with_baseline_regression_above_threshold():
+    baseline = {"joinGame_enqueue": 100000, "quiteQueue_low_bid": 100000}
+    gas_usage = {"joinGame_enqueue": 102001, "quiteQueue_low_bid": 102000}
+    assert compare_with_baseline(gas_usage, baseline, 2) == ["joinGame_enqueue"]
+
+
+def test_compare_with_baseline_new_path_and_improvement():
+    baseline = {"depositFunds": 60000}
+    gas_usage = {"depositFunds": 50000, "settleMatches_10": 300000}
+    assert compare_with_baseline(gas_usage, baseline, 2) == []
@@ -0,0 +1,113 @@
+from scripts.helpful_scripts import get_account
+from scripts.indexer import fetch_shrinking_range, index_events, open_database, get_cursor
+from types import SimpleNamespace
+from hexbytes import HexBytes
+import pytest
+from web3 import Web3
+
+
+def refusing_fetch(max_block_range, requested_ranges):
+    def fetch(from_block, to_block):
+        requested_ranges.append((from_block, to_block))
+        if to_block - from_block + 1 > max_block_range:
+            raise ValueError("query returned more than 10000 results")
+        return to_block - from_block + 1
+    return fetch
+
+
+def test_fetch_shrinking_range_halves_refused_range():
+    requested_ranges = []
+    fetch = refusing_fetch(300, requested_ranges)
+    assert fetch_shrinking_range(fetch, 100, 5000, 1000) == (250, 100, 349, 250)
+    assert requested_ranges == [(100, 1099), (100, 599), (100, 349)]
+    assert fetch_shrinking_range(fetch, 0, 5000, 1000, newest_first=True) == (250, 4751, 5000, 250)
+    assert fetch_shrinking_range(fetch, 4900, 5000, 1000, newest_first=True) == (101, 4900, 5000, 1000)
+    with pytest.raises(ValueError):
+        fetch_shrinking_range(refusing_fetch(0, []), 0, 10, 4)
+
+
+class ReorgingEth:
+    # head block is replaced by other branch right after its hash is read for the first time
+    block_number = 5
+
+    def __init__(self):
+        self.block_hashes = [HexBytes("0x" + "aa" * 32)] + [HexBytes("0x" + "bb" * 32)] * 3
+        self.requested_filters = []
+
+    def get_block(self, block_number):
+        return SimpleNamespace(hash=self.block_hashes.pop(0))
+
+    def get_logs(self, log_filter):
+        self.requested_filters.append(log_filter)
+        return []
+
+    def contract(self, abi):
+        return Web3().eth.contract(abi=abi)
+
+
+def test_index_events_refetches_reorged_chunk(monkeypatch, tmp_path):
+    # Arrange
+    reorging_eth = ReorgingEth()
+    monkeypatch.setattr("scripts.indexer.web3", SimpleNamespace(eth=reorging_eth))
+    contract_address = "0x" + "11" * 20
+    # Act
+    index_events(contract_address, [], str(tmp_path / "events.sqlite"))
+    # Assert
+    assert len(reorging_eth.requested_filters) == 2
+    assert get_cursor(open_database(str(tmp_path / "events.sqlite")), contract_address) == (5, "0x" + "bb" * 32)
+
+
+@pytest.mark.require_network("development", "ganache", "ganache_local")
+def test_index_events_positive(rps_contracts, play_low_bid_match, tmp_path):
+    # Arrange
+    rps_token, rps_game, owner_acc = rps_contracts
+    player_account_1 = get_account(index=1)
+    player_account_2 = get_account(index=2)
+    database_path = tmp_path / "events.sqlite"
+    play_low_bid_match(rps_token, rps_game, player_account_1, player_account_2, deposit_in_eth=1)
+    # Act
+    indexed_events = index_events(rps_game.address, rps_game.abi, database_path, chunk_size=1)
+    # Assert
+    connection = open_database(database_path)
+    rows = connection.execute("SELECT event_name, player_address, opponent_address, match_result "
+                              "FROM events ORDER BY block_number, log_index").fetchall()
+    assert indexed_events == 5
+    assert [row[0] for row in rows] == ["fundsDepositedEvent", "fundsDepositedEvent", "joinedQueueEvent",
+                                        "joinedQueueEvent", "matchEndedEvent"]
+    assert rows[-1][1:] == (player_account_1.address, player_account_2.address, 1)
+
+
+@pytest.mark.require_network("development", "ganache", "ganache_local")
+def test_index_events_resumes_from_cursor(rps_contracts, play_low_bid_match, tmp_path):
+    # Arrange
+    rps_token, rps_game, owner_acc = rps_contracts
+    player_account_1 = get_account(index=1)
+    player_account_2 = get_account(index=2)
+    database_path = tmp_path / "events.sqlite"
+    rps_game.depositFunds({"from": player_account_1, "value": Web3.toWei(1, 'ether')}).wait(1)
+    assert index_events(rps_game.address, rps_game.abi, database_path) == 1
+    # Act
+    play_low_bid_match(rps_token, rps_game, player_account_1, player_account_2, deposit_in_eth=1)
+    indexed_events = index_events(rps_game.address, rps_game.abi, database_path)
+    # Assert
+    assert indexed_events == 5
+    assert index_events(rps_game.address, rps_game.abi, database_path) == 0
+
+
+@pytest.mark.require_network("development", "ganache", "ganache_local")
+def test_index_events_rolls_back_on_reorg(rps_contracts, play_low_bid_match, tmp_path):
+    # Arrange
+    rps_token, rps_game, owner_acc = rps_contracts
+    player_account_1 = get_account(index=1)
+    player_account_2 = get_account(index=2)
+    database_path = tmp_path / "events.sqlite"
+    play_low_bid_match(rps_token, rps_game, player_account_1, player_account_2, deposit_in_eth=1)
+    index_events(rps_game.address, rps_game.abi, database_path)
+    connection = open_database(database_path)
+    with connection:
+        connection.execute("UPDATE cursors SET block_hash = '0xdead'")
+    # Act
+    indexed_events = index_events(rps_game.address, rps_game.abi, database_path, rollback_blocks=3)
+    # Assert
+    assert indexed_events == 3
+    assert connection.execute("SELECT COUNT(*) FROM events").fetchone()[0] == 5
@@ -0,0 +1,70 @@
+from scripts.helpful_scripts import get_account
+from scripts.player_history import PlayerHistory, event_to_history_entry
+import pytest
+from web3 import Web3
+
+
+def test_match_entry_uses_result_description():
+    # Arrange
+    event = {"event": "matchEndedEvent", "blockNumber": 7, "transactionHash": bytes(32), "logIndex": 0,
+             "args": {"_player1Address": "0x" + "11" * 20, "_player1Symbol": 0, "_player2Address": "0x" + "22" * 20,
+                      "_player2Symbol": 2, "_bidValue": 1, "_matchResult": 1}}
+    # Act
+    player_1_entry = event_to_history_entry(event, "0x" + "11" * 20)
+    player_2_entry = event_to_history_entry(event, "0x" + "22" * 20)
+    # Assert
+    assert player_1_entry["result"] == player_2_entry["result"] == "Winner: player1"
+    assert (player_1_entry["outcome"], player_2_entry["outcome"]) == ("won", "lost")
+    assert player_2_entry["opponent"] == "0x" + "11" * 20
+
+
+@pytest.mark.require_network("development", "ganache", "ganache_local")
+def test_player_history_positive(rps_contracts, play_low_bid_match):
+    # Arrange
+    rps_token, rps_game, owner_acc = rps_contracts
+    player_account_1 = get_account(index=1)
+    player_account_2 = get_account(index=2)
+    player_account_3 = get_account(index=3)
+    start_block = rps_game.tx.block_number
+    for player in (player_account_1, player_account_2, player_account_3):
+        rps_game.depositFunds({"from": player, "value": Web3.toWei(1, 'ether')}).wait(1)
+    play_low_bid_match(rps_token, rps_game, player_account_1, player_account_2, 0, 1)
+    play_low_bid_match(rps_token, rps_game, player_account_3, player_account_1, 2, 0)
+    play_low_bid_match(rps_token, rps_game, player_account_2, player_account_3, 1, 1)
+    rps_game.withdrawFunds({"from": player_account_1}).wait(1)
+    # Act
+    history = PlayerHistory(rps_game.address, rps_game.abi).get_history(player_account_1.address, start_block)
+    # Assert
+    assert [entry["event"] for entry in history] == [
+        "fundsWithdrawnEvent", "matchEndedEvent", "matchEndedEvent", "fundsDepositedEvent"]
+    assert history[1]["opponent"] == player_account_3.address
+    assert history[1]["outcome"] == "won"
+    assert history[1]["result"] == "Winner: player2"
+    assert history[2]["opponent"] == player_account_2.address
+    assert history[2]["outcome"] == "lost"
+    assert history[3]["amount_in_eth"] == Web3.toWei(1, 'ether')
+
+
+@pytest.mark.require_network("development", "ganache", "ganache_local")
+def test_player_history_pages_match_full_history(rps_contracts, play_low_bid_match):
+    # Arrange
+    rps_token, rps_game, owner_acc = rps_contracts
+    player_account_1 = get_account(index=1)
+    player_account_2 = get_account(index=2)
+    start_block = rps_game.tx.block_number
+    for player in (player_account_1, player_account_2):
+        rps_game.depositFunds({"from": player, "value": Web3.toWei(1, 'ether')}).wait(1)
+    for _ in range(3):
+        play_low_bid_match(rps_token, rps_game, player_account_1, player_account_2, 0, 2)
+    player_history = PlayerHistory(rps_game.address, rps_game.abi)
+    # Act
+    pages = []
+    entries, to_block = player_history.get_page(player_account_2.address, block_range=2, from_block=start_block)
+    pages.append(entries)
+    while to_block is not None:
+        entries, to_block = player_history.get_page(player_account_2.address, to_block, 2, start_block)
+        pages.append(entries)
+    # Assert
+    assert len(pages) > 1
+    assert sum(pages, []) == player_history.get_history(player_account_2.address, start_block)
+    assert len(sum(pages, [])) == 4
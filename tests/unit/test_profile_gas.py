@@ -0,0 +1,56 @@
+import pytest
+from scripts.profile_gas import get_step_costs, profile_trace, profile_transaction
+from scripts.gas_benchmark import fund_players
+from scripts.helpful_scripts import get_account
+
+
+def make_step(op, gas, gas_cost, depth, fn, stack=None, address="0x01"):
+    return {"op": op, "gas": gas, "gasCost": gas_cost, "depth": depth, "fn": fn,
+            "stack": stack or [], "address": address, "contractName": fn.split(".")[0], "source": None}
+
+
+# RPS_Game.joinGame loads slot 1 twice and calls RPS_Token.transferFrom, which stores slot 2
+synthetic_trace = [
+    make_step("SLOAD", 10000, 2100, 1, "RPS_Game.joinGame", ["01"]),
+    make_step("SLOAD", 7900, 100, 1, "RPS_Game.joinGame", ["01"]),
+    make_step("CALL", 7800, 7000, 1, "RPS_Game.joinGame"),
+    make_step("SSTORE", 5000, 2900, 2, "RPS_Token.transferFrom", ["02"], "0x02"),
+    make_step("RETURN", 2100, 0, 2, "RPS_Token.transferFrom", address="0x02"),
+    make_step("STOP", 2000, 0, 1, "RPS_Game.joinGame"),
+]
+
+
+def test_get_step_costs_includes_callee_gas():
+    assert get_step_costs(synthetic_trace) == [2100, 100, 5800, 2900, 0, 0]
+
+
+def test_profile_trace_splits_gas():
+    # Act
+    profile = profile_trace(synthetic_trace, 30000)
+    # Assert
+    assert profile["execution_gas"] == 8000
+    assert profile["intrinsic_and_refund_gas"] == 22000
+    assert profile["functions"]["RPS_Game.joinGame"]["gas"] == 2100 + 100 + 5800 - 2900
+    assert profile["functions"]["RPS_Token.transferFrom"]["gas"] == 2900
+    assert profile["storage"]["RPS_Game.slot 0x1"] == {"SLOAD": 2, "SSTORE": 0, "gas": 2200, "cold": 1, "warm": 1}
+    assert profile["calls"][0]["overhead"] == 2900
+
+
+@pytest.mark.require_network("development", "ganache", "ganache_local")
+def test_profile_match_transaction(rps_contracts):
+    # Arrange
+    rps_token, rps_game, owner_acc = rps_contracts
+    player_account_1 = get_account(index=1)
+    player_account_2 = get_account(index=2)
+    fund_players(rps_token, rps_game, [player_account_1, player_account_2])
+    rps_game.joinGame(0, 0, {"from": player_account_1}).wait(1)
+    join_tx = rps_game.joinGame(1, 0, {"from": player_account_2})
+    join_tx.wait(1)
+    # Act
+    profile = profile_transaction(join_tx)
+    # Assert
+    assert profile["execution_gas"] + profile["intrinsic_and_refund_gas"] == join_tx.gas_used
+    assert "RPS_Game.joinGame" in profile["functions"]
+    assert "RPS_Token.transferFrom" in profile["functions"]
+    assert "RPS_Game.linkBidWithWaitingPlayer" in profile["storage"]
+    assert any(call["callee"] == "RPS_Token.transferFrom" for call in profile["calls"])
@@ -0,0 +1,50 @@
+from scripts.helpful_scripts import get_account
+from scripts.read_cache import GameReadCache
+import pytest
+from web3 import Web3
+
+
+@pytest.mark.require_network("development", "ganache", "ganache_local")
+def test_read_cache_serves_cached_config_until_bid_update(rps_contracts):
+    # Arrange
+    rps_token, rps_game, owner_acc = rps_contracts
+    read_cache = GameReadCache(rps_game, rps_token, refresh_interval=0)
+    eth_rps_ratio, bid_values, internal_ledger_enabled = read_cache.get_game_config()
+    # Act / Assert
+    assert read_cache.get_game_config() is read_cache.config
+    rps_game.updateLowBidValue(bid_values[0] + 1, {"from": owner_acc}).wait(1)
+    assert read_cache.get_game_config()[1][0] == bid_values[0] + 1
+
+
+@pytest.mark.require_network("development", "ganache", "ganache_local")
+def test_read_cache_invalidates_players_on_events(rps_contracts):
+    # Arrange
+    rps_token, rps_game, owner_acc = rps_contracts
+    player_account_1 = get_account(index=1)
+    player_account_2 = get_account(index=2)
+    read_cache = GameReadCache(rps_game, rps_token, refresh_interval=0)
+    assert read_cache.get_players_state([player_account_1, player_account_2]) == {
+        player_account_1.address: (0, False), player_account_2.address: (0, False)}
+    # Act
+    rps_game.depositFunds({"from": player_account_1, "value": Web3.toWei(1, 'ether')}).wait(1)
+    rps_game.joinGame(0, 0, {'from': player_account_1}).wait(1)
+    read_cache.refresh()
+    # Assert
+    assert player_account_1.address not in read_cache.players_state
+    assert player_account_2.address in read_cache.players_state
+    deposited_funds, in_queue = read_cache.get_players_state([player_account_1])[player_account_1.address]
+    assert deposited_funds == rps_game.getDepositedFundsValue(player_account_1.address)
+    assert in_queue
+
+
+@pytest.mark.require_network("development", "ganache", "ganache_local")
+def test_read_cache_invalidates_players_on_token_transfer(rps_contracts):
+    # Arrange
+    rps_token, rps_game, owner_acc = rps_contracts
+    player_account_1 = get_account(index=1)
+    read_cache = GameReadCache(rps_game, rps_token, refresh_interval=0)
+    read_cache.get_players_state([player_account_1])
+    # Act
+    rps_token.transfer(player_account_1, 1000, {"from": owner_acc}).wait(1)
+    # Assert
+    assert read_cache.get_players_state([player_account_1])[player_account_1.address] == (1000, False)
@@ -0,0 +1,88 @@
+from scripts.helpful_scripts import get_account
+import pytest
+
+np = pytest.importorskip("numpy")
+from scripts.reference_model import RPSGameModel, match_results, REJECTED  # noqa: E402
+from scripts.differential_runner import simulate_rounds, sample_matches, split_into_rounds, replay_matches  # noqa: E402
+
+match_results_data = [
+    (0, 0, 0), (0, 1, 2), (0, 2, 1),
+    (1, 0, 1), (1, 1, 0), (1, 2, 2),
+    (2, 0, 2), (2, 1, 1), (2, 2, 0),
+]
+
+
+def test_match_results_vectorized():
+    symbols_1, symbols_2, expected_results = zip(*match_results_data)
+    assert list(match_results(symbols_1, symbols_2)) == list(expected_results)
+
+
+def test_play_matches_transfers_bids():
+    # Arrange
+    model = RPSGameModel(4)
+    model.deposit(range(4), 10 ** 18)
+    low_bid = int(model.bid_values[0]) * model.unit
+    # Act
+    results = model.play_matches([0, 2], [0, 1], [1, 3], [1, 1], [0, 0])
+    # Assert
+    assert list(results) == [2, 0]
+    assert model.balance_of(0) == 10 ** 22 - low_bid
+    assert model.balance_of(1) == 10 ** 22 + low_bid
+    assert model.balance_of(2) == model.balance_of(3) == 10 ** 22
+
+
+def test_play_matches_rejects_players_without_funds():
+    model = RPSGameModel(4)
+    model.deposit([0, 1], 10 ** 18)
+    results = model.play_matches([0, 2], [0, 0], [1, 3], [1, 1], [0, 0])
+    assert list(results) == [2, REJECTED]
+    assert model.balance_of(2) == model.balance_of(3) == 0
+
+
+def test_play_matches_duplicated_player_fail():
+    model = RPSGameModel(3)
+    model.deposit(range(3), 10 ** 18)
+    with pytest.raises(ValueError):
+        model.play_matches([0, 0], [0, 0], [1, 2], [1, 1], [0, 0])
+
+
+def test_join_game_waiting_slot():
+    model = RPSGameModel(3)
+    model.deposit(range(3), 10 ** 18)
+    assert model.join_game(0, 2, 1) is None
+    with pytest.raises(ValueError, match="2 games at the same time"):
+        model.join_game(0, 2, 1)
+    assert model.join_game(1, 1, 1) == (0, 1)
+    assert model.join_game(2, 0, 1) is None
+    assert model.quite_queue(2) == 1
+
+
+def test_deposit_not_divisible_by_unit_stays_exact():
+    # Arrange
+    model = RPSGameModel(2)
+    model.deposit([0, 1], 10 ** 18)
+    # Act
+    model.deposit([1], 10 ** 14 + 1)
+    results = model.play_matches([0], [1], [1], [0], [2])
+    # Assert
+    assert list(results) == [1]
+    assert model.balance_of(0) == 10 ** 22 + 10 ** 19
+    assert model.balance_of(1) == 10 ** 22 + (10 ** 14 + 1) * 10 ** 4 - 10 ** 19
+    assert model.withdraw(1) == 10 ** 18 + 10 ** 14 + 1 - 10 ** 15
+
+
+def test_split_into_rounds_keeps_players_unique():
+    matches = [(0, 0, 1, 0, 0, 0), (2, 1, 3, 0, 0, 1), (1, 2, 2, 2, 1, 0), (0, 1, 3, 1, 2, 0)]
+    assert split_into_rounds(matches) == [matches[:2], matches[2:]]
+
+
+@pytest.mark.require_network("development", "ganache", "ganache_local")
+def test_chain_matches_reference_model(rps_contracts):
+    # Arrange
+    rps_token, rps_game, owner_acc = rps_contracts
+    rng = np.random.default_rng(2021)
+    player_accounts = [get_account(index=index) for index in range(1, 5)]
+    matches = sample_matches(rng, simulate_rounds(rng, len(player_accounts), 1000), 12)
+    # Act / Assert
+    model = replay_matches(rps_token, rps_game, player_accounts, matches)
+    assert model.eth_held == rps_game.balance() + rps_token.balance()
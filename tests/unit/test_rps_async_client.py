@@ -0,0 +1,144 @@
+from scripts.helpful_scripts import get_account
+from brownie import web3
+import asyncio
+import json
+import pytest
+from web3 import Web3
+
+pytest.importorskip("aiohttp")
+from scripts.rps_async_client import RPSAsyncClient, HttpTransport, WebSocketTransport  # noqa: E402
+
+
+def create_client(rps_token, rps_game):
+    return RPSAsyncClient(HttpTransport(web3.provider.endpoint_uri), rps_game.address, rps_game.abi,
+                          rps_token.address, rps_token.abi)
+
+
+async def handle_rpc_requests(websocket, path=None):
+    # answers eth_chainId, ignores "never_answer" and drops connection on "close_connection"
+    async for message in websocket:
+        request = json.loads(message)
+        if request["method"] == "close_connection":
+            await websocket.close()
+            return
+        if request["method"] == "eth_chainId":
+            await websocket.send(json.dumps({"jsonrpc": "2.0", "id": request["id"], "result": "0x539"}))
+
+
+def run_with_websocket_transport(send_requests, request_timeout=1):
+    websockets = pytest.importorskip("websockets")
+
+    async def run():
+        server = await websockets.serve(handle_rpc_requests, "127.0.0.1", 0)
+        transport = WebSocketTransport(f"ws://127.0.0.1:{server.sockets[0].getsockname()[1]}", 1, request_timeout)
+        try:
+            await transport.open()
+            return await send_requests(transport)
+        finally:
+            await transport.close()
+            server.close()
+            await server.wait_closed()
+    return asyncio.run(run())
+
+
+def test_websocket_transport_matches_responses():
+    # Arrange
+    async def send_requests(transport):
+        return await asyncio.gather(*[transport.request("eth_chainId", []) for _ in range(5)])
+    # Act
+    results = run_with_websocket_transport(send_requests)
+    # Assert
+    assert results == ["0x539"] * 5
+
+
+def test_websocket_transport_request_timeout():
+    # Arrange
+    async def send_requests(transport):
+        with pytest.raises(asyncio.TimeoutError):
+            await transport.request("never_answer", [])
+        return transport.pending_requests
+    # Act
+    pending_requests = run_with_websocket_transport(send_requests, request_timeout=0.2)
+    # Assert
+    assert pending_requests == [{}]
+
+
+def test_websocket_transport_fails_pending_requests_on_close():
+    # Arrange
+    async def send_requests(transport):
+        waiting_request = asyncio.ensure_future(transport.request("never_answer", []))
+        await asyncio.sleep(0.1)
+        with pytest.raises(ConnectionError):
+            await transport.request("close_connection", [])
+        with pytest.raises(ConnectionError):
+            await waiting_request
+        with pytest.raises(ConnectionError):
+            await transport.request("eth_chainId", [])
+    # Act / Assert
+    run_with_websocket_transport(send_requests, request_timeout=5)
+
+
+@pytest.mark.require_network("development", "ganache", "ganache_local")
+def test_async_client_views(rps_contracts):
+    # Arrange
+    rps_token, rps_game, owner_acc = rps_contracts
+    player_account_1 = get_account(index=1)
+
+    async def read_views():
+        async with create_client(rps_token, rps_game) as client:
+            return await asyncio.gather(client.get_bid_values(), client.get_eth_rps_ratio(),
+                                        client.get_deposited_funds_value(player_account_1.address),
+                                        client.is_player_in_queue(player_account_1.address),
+                                        client.get_queue_depths())
+    # Act
+    bid_values, eth_rps_ratio, deposited_funds, is_in_queue, queue_depths = asyncio.run(read_views())
+    # Assert
+    assert bid_values == [rps_game.getLowBidValue(), rps_game.getMediumBidValue(), rps_game.getHighBidValue()]
+    assert eth_rps_ratio == rps_game.getEthRpsRatio()
+    assert deposited_funds == 0
+    assert is_in_queue is False
+    assert queue_depths == [0, 0, 0]
+
+
+@pytest.mark.require_network("development", "ganache", "ganache_local")
+def test_async_client_pipelined_match(rps_contracts):
+    # Arrange
+    rps_token, rps_game, owner_acc = rps_contracts
+    player_1 = get_account(index=1).address
+    player_2 = get_account(index=2).address
+    amount_deposited = Web3.toWei(1, 'ether')
+    low_bid = rps_game.getLowBidValue()
+
+    async def play_match():
+        async with create_client(rps_token, rps_game) as client:
+            await client.pipeline(
+                client.deposit(player_1, amount_deposited),
+                client.deposit(player_2, amount_deposited),
+                client.approve(player_2, low_bid))
+            receipts = await client.pipeline(client.join_game(player_1, 0, 0), client.join_game(player_2, 2, 0))
+            return receipts, await client.get_deposited_funds_value(player_1)
+    # Act
+    receipts, player_balance_1 = asyncio.run(play_match())
+    # Assert
+    assert [int(receipt["status"], 16) for receipt in receipts] == [1, 1]
+    assert player_balance_1 == amount_deposited * rps_game.getEthRpsRatio() + low_bid
+    assert rps_game.isPlayerInQueue(player_1) is False
+
+
+@pytest.mark.require_network("development", "ganache", "ganache_local")
+def test_async_client_signs_locally(rps_contracts):
+    # Arrange
+    rps_token, rps_game, owner_acc = rps_contracts
+    local_account = web3.eth.account.create()
+    owner_acc.transfer(local_account.address, Web3.toWei(2, 'ether')).wait(1)
+    amount_deposited = Web3.toWei(1, 'ether')
+
+    async def deposit_and_join():
+        async with create_client(rps_token, rps_game) as client:
+            return await client.pipeline(client.deposit(local_account, amount_deposited),
+                                         client.join_game(local_account, 1, 0))
+    # Act
+    asyncio.run(deposit_and_join())
+    # Assert
+    assert rps_game.getDepositedFundsValue(local_account.address) == amount_deposited * rps_game.getEthRpsRatio()
+    assert rps_game.isPlayerInQueue(local_account.address)
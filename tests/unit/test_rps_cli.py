@@ -0,0 +1,88 @@
+import json
+import subprocess
+import sys
+from scripts.helpful_scripts import get_account
+from scripts.rps_cli import RPSGameCli, decode_result, encode_argument, main
+from brownie import web3
+import pytest
+from web3 import Web3
+
+
+def test_decode_static_result():
+    words = "".join(value.to_bytes(32, "big").hex() for value in (10000, 1, 2, 3, 1))
+    assert decode_result(["uint256", "uint256[3]", "bool"], "0x" + words) == [10000, [1, 2, 3], True]
+    assert encode_argument("uint8", 2) == (2).to_bytes(32, "big")
+
+
+def test_cli_import_skips_heavy_modules():
+    code = "import sys, scripts.rps_cli; print([m for m in ('brownie', 'web3', 'eth_abi') if m in sys.modules])"
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert output.strip() == "[]"
+
+
+class RecordingRpc:
+    def __init__(self, results):
+        self.results = results
+        self.requests = []
+
+    def request(self, method, params):
+        self.requests.append((method, params))
+        return self.results[method]
+
+
+def test_transact_estimates_gas_for_unlocked_account():
+    rpc = RecordingRpc({"eth_estimateGas": "0x1d4c0", "eth_sendTransaction": "0x" + "ab" * 32})
+    functions = {"quiteQueue": {"selector": "12345678", "inputs": [], "outputs": []}}
+    cli = RPSGameCli(rpc, functions, "0x" + "11" * 20, sender="0x" + "22" * 20)
+    assert cli.transact("quiteQueue") == "0x" + "ab" * 32
+    assert [method for method, _ in rpc.requests] == ["eth_estimateGas", "eth_sendTransaction"]
+    assert rpc.requests[1][1][0]["gas"] == "0x1d4c0"
+    assert rpc.requests[1][1][0]["from"] == "0x" + "22" * 20
+
+
+def run_cli(capsys, *argv):
+    assert main(list(argv)) == 0
+    return json.loads(capsys.readouterr().out)
+
+
+@pytest.mark.require_network("development", "ganache", "ganache_local")
+def test_cli_commands_positive(rps_contracts, capsys):
+    # Arrange
+    rps_token, rps_game, owner_acc = rps_contracts
+    player_account = get_account(index=1)
+    common_args = ["--rpc-url", web3.provider.endpoint_uri, "--game", rps_game.address, "--from", player_account.address]
+    # Act
+    bids = run_cli(capsys, *common_args, "bids")
+    deposit = run_cli(capsys, *common_args, "deposit", "1")
+    join = run_cli(capsys, *common_args, "join", "paper", "low")
+    status = run_cli(capsys, *common_args, "status")
+    quit_queue = run_cli(capsys, *common_args, "quit")
+    withdraw = run_cli(capsys, *common_args, "withdraw")
+    # Assert
+    assert bids == {"low": rps_game.getLowBidValue(), "medium": rps_game.getMediumBidValue(),
+                    "high": rps_game.getHighBidValue()}
+    assert deposit["status"] == join["status"] == quit_queue["status"] == withdraw["status"] == 1
+    assert status["deposited_funds"] == Web3.toWei(1, 'ether') * rps_game.getEthRpsRatio()
+    assert status["in_queue"]
+    assert status["queue_depths"] == [1, 0, 0]
+    assert rps_game.getDepositedFundsValue(player_account.address) == 0
+
+
+@pytest.mark.require_network("development", "ganache", "ganache_local")
+def test_cli_join_game_match_positive(rps_contracts, capsys):
+    # Arrange
+    rps_token, rps_game, owner_acc = rps_contracts
+    player_account_1 = get_account(index=1)
+    player_account_2 = get_account(index=2)
+    common_args = ["--rpc-url", web3.provider.endpoint_uri, "--game", rps_game.address]
+    for player in (player_account_1, player_account_2):
+        run_cli(capsys, *common_args, "--from", player.address, "deposit", "1")
+        rps_token.approve(rps_game.address, rps_game.getLowBidValue(), {"from": player}).wait(1)
+    player_balance_1 = rps_game.getDepositedFundsValue(player_account_1.address)
+    # Act
+    run_cli(capsys, *common_args, "--from", player_account_1.address, "join", "rock", "low")
+    join = run_cli(capsys, *common_args, "--from", player_account_2.address, "join", "paper", "low")
+    # Assert
+    assert join["status"] == 1
+    assert rps_game.getDepositedFundsValue(player_account_1.address) == player_balance_1 - rps_game.getLowBidValue()
+    assert run_cli(capsys, *common_args, "status", player_account_2.address)["queue_depths"] == [0, 0, 0]
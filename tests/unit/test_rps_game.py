@@ -1,14 +1,13 @@
-from scripts.helpful_scripts import get_account
-from scripts.deploy import deploy_rps_token_and_game
-from brownie import reverts
+from scripts.helpful_scripts import get_account, sign_permit
+from brownie import reverts, accounts, chain
 import pytest
 from web3 import Web3
 
 
 @pytest.mark.require_network("development", "ganache", "ganache_local")
-def test_deposit_funds_positive():
+def test_deposit_funds_positive(rps_contracts):
     # Arrange
-    rps_token, rps_game, owner_acc = deploy_rps_token_and_game()
+    rps_token, rps_game, owner_acc = rps_contracts
     account = get_account(index=1)
     amount_deposited = Web3.toWei(1, 'ether')
     # Act
@@ -21,9 +20,9 @@ def test_deposit_funds_positive():
 
 
 @pytest.mark.require_network("development", "ganache", "ganache_local")
-def test_deposit_funds_below_minimal_value_fail():
+def test_deposit_funds_below_minimal_value_fail(rps_contracts):
     # Arrange
-    rps_token, rps_game, owner_acc = deploy_rps_token_and_game()
+    rps_token, rps_game, owner_acc = rps_contracts
     account = get_account(index=1)
     amount_deposited = Web3.toWei(0.00001, 'ether')
     contract_balance_of_rps_token = rps_token.balanceOf(rps_game.address)
@@ -34,9 +33,9 @@ def test_deposit_funds_below_minimal_value_fail():
 
 
 @pytest.mark.require_network("development", "ganache", "ganache_local")
-def test_multiple_deposit_funds_positive():
+def test_multiple_deposit_funds_positive(rps_contracts):
     # Arrange
-    rps_token, rps_game, owner_acc = deploy_rps_token_and_game()
+    rps_token, rps_game, owner_acc = rps_contracts
     account = get_account(index=1)
     amount_deposited = Web3.toWei(1, 'ether')
     contract_balance_of_rps_token = rps_token.balanceOf(rps_game.address)
@@ -56,9 +55,9 @@ def test_multiple_deposit_funds_positive():
 
 
 @pytest.mark.require_network("development", "ganache", "ganache_local")
-def test_withdraw_funds_positive():
+def test_withdraw_funds_positive(rps_contracts):
     # Arrange
-    rps_token, rps_game, owner_acc = deploy_rps_token_and_game()
+    rps_token, rps_game, owner_acc = rps_contracts
     account = get_account(index=1)
     amount_deposited = Web3.toWei(1, 'ether')
     rps_game.depositFunds({"from":account, "value": amount_deposited}).wait(1)
@@ -74,9 +73,9 @@ def test_withdraw_funds_positive():
 
 
 @pytest.mark.require_network("development", "ganache", "ganache_local")
-def test_withdraw_with_zero_funds_fail():
+def test_withdraw_with_zero_funds_fail(rps_contracts):
     # Arrange
-    rps_token, rps_game, owner_acc = deploy_rps_token_and_game()
+    rps_token, rps_game, owner_acc = rps_contracts
     account = get_account(index=1)
     # Act / Assert
     with reverts('You dont have funds deposited in this contract!'):
@@ -84,9 +83,9 @@ def test_withdraw_with_zero_funds_fail():
 
 
 @pytest.mark.require_network("development", "ganache", "ganache_local")
-def test_withdraw_after_joining_game_fail():
+def test_withdraw_after_joining_game_fail(rps_contracts):
     # Arrange
-    rps_token, rps_game, owner_acc = deploy_rps_token_and_game()
+    rps_token, rps_game, owner_acc = rps_contracts
     player_account_1 = get_account(index=1)
     amount_deposited = Web3.toWei(1, 'ether')
     rps_game.depositFunds({"from": player_account_1, "value": amount_deposited}).wait(1)
@@ -97,9 +96,9 @@ def test_withdraw_after_joining_game_fail():
 
 
 @pytest.mark.require_network("development", "ganache", "ganache_local")
-def test_update_bid_values_positive():
+def test_update_bid_values_positive(rps_contracts):
     # Arrange
-    rps_token, rps_game, owner_acc = deploy_rps_token_and_game()
+    rps_token, rps_game, owner_acc = rps_contracts
     low_bid = rps_game.getLowBidValue()
     medium_bid = rps_game.getMediumBidValue()
     high_bid = rps_game.getHighBidValue()
@@ -119,9 +118,9 @@ def test_update_bid_values_positive():
 
 
 @pytest.mark.require_network("development", "ganache", "ganache_local")
-def test_update_bid_value_bad_owner_fail():
+def test_update_bid_value_bad_owner_fail(rps_contracts):
     # Arrange
-    rps_token, rps_game, owner_acc = deploy_rps_token_and_game()
+    rps_token, rps_game, owner_acc = rps_contracts
     not_owner_account = get_account(index=1)
     low_bid = rps_game.getLowBidValue()
     medium_bid = rps_game.getMediumBidValue()
@@ -144,9 +143,9 @@ def test_update_bid_value_bad_owner_fail():
 
 
 @pytest.mark.require_network("development", "ganache", "ganache_local")
-def test_join_game_positive():
+def test_join_game_positive(rps_contracts):
     # Arrange
-    rps_token, rps_game, owner_acc = deploy_rps_token_and_game()
+    rps_token, rps_game, owner_acc = rps_contracts
     player_account_1 = get_account(index=1)
     amount_deposited = Web3.toWei(1, 'ether')
     rps_game.depositFunds({"from":player_account_1, "value": amount_deposited}).wait(1)
@@ -160,9 +159,9 @@ def test_join_game_positive():
 
 
 @pytest.mark.require_network("development", "ganache", "ganache_local")
-def test_join_game_no_funds_fail():
+def test_join_game_no_funds_fail(rps_contracts):
     # Arrange
-    rps_token, rps_game, owner_acc = deploy_rps_token_and_game()
+    rps_token, rps_game, owner_acc = rps_contracts
     player_account_1 = get_account(index=1)
     # Act / Assert
     with reverts('You dont have enough funds to join game with this bid!'):
@@ -170,9 +169,9 @@ def test_join_game_no_funds_fail():
 
 
 @pytest.mark.require_network("development", "ganache", "ganache_local")
-def test_join_game_multiple_joins_fail():
+def test_join_game_multiple_joins_fail(rps_contracts):
     # Arrange
-    rps_token, rps_game, owner_acc = deploy_rps_token_and_game()
+    rps_token, rps_game, owner_acc = rps_contracts
     player_account_1 = get_account(index=1)
     amount_deposited = Web3.toWei(1, 'ether')
     rps_game.depositFunds({"from": player_account_1, "value": amount_deposited}).wait(1)
@@ -193,9 +192,9 @@ test_choose_winner_and_transfer_reward_data = [
                          " player_2_symbol,"
                          " bid_value, winner",
                          test_choose_winner_and_transfer_reward_data)
-def test_choose_winner_and_transfer_reward(player_1_symbol, player_2_symbol, bid_value, winner):
+def test_choose_winner_and_transfer_reward(rps_contracts, player_1_symbol, player_2_symbol, bid_value, winner):
     # Arrange
-    rps_token, rps_game, owner_acc = deploy_rps_token_and_game()
+    rps_token, rps_game, owner_acc = rps_contracts
     player_account_1 = get_account(index=1)
     player_account_2 = get_account(index=2)
     amount_deposited = Web3.toWei(1, 'ether')
@@ -222,55 +221,55 @@ def test_choose_winner_and_transfer_reward(player_1_symbol, player_2_symbol, bid
         if (player_2_symbol == 0):
             assert rps_game.getDepositedFundsValue(player_account_1.address) == player_balance_1
             assert rps_game.getDepositedFundsValue(player_account_2.address) == player_balance_2
-            assert join_tx.events['matchEndedEvent']['_matchResult'] == 'Draw'
+            assert join_tx.events['matchEndedEvent']['_matchResult'] == 0
         elif (player_2_symbol == 1):
             assert rps_game.getDepositedFundsValue(player_account_1.address) \
                    == player_balance_1 - bid_value_dict[bid_value]
             assert rps_game.getDepositedFundsValue(player_account_2.address) \
                    == player_balance_2 + bid_value_dict[bid_value]
-            assert join_tx.events['matchEndedEvent']['_matchResult'] == 'Winner: player2'
+            assert join_tx.events['matchEndedEvent']['_matchResult'] == 2
         elif (player_2_symbol == 2):
             assert rps_game.getDepositedFundsValue(player_account_1.address) \
                    == player_balance_1 + bid_value_dict[bid_value]
             assert rps_game.getDepositedFundsValue(player_account_2.address) \
                    == player_balance_2 - bid_value_dict[bid_value]
-            assert join_tx.events['matchEndedEvent']['_matchResult'] == 'Winner: player1'
+            assert join_tx.events['matchEndedEvent']['_matchResult'] == 1
 
     if (player_1_symbol == 1):
         if (player_2_symbol == 1):
             assert rps_game.getDepositedFundsValue(player_account_1.address) == player_balance_1
             assert rps_game.getDepositedFundsValue(player_account_2.address) == player_balance_2
-            assert join_tx.events['matchEndedEvent']['_matchResult'] == 'Draw'
+            assert join_tx.events['matchEndedEvent']['_matchResult'] == 0
         elif (player_2_symbol == 0):
             assert rps_game.getDepositedFundsValue(player_account_1.address) \
                    == player_balance_1 + bid_value_dict[bid_value]
             assert rps_game.getDepositedFundsValue(player_account_2.address) \
                    == player_balance_2 - bid_value_dict[bid_value]
-            assert join_tx.events['matchEndedEvent']['_matchResult'] == 'Winner: player1'
+            assert join_tx.events['matchEndedEvent']['_matchResult'] == 1
         elif (player_2_symbol == 2):
             assert rps_game.getDepositedFundsValue(player_account_1.address) \
                    == player_balance_1 - bid_value_dict[bid_value]
             assert rps_game.getDepositedFundsValue(player_account_2.address) \
                    == player_balance_2 + bid_value_dict[bid_value]
-            assert join_tx.events['matchEndedEvent']['_matchResult'] == 'Winner: player2'
+            assert join_tx.events['matchEndedEvent']['_matchResult'] == 2
 
     if (player_1_symbol == 2):
         if (player_2_symbol == 2):
             assert rps_game.getDepositedFundsValue(player_account_1.address) == player_balance_1
             assert rps_game.getDepositedFundsValue(player_account_2.address) == player_balance_2
-            assert join_tx.events['matchEndedEvent']['_matchResult'] == 'Draw'
+            assert join_tx.events['matchEndedEvent']['_matchResult'] == 0
         elif (player_2_symbol == 0):
             assert rps_game.getDepositedFundsValue(player_account_1.address) \
                    == player_balance_1 - bid_value_dict[bid_value]
             assert rps_game.getDepositedFundsValue(player_account_2.address) \
                    == player_balance_2 + bid_value_dict[bid_value]
-            assert join_tx.events['matchEndedEvent']['_matchResult'] == 'Winner: player2'
+            assert join_tx.events['matchEndedEvent']['_matchResult'] == 2
         elif (player_2_symbol == 1):
             assert rps_game.getDepositedFundsValue(player_account_1.address) \
                    == player_balance_1 + bid_value_dict[bid_value]
             assert rps_game.getDepositedFundsValue(player_account_2.address) \
                    == player_balance_2 - bid_value_dict[bid_value]
-            assert join_tx.events['matchEndedEvent']['_matchResult'] == 'Winner: player1'
+            assert join_tx.events['matchEndedEvent']['_matchResult'] == 1
 
     assert join_tx.events['matchEndedEvent']['_player1Address'] == player_account_1.address
     assert join_tx.events['matchEndedEvent']['_player1Symbol'] == player_1_symbol
@@ -280,9 +279,9 @@ def test_choose_winner_and_transfer_reward(player_1_symbol, player_2_symbol, bid
 
 
 @pytest.mark.require_network("development", "ganache", "ganache_local")
-def test_quite_queue_positive():
+def test_quite_queue_positive(rps_contracts):
     # Arrange
-    rps_token, rps_game, owner_acc = deploy_rps_token_and_game()
+    rps_token, rps_game, owner_acc = rps_contracts
     player_account_1 = get_account(index=1)
     amount_deposited = Web3.toWei(1, 'ether')
     rps_game.depositFunds({"from":player_account_1, "value": amount_deposited}).wait(1)
@@ -295,12 +294,132 @@ def test_quite_queue_positive():
 
 
 @pytest.mark.require_network("development", "ganache", "ganache_local")
-def test_quite_queue_without_joining_game_fail():
+def test_quite_queue_without_joining_game_fail(rps_contracts):
     # Arrange
-    rps_token, rps_game, owner_acc = deploy_rps_token_and_game()
+    rps_token, rps_game, owner_acc = rps_contracts
     player_account_1 = get_account(index=1)
     amount_deposited = Web3.toWei(1, 'ether')
     rps_game.depositFunds({"from":player_account_1, "value": amount_deposited}).wait(1)
     # Act / Arrange
     with reverts('You cant quite queue, if you arent in it!'):
-        rps_game.quiteQueue({"from": player_account_1})
\ No newline at end of file
+        rps_game.quiteQueue({"from": player_account_1})
+
+@pytest.mark.require_network("development", "ganache", "ganache_local")
+@pytest.mark.parametrize("bid_value", [0, 1, 2])
+def test_quite_queue_each_bid_positive(rps_contracts, bid_value):
+    # Arrange
+    rps_token, rps_game, owner_acc = rps_contracts
+    player_account_1 = get_account(index=1)
+    amount_deposited = Web3.toWei(2, 'ether')
+    rps_game.depositFunds({"from": player_account_1, "value": amount_deposited}).wait(1)
+    rps_game.joinGame(0, bid_value, {'from': player_account_1}).wait(1)
+    assert rps_game.getQueueDepth(bid_value) == 1
+    # Act
+    quite_tx = rps_game.quiteQueue({"from": player_account_1})
+    quite_tx.wait(1)
+    # Assert
+    assert rps_game.isPlayerInQueue(player_account_1.address) == False
+    assert rps_game.getQueueDepth(bid_value) == 0
+    assert quite_tx.events['quiteQueueEvent']['_addressOfPlayer'] == player_account_1
+    assert quite_tx.events['quiteQueueEvent']['_chosenBid'] == bid_value
+
+
+@pytest.mark.require_network("development", "ganache", "ganache_local")
+def test_queue_depths_positive(rps_contracts):
+    # Arrange
+    rps_token, rps_game, owner_acc = rps_contracts
+    player_account_1 = get_account(index=1)
+    player_account_2 = get_account(index=2)
+    amount_deposited = Web3.toWei(1, 'ether')
+    rps_game.depositFunds({"from": player_account_1, "value": amount_deposited}).wait(1)
+    rps_game.depositFunds({"from": player_account_2, "value": amount_deposited}).wait(1)
+    assert rps_game.getQueueDepths() == [0, 0, 0]
+    # Act / Assert
+    rps_game.joinGame(0, 0, {'from': player_account_1}).wait(1)
+    rps_game.joinGame(0, 2, {'from': player_account_2}).wait(1)
+    assert rps_game.getQueueDepths() == [1, 0, 1]
+
+    rps_game.quiteQueue({"from": player_account_2}).wait(1)
+    assert rps_game.getQueueDepths() == [1, 0, 0]
+
+
+@pytest.mark.require_network("development", "ganache", "ganache_local")
+def test_update_bid_value_emits_event(rps_contracts):
+    # Arrange
+    rps_token, rps_game, owner_acc = rps_contracts
+    new_bid_value = Web3.toWei(2, 'ether')
+    # Act
+    update_tx = rps_game.updateMediumBidValue(new_bid_value, {"from": owner_acc})
+    update_tx.wait(1)
+    # Assert
+    assert update_tx.events['bidValueUpdatedEvent']['_bid'] == 1
+    assert update_tx.events['bidValueUpdatedEvent']['_newValue'] == new_bid_value
+
+
+@pytest.mark.require_network("development", "ganache", "ganache_local")
+def test_get_game_config_positive(rps_contracts):
+    # Arrange
+    rps_token, rps_game, owner_acc = rps_contracts
+    rps_game.updateHighBidValue(Web3.toWei(20, 'ether'), {"from": owner_acc}).wait(1)
+    # Act
+    eth_rps_ratio, bid_values, internal_ledger_enabled = rps_game.getGameConfig()
+    # Assert
+    assert eth_rps_ratio == rps_game.getEthRpsRatio()
+    assert bid_values == [rps_game.getLowBidValue(), rps_game.getMediumBidValue(), Web3.toWei(20, 'ether')]
+    assert internal_ledger_enabled == False
+
+
+@pytest.mark.require_network("development", "ganache", "ganache_local")
+def test_get_players_state_positive(rps_contracts):
+    # Arrange
+    rps_token, rps_game, owner_acc = rps_contracts
+    player_account_1 = get_account(index=1)
+    player_account_2 = get_account(index=2)
+    amount_deposited = Web3.toWei(1, 'ether')
+    rps_game.depositFunds({"from": player_account_1, "value": amount_deposited}).wait(1)
+    rps_game.joinGame(0, 0, {'from': player_account_1}).wait(1)
+    # Act
+    deposited_funds, in_queue = rps_game.getPlayersState([player_account_1, player_account_2])
+    # Assert
+    assert deposited_funds == [amount_deposited * rps_game.getEthRpsRatio(), 0]
+    assert in_queue == [True, False]
+
+
+@pytest.mark.require_network("development", "ganache", "ganache_local")
+def test_join_game_with_permit_positive(rps_contracts):
+    # Arrange
+    rps_token, rps_game, owner_acc = rps_contracts
+    player_account_1 = accounts.add()
+    player_account_2 = get_account(index=2)
+    owner_acc.transfer(player_account_1, Web3.toWei(2, 'ether')).wait(1)
+    amount_deposited = Web3.toWei(1, 'ether')
+    rps_game.depositFunds({"from": player_account_1, "value": amount_deposited}).wait(1)
+    rps_game.depositFunds({"from": player_account_2, "value": amount_deposited}).wait(1)
+    rps_token.approve(rps_game.address, amount_deposited * rps_game.getEthRpsRatio(), {"from": player_account_2}).wait(1)
+    bid_value = rps_game.getLowBidValue()
+    deadline = chain.time() + 3600
+    v, r, s = sign_permit(rps_token, player_account_1, rps_game.address, bid_value, deadline)
+    # Act
+    rps_game.joinGameWithPermit(0, 0, bid_value, deadline, v, r, s, {"from": player_account_1}).wait(1)
+    join_tx = rps_game.joinGame(1, 0, {"from": player_account_2})
+    join_tx.wait(1)
+    # Assert
+    assert join_tx.events['matchEndedEvent']['_matchResult'] == 2
+    assert rps_token.nonces(player_account_1.address) == 1
+    assert rps_token.allowance(player_account_1.address, rps_game.address) == 0
+    assert rps_game.getDepositedFundsValue(player_account_1.address) == amount_deposited * rps_game.getEthRpsRatio() - bid_value
+
+
+@pytest.mark.require_network("development", "ganache", "ganache_local")
+def test_join_game_with_permit_bad_signature_fail(rps_contracts):
+    # Arrange
+    rps_token, rps_game, owner_acc = rps_contracts
+    player_account_1 = accounts.add()
+    owner_acc.transfer(player_account_1, Web3.toWei(2, 'ether')).wait(1)
+    rps_game.depositFunds({"from": player_account_1, "value": Web3.toWei(1, 'ether')}).wait(1)
+    bid_value = rps_game.getLowBidValue()
+    deadline = chain.time() + 3600
+    v, r, s = sign_permit(rps_token, player_account_1, rps_game.address, bid_value, deadline)
+    # Act / Assert
+    with reverts("Permit signature is invalid!"):
+        rps_game.joinGameWithPermit(0, 0, bid_value * 2, deadline, v, r, s, {"from": player_account_1})
@@ -0,0 +1,227 @@
+from scripts.batch_settlement import pack_matches, unpack_matches, settle_matches, sign_batch_move, sign_matches
+from brownie import accounts, chain, reverts
+import pytest
+from web3 import Web3
+
+
+def create_and_fund_players(rps_game, owner_acc, players_count):
+    # moves are signed with private keys, which development accounts unlocked on node dont expose
+    players = [accounts.add() for _ in range(players_count)]
+    for player in players:
+        owner_acc.transfer(player, Web3.toWei(2, 'ether')).wait(1)
+        rps_game.depositFunds({"from": player, "value": Web3.toWei(1, 'ether')}).wait(1)
+    return players
+
+
+def test_pack_matches_round_trip():
+    move_1 = (1700000000, 27, b"\x01" * 32, b"\x02" * 32)
+    move_2 = (1700003600, 28, b"\x03" * 32, b"\x04" * 32)
+    matches = [
+        ("0x" + "11" * 20, 0, "0x" + "22" * 20, 2, 1, move_1, move_2),
+        ("0x" + "33" * 20, 2, "0x" + "44" * 20, 1, 2, move_2, move_1),
+    ]
+    packed_matches = pack_matches(matches)
+    assert len(packed_matches) == 2 * 181
+    assert packed_matches[40] == 0 | 2 << 2 | 1 << 4
+    assert packed_matches[41:111] == (1700000000).to_bytes(5, "big") + b"\x01" * 32 + b"\x02" * 32 + bytes([27])
+    assert unpack_matches(packed_matches) == matches
+
+
+@pytest.mark.require_network("development", "ganache", "ganache_local")
+def test_settle_matches_positive(rps_ledger_contracts):
+    # Arrange
+    rps_token, rps_game, owner_acc = rps_ledger_contracts
+    player_account_1, player_account_2, player_account_3 = create_and_fund_players(rps_game, owner_acc, 3)
+    player_balance_1 = rps_game.getDepositedFundsValue(player_account_1.address)
+    player_balance_2 = rps_game.getDepositedFundsValue(player_account_2.address)
+    player_balance_3 = rps_game.getDepositedFundsValue(player_account_3.address)
+    low_bid = rps_game.getLowBidValue()
+    high_bid = rps_game.getHighBidValue()
+    matches = sign_matches(rps_game, [
+        (player_account_1, 0, player_account_2, 2, 0),  # player1 wins low bid
+        (player_account_2, 1, player_account_3, 1, 1),  # draw
+        (player_account_3, 0, player_account_1, 1, 2),  # player1 wins high bid
+    ], chain.time() + 3600)
+    # Act
+    settle_tx = settle_matches(rps_game, matches, owner_acc)
+    settle_tx.wait(1)
+    # Assert
+    assert rps_game.getDepositedFundsValue(player_account_1.address) == player_balance_1 + low_bid + high_bid
+    assert rps_game.getDepositedFundsValue(player_account_2.address) == player_balance_2 - low_bid
+    assert rps_game.getDepositedFundsValue(player_account_3.address) == player_balance_3 - high_bid
+    assert len(settle_tx.events['matchEndedEvent']) == 3
+    assert [event['_matchResult'] for event in settle_tx.events['matchEndedEvent']] == [1, 0, 2]
+    assert settle_tx.events['matchEndedEvent'][2]['_player2Address'] == player_account_1.address
+    assert settle_tx.events['matchEndedEvent'][2]['_bidValue'] == 2
+    assert rps_game.getBatchMoveNonce(player_account_1.address) == 2
+    assert rps_game.getBatchMoveNonce(player_account_3.address) == 2
+
+
+@pytest.mark.require_network("development", "ganache", "ganache_local")
+def test_settle_matches_with_rps_token_positive(rps_contracts):
+    # Arrange
+    rps_token, rps_game, owner_acc = rps_contracts
+    player_account_1, player_account_2 = create_and_fund_players(rps_game, owner_acc, 2)
+    medium_bid = rps_game.getMediumBidValue()
+    rps_token.approve(rps_game.address, medium_bid, {"from": player_account_1}).wait(1)
+    player_balance_1 = rps_game.getDepositedFundsValue(player_account_1.address)
+    # Act
+    matches = sign_matches(rps_game, [(player_account_1, 2, player_account_2, 0, 1)], chain.time() + 3600)
+    settle_tx = settle_matches(rps_game, matches, owner_acc)
+    settle_tx.wait(1)
+    # Assert
+    assert rps_game.getDepositedFundsValue(player_account_1.address) == player_balance_1 - medium_bid
+    assert settle_tx.events['matchEndedEvent']['_matchResult'] == 2
+
+
+def assert_match_skipped(settle_tx, rps_game, players, player_balances, nonces):
+    assert 'matchEndedEvent' not in settle_tx.events
+    assert settle_tx.events['matchSkippedEvent']['_matchIndex'] == 0
+    for player, player_balance, nonce in zip(players, player_balances, nonces):
+        assert rps_game.getDepositedFundsValue(player.address) == player_balance
+        assert rps_game.getBatchMoveNonce(player.address) == nonce
+
+
+@pytest.mark.require_network("development", "ganache", "ganache_local")
+def test_settle_matches_owner_forged_symbol_skipped(rps_ledger_contracts):
+    # Arrange
+    rps_token, rps_game, owner_acc = rps_ledger_contracts
+    players = create_and_fund_players(rps_game, owner_acc, 2)
+    player_balances = [rps_game.getDepositedFundsValue(player.address) for player in players]
+    player_1_address, _, player_2_address, player_2_symbol, bid, move_1, move_2 = \
+        sign_matches(rps_game, [(players[0], 0, players[1], 1, 0)], chain.time() + 3600)[0]
+    # owner keeps both signatures, but swaps rock signed by player1 for scissors losing against paper
+    forged_match = (player_1_address, 2, player_2_address, player_2_symbol, bid, move_1, move_2)
+    # Act
+    settle_tx = settle_matches(rps_game, [forged_match], owner_acc)
+    settle_tx.wait(1)
+    # Assert
+    assert_match_skipped(settle_tx, rps_game, players, player_balances, [0, 0])
+
+
+@pytest.mark.require_network("development", "ganache", "ganache_local")
+def test_settle_matches_unsigned_player_skipped(rps_ledger_contracts):
+    # Arrange
+    rps_token, rps_game, owner_acc = rps_ledger_contracts
+    players = create_and_fund_players(rps_game, owner_acc, 2)
+    player_balances = [rps_game.getDepositedFundsValue(player.address) for player in players]
+    deadline = chain.time() + 3600
+    move_1 = sign_batch_move(rps_game, players[0], players[1].address, 0, 0, deadline)
+    # other key signs move in place of player2
+    move_2 = sign_batch_move(rps_game, accounts.add(), players[0].address, 2, 0, deadline,
+                             rps_game.getBatchMoveNonce(players[1].address))
+    # Act
+    settle_tx = settle_matches(rps_game, [(players[0].address, 0, players[1].address, 2, 0, move_1, move_2)],
+                               owner_acc)
+    settle_tx.wait(1)
+    # Assert
+    assert_match_skipped(settle_tx, rps_game, players, player_balances, [0, 0])
+
+
+@pytest.mark.require_network("development", "ganache", "ganache_local")
+def test_settle_matches_replayed_signature_skipped(rps_ledger_contracts):
+    # Arrange
+    rps_token, rps_game, owner_acc = rps_ledger_contracts
+    players = create_and_fund_players(rps_game, owner_acc, 2)
+    matches = sign_matches(rps_game, [(players[0], 1, players[1], 0, 0)], chain.time() + 3600)
+    settle_matches(rps_game, matches, owner_acc).wait(1)
+    player_balances = [rps_game.getDepositedFundsValue(player.address) for player in players]
+    # Act
+    settle_tx = settle_matches(rps_game, matches, owner_acc)
+    settle_tx.wait(1)
+    # Assert
+    assert_match_skipped(settle_tx, rps_game, players, player_balances, [1, 1])
+
+
+@pytest.mark.require_network("development", "ganache", "ganache_local")
+def test_settle_matches_cancelled_moves_skipped(rps_ledger_contracts):
+    # Arrange
+    rps_token, rps_game, owner_acc = rps_ledger_contracts
+    players = create_and_fund_players(rps_game, owner_acc, 2)
+    player_balances = [rps_game.getDepositedFundsValue(player.address) for player in players]
+    matches = sign_matches(rps_game, [(players[0], 1, players[1], 0, 0)], chain.time() + 3600)
+    rps_game.cancelBatchMoves({"from": players[1]}).wait(1)
+    # Act
+    settle_tx = settle_matches(rps_game, matches, owner_acc)
+    settle_tx.wait(1)
+    # Assert
+    assert_match_skipped(settle_tx, rps_game, players, player_balances, [0, 1])
+
+
+@pytest.mark.require_network("development", "ganache", "ganache_local")
+def test_settle_matches_changed_bid_value_skipped(rps_ledger_contracts):
+    # Arrange
+    rps_token, rps_game, owner_acc = rps_ledger_contracts
+    players = create_and_fund_players(rps_game, owner_acc, 2)
+    player_balances = [rps_game.getDepositedFundsValue(player.address) for player in players]
+    matches = sign_matches(rps_game, [(players[0], 1, players[1], 0, 0)], chain.time() + 3600)
+    # owner raises low bid after players signed their moves
+    rps_game.updateLowBidValue(rps_game.getLowBidValue() * 2, {"from": owner_acc}).wait(1)
+    # Act
+    settle_tx = settle_matches(rps_game, matches, owner_acc)
+    settle_tx.wait(1)
+    # Assert
+    assert_match_skipped(settle_tx, rps_game, players, player_balances, [0, 0])
+
+
+@pytest.mark.require_network("development", "ganache", "ganache_local")
+def test_settle_matches_expired_deadline_skipped(rps_ledger_contracts):
+    # Arrange
+    rps_token, rps_game, owner_acc = rps_ledger_contracts
+    players = create_and_fund_players(rps_game, owner_acc, 2)
+    player_balances = [rps_game.getDepositedFundsValue(player.address) for player in players]
+    matches = sign_matches(rps_game, [(players[0], 1, players[1], 0, 0)], chain.time() + 60)
+    chain.sleep(120)
+    # Act
+    settle_tx = settle_matches(rps_game, matches, owner_acc)
+    settle_tx.wait(1)
+    # Assert
+    assert_match_skipped(settle_tx, rps_game, players, player_balances, [0, 0])
+
+
+@pytest.mark.require_network("development", "ganache", "ganache_local")
+def test_settle_matches_skips_only_invalid_match(rps_ledger_contracts):
+    # Arrange
+    rps_token, rps_game, owner_acc = rps_ledger_contracts
+    player_account_1, player_account_2, player_account_3 = create_and_fund_players(rps_game, owner_acc, 3)
+    player_balance_3 = rps_game.getDepositedFundsValue(player_account_3.address)
+    low_bid = rps_game.getLowBidValue()
+    deadline = chain.time() + 3600
+    valid_match = sign_matches(rps_game, [(player_account_1, 0, player_account_2, 2, 0)], deadline)[0]
+    # player3 signs against player1, but owner submits it as a match against player2
+    _, _, _, _, _, move_3, move_1 = sign_matches(rps_game, [(player_account_3, 1, player_account_1, 0, 0)], deadline)[0]
+    invalid_match = (player_account_3.address, 1, player_account_2.address, 0, 0, move_3, move_1)
+    # Act
+    settle_tx = settle_matches(rps_game, [invalid_match, valid_match], owner_acc)
+    settle_tx.wait(1)
+    # Assert
+    assert settle_tx.events['matchSkippedEvent']['_matchIndex'] == 0
+    assert settle_tx.events['matchSkippedEvent']['_player1Address'] == player_account_3.address
+    assert settle_tx.events['matchEndedEvent']['_player1Address'] == player_account_1.address
+    assert rps_game.getDepositedFundsValue(player_account_3.address) == player_balance_3
+    assert rps_game.getBatchMoveNonce(player_account_1.address) == 1
+    assert rps_game.getBatchMoveNonce(player_account_3.address) == 0
+    assert rps_game.getDepositedFundsValue(player_account_2.address) == Web3.toWei(1, 'ether') - low_bid
+
+
+@pytest.mark.require_network("development", "ganache", "ganache_local")
+def test_settle_matches_bad_owner_fail(rps_ledger_contracts):
+    # Arrange
+    rps_token, rps_game, owner_acc = rps_ledger_contracts
+    player_account_1, player_account_2 = create_and_fund_players(rps_game, owner_acc, 2)
+    matches = sign_matches(rps_game, [(player_account_1, 0, player_account_2, 1, 0)], chain.time() + 3600)
+    # Act / Assert
+    with reverts('Ownable: caller is not the owner'):
+        settle_matches(rps_game, matches, player_account_1)
+
+
+@pytest.mark.require_network("development", "ganache", "ganache_local")
+def test_settle_matches_invalid_length_fail(rps_ledger_contracts):
+    # Arrange
+    rps_token, rps_game, owner_acc = rps_ledger_contracts
+    player_account_1, player_account_2 = create_and_fund_players(rps_game, owner_acc, 2)
+    matches = sign_matches(rps_game, [(player_account_1, 0, player_account_2, 1, 0)], chain.time() + 3600)
+    packed_matches = pack_matches(matches)
+    # Act / Assert
+    with reverts("Packed matches length have to be multiple of 181 bytes!"):
+        rps_game.settleMatches(packed_matches[:-1], {"from": owner_acc})
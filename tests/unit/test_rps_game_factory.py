@@ -0,0 +1,156 @@
+from scripts.helpful_scripts import get_account
+from scripts.deploy import deploy_rps_game_shards
+from scripts.shard_router import ShardRouter
+from brownie import reverts
+import pytest
+from web3 import Web3
+
+
+@pytest.mark.require_network("development", "ganache", "ganache_local")
+def test_create_shards_positive():
+    # Arrange / Act
+    rps_token, rps_game_factory, shards, owner_acc = deploy_rps_game_shards(3)
+    # Assert
+    assert rps_game_factory.getShardsCount() == 3
+    assert list(rps_game_factory.getShards()) == [shard.address for shard in shards]
+    for shard in shards:
+        assert shard.owner() == owner_acc.address
+        assert shard.rpsToken() == rps_token.address
+        assert rps_token.isRPSGame(shard.address)
+        assert shard.getLowBidValue() == Web3.toWei(1, 'ether')
+
+
+@pytest.mark.require_network("development", "ganache", "ganache_local")
+def test_shard_initialize_twice_fail():
+    # Arrange
+    rps_token, rps_game_factory, shards, owner_acc = deploy_rps_game_shards(1)
+    # Act / Assert
+    with reverts("Initializable: contract is already initialized"):
+        shards[0].initialize(get_account(index=1), {"from": get_account(index=1)})
+    with reverts("Ownable: caller is not the owner"):
+        rps_game_factory.createShards(1, {"from": get_account(index=1)})
+    with reverts("This function can call only RPS Game factory contract!"):
+        rps_token.registerRPSGame(get_account(index=1), {"from": get_account(index=1)})
+
+
+@pytest.mark.require_network("development", "ganache", "ganache_local")
+def test_match_on_shard_positive():
+    # Arrange
+    rps_token, rps_game_factory, shards, owner_acc = deploy_rps_game_shards(2)
+    shard = shards[1]
+    player_account_1 = get_account(index=1)
+    player_account_2 = get_account(index=2)
+    for player in (player_account_1, player_account_2):
+        shard.depositFunds({"from": player, "value": Web3.toWei(1, 'ether')}).wait(1)
+        rps_token.approve(shard.address, shard.getLowBidValue(), {"from": player}).wait(1)
+    # Act
+    shard.joinGame(0, 0, {"from": player_account_1}).wait(1)
+    join_tx = shard.joinGame(1, 0, {"from": player_account_2})
+    join_tx.wait(1)
+    # Assert
+    assert join_tx.events['matchEndedEvent']['_matchResult'] == 2
+    assert rps_token.balance() == Web3.toWei(2, 'ether')
+    assert shard.balance() == 0
+    assert shards[0].getQueueDepths() == [0, 0, 0]
+
+
+@pytest.mark.require_network("development", "ganache", "ganache_local")
+def test_shard_router_pairs_waiting_players():
+    # Arrange
+    rps_token, rps_game_factory, shards, owner_acc = deploy_rps_game_shards(3)
+    players = [get_account(index=index) for index in range(1, 5)]
+    for player in players:
+        for shard in shards:
+            shard.depositFunds({"from": player, "value": Web3.toWei(1, 'ether')}).wait(1)
+            rps_token.approve(shard.address, shard.getMediumBidValue(), {"from": player}).wait(1)
+    router = ShardRouter(shards)
+    # Act
+    first_shard, _ = router.join_game(players[0], 0, 1)
+    second_shard, _ = router.join_game(players[1], 0, 0)
+    third_shard, join_tx = router.join_game(players[2], 1, 0)
+    # Assert
+    assert second_shard != first_shard
+    assert third_shard == second_shard
+    assert 'matchEndedEvent' in join_tx.events
+    assert router.choose_shard(players[3].address, 1) == first_shard
+
+
+@pytest.mark.require_network("development", "ganache", "ganache_local")
+def test_cross_shard_withdraw_keeps_other_shard_funds():
+    # Arrange
+    rps_token, rps_game_factory, shards, owner_acc = deploy_rps_game_shards(2)
+    player_account_1 = get_account(index=1)
+    player_account_2 = get_account(index=2)
+    amount_deposited = Web3.toWei(1, 'ether')
+    shards[0].depositFunds({"from": player_account_1, "value": amount_deposited}).wait(1)
+    shards[1].depositFunds({"from": player_account_2, "value": amount_deposited}).wait(1)
+    eth_balance_2 = player_account_2.balance()
+    # Act
+    withdraw_tx_1 = shards[1].withdrawFunds({"from": player_account_1})
+    withdraw_tx_1.wait(1)
+    withdraw_tx_2 = shards[1].withdrawFunds({"from": player_account_2})
+    withdraw_tx_2.wait(1)
+    # Assert
+    assert withdraw_tx_1.events['fundsWithdrawnEvent']['_amountWithdrawnInEth'] == amount_deposited
+    assert player_account_2.balance() == eth_balance_2 + amount_deposited - withdraw_tx_2.gas_used * withdraw_tx_2.gas_price
+    assert rps_token.balance() == 0
+    assert shards[0].balance() == shards[1].balance() == 0
+
+
+@pytest.mark.require_network("development", "ganache", "ganache_local")
+def test_cross_shard_import_keeps_other_shard_funds():
+    # Arrange
+    rps_token, rps_game_factory, shards, owner_acc = deploy_rps_game_shards(2, internal_ledger_enabled=True)
+    player_account_1 = get_account(index=1)
+    player_account_2 = get_account(index=2)
+    amount_deposited = Web3.toWei(1, 'ether')
+    shards[0].depositFunds({"from": player_account_1, "value": amount_deposited}).wait(1)
+    shards[1].depositFunds({"from": player_account_2, "value": amount_deposited}).wait(1)
+    ledger_balance = shards[0].getDepositedFundsValue(player_account_1.address)
+    # Act
+    shards[0].exportTokens(ledger_balance, {"from": player_account_1}).wait(1)
+    shards[1].importTokens(ledger_balance, {"from": player_account_1}).wait(1)
+    shards[1].withdrawFunds({"from": player_account_1}).wait(1)
+    # Assert
+    assert shards[0].balance() == 0
+    assert shards[1].balance() == amount_deposited
+    assert rps_token.balance() == 0
+    withdraw_tx = shards[1].withdrawFunds({"from": player_account_2})
+    withdraw_tx.wait(1)
+    assert withdraw_tx.events['fundsWithdrawnEvent']['_amountWithdrawnInEth'] == amount_deposited
+    with reverts("Amount of RPS to export or import has to be whole wei!"):
+        shards[0].importTokens(1, {"from": player_account_1})
+
+
+@pytest.mark.require_network("development", "ganache", "ganache_local")
+def test_shard_router_skips_waiting_player_without_allowance():
+    # Arrange
+    rps_token, rps_game_factory, shards, owner_acc = deploy_rps_game_shards(2)
+    player_account_1 = get_account(index=1)
+    player_account_2 = get_account(index=2)
+    shards[0].depositFunds({"from": player_account_1, "value": Web3.toWei(1, 'ether')}).wait(1)
+    shards[0].depositFunds({"from": player_account_2, "value": Web3.toWei(1, 'ether')}).wait(1)
+    # player1 waits in first shard, but allows only the second one to take their tokens
+    rps_token.approve(shards[1].address, shards[1].getLowBidValue(), {"from": player_account_1}).wait(1)
+    shards[0].joinGame(0, 0, {"from": player_account_1}).wait(1)
+    for shard in shards:
+        rps_token.approve(shard.address, shard.getLowBidValue(), {"from": player_account_2}).wait(1)
+    router = ShardRouter(shards)
+    # Act
+    chosen_shard = router.choose_shard(player_account_2.address, 0)
+    # Assert
+    assert chosen_shard == shards[1]
+    assert router.get_candidate_shards(player_account_1.address, 0) == [shards[1]]
+
+
+@pytest.mark.require_network("development", "ganache", "ganache_local")
+def test_shard_router_skips_player_without_balance():
+    # Arrange
+    rps_token, rps_game_factory, shards, owner_acc = deploy_rps_game_shards(2)
+    player_account_1 = get_account(index=1)
+    for shard in shards:
+        rps_token.approve(shard.address, shard.getLowBidValue(), {"from": player_account_1}).wait(1)
+    router = ShardRouter(shards)
+    # Act / Assert
+    with pytest.raises(ValueError):
+        router.choose_shard(player_account_1.address, 0)
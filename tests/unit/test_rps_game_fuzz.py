@@ -0,0 +1,143 @@
+import os
+import time
+from scripts.helpful_scripts import get_account
+from brownie import reverts
+from brownie.test import strategy
+import pytest
+
+PLAYERS_COUNT = 4
+# RPS_Token mints this to its deployer, it is not backed by ETH held by RPS_Token
+INITIAL_OWNER_SUPPLY = 10 ** 18
+MINIMAL_DEPOSIT = 10 ** 14
+# CI defaults, raise them locally e.g. RPS_FUZZ_EXAMPLES=2000 for thousands of sequences
+FUZZ_EXAMPLES = int(os.environ.get("RPS_FUZZ_EXAMPLES", 50))
+FUZZ_STEPS = int(os.environ.get("RPS_FUZZ_STEPS", 20))
+
+
+class RPSGameStateMachine:
+    """Random sequences of player and owner actions checked against a plain Python model.
+
+    Every action is asserted to succeed or revert as the model predicts, invariants read chain state
+    after every step. Brownie reverts the chain to a snapshot before each sequence.
+    """
+
+    st_player = strategy("uint8", max_value=PLAYERS_COUNT - 1)
+    st_symbol = strategy("uint8", max_value=2)
+    st_bid = strategy("uint8", max_value=2)
+    st_deposit = strategy("uint256", min_value=MINIMAL_DEPOSIT // 10, max_value=2 * 10 ** 18)
+    st_bid_value = strategy("uint256", max_value=3 * 10 ** 22)
+    st_allowance = strategy("uint256", max_value=3 * 10 ** 22)
+
+    def __init__(cls, rps_token, rps_game, owner_acc, players, stats):
+        cls.rps_token = rps_token
+        cls.rps_game = rps_game
+        cls.owner_acc = owner_acc
+        cls.players = players
+        cls.eth_rps_ratio = rps_game.getEthRpsRatio()
+        cls.initial_bid_values = [rps_game.getLinkBidWithValues(bid) for bid in range(3)]
+        cls.stats = stats
+
+    def setup(self):
+        self.stats["sequences"] += 1
+        self.balances = [self.rps_game.getDepositedFundsValue(player) for player in self.players]
+        self.allowances = [self.rps_token.allowance(player, self.rps_game.address) for player in self.players]
+        self.bid_values = list(self.initial_bid_values)
+        # bid -> (player index, symbol) of waiting player
+        self.waiting_players = {}
+        # player index -> bid player waits for
+        self.queue_entries = {}
+
+    def rule_deposit(self, st_player, st_deposit):
+        if st_deposit < MINIMAL_DEPOSIT:
+            with reverts("Minimal value to deposit is 0.0001 ETH!"):
+                self.rps_game.depositFunds({"from": self.players[st_player], "value": st_deposit})
+            return
+        self.rps_game.depositFunds({"from": self.players[st_player], "value": st_deposit})
+        self.balances[st_player] += st_deposit * self.eth_rps_ratio
+
+    def rule_withdraw(self, st_player):
+        if self.balances[st_player] == 0 or st_player in self.queue_entries:
+            with reverts():
+                self.rps_game.withdrawFunds({"from": self.players[st_player]})
+            return
+        self.rps_game.withdrawFunds({"from": self.players[st_player]})
+        self.balances[st_player] = 0
+
+    def rule_approve(self, st_player, st_allowance):
+        self.rps_token.approve(self.rps_game.address, st_allowance, {"from": self.players[st_player]})
+        self.allowances[st_player] = st_allowance
+
+    def rule_join_game(self, st_player, st_symbol, st_bid):
+        bid_value = self.bid_values[st_bid]
+        if self.balances[st_player] < bid_value or st_player in self.queue_entries:
+            with reverts():
+                self.rps_game.joinGame(st_symbol, st_bid, {"from": self.players[st_player]})
+            return
+        if st_bid not in self.waiting_players:
+            self.rps_game.joinGame(st_symbol, st_bid, {"from": self.players[st_player]})
+            self.waiting_players[st_bid] = (st_player, st_symbol)
+            self.queue_entries[st_player] = st_bid
+            return
+        waiting_player, waiting_symbol = self.waiting_players[st_bid]
+        match_result = (3 + waiting_symbol - st_symbol) % 3
+        loser, winner = (st_player, waiting_player) if match_result == 1 else (waiting_player, st_player)
+        if match_result != 0 and (self.balances[loser] < bid_value or self.allowances[loser] < bid_value):
+            # waiting player's bid value could be raised or allowance lowered after joining
+            with reverts():
+                self.rps_game.joinGame(st_symbol, st_bid, {"from": self.players[st_player]})
+            return
+        join_tx = self.rps_game.joinGame(st_symbol, st_bid, {"from": self.players[st_player]})
+        assert join_tx.events["matchEndedEvent"]["_matchResult"] == match_result
+        del self.waiting_players[st_bid]
+        del self.queue_entries[waiting_player]
+        if match_result != 0:
+            self.balances[loser] -= bid_value
+            self.balances[winner] += bid_value
+            self.allowances[loser] -= bid_value
+
+    def rule_quite_queue(self, st_player):
+        if st_player not in self.queue_entries:
+            with reverts("You cant quite queue, if you arent in it!"):
+                self.rps_game.quiteQueue({"from": self.players[st_player]})
+            return
+        self.rps_game.quiteQueue({"from": self.players[st_player]})
+        del self.waiting_players[self.queue_entries.pop(st_player)]
+
+    def rule_update_bid_value(self, st_bid, st_bid_value):
+        update_function_name = ["updateLowBidValue", "updateMediumBidValue", "updateHighBidValue"][st_bid]
+        getattr(self.rps_game, update_function_name)(st_bid_value, {"from": self.owner_acc})
+        self.bid_values[st_bid] = st_bid_value
+
+    def invariant_eth_backs_token_supply(self):
+        self.stats["checked_states"] += 1
+        backed_supply = self.rps_token.totalSupply() - INITIAL_OWNER_SUPPLY
+        assert self.rps_token.balance() * self.eth_rps_ratio >= backed_supply
+        assert self.rps_game.balance() == 0
+
+    def invariant_players_state_matches_model(self):
+        deposited_funds, in_queue = self.rps_game.getPlayersState(self.players)
+        assert list(deposited_funds) == self.balances
+        assert list(in_queue) == [index in self.queue_entries for index in range(PLAYERS_COUNT)]
+
+    def invariant_queues_consistent(self):
+        # every player in queue holds slot of their bid, so nobody is stuck waiting for a match
+        queue_depths = list(self.rps_game.getQueueDepths())
+        assert queue_depths == [int(bid in self.waiting_players) for bid in range(3)]
+        assert sum(queue_depths) == len(self.queue_entries)
+        for player_index, bid in self.queue_entries.items():
+            assert self.waiting_players[bid][0] == player_index
+
+
+@pytest.mark.require_network("development", "ganache", "ganache_local")
+def test_rps_game_stateful_fuzz(rps_contracts, state_machine, record_property):
+    rps_token, rps_game, owner_acc = rps_contracts
+    players = [get_account(index=index) for index in range(1, PLAYERS_COUNT + 1)]
+    stats = {"sequences": 0, "checked_states": 0}
+    start = time.perf_counter()
+    state_machine(RPSGameStateMachine, rps_token, rps_game, owner_acc, players, stats,
+                  settings={"max_examples": FUZZ_EXAMPLES, "stateful_step_count": FUZZ_STEPS})
+    elapsed = time.perf_counter() - start
+    sequences_per_second = stats["sequences"] / elapsed
+    record_property("sequences_per_second", round(sequences_per_second, 2))
+    print(f"\nStateful fuzzing: {stats['sequences']} sequences, {stats['checked_states']} checked states "
+          f"in {elapsed:.1f}s ({sequences_per_second:.2f} sequences/s)")
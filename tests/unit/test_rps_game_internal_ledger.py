@@ -0,0 +1,105 @@
+from scripts.helpful_scripts import get_account
+from brownie import reverts
+import pytest
+from web3 import Web3
+
+
+@pytest.mark.require_network("development", "ganache", "ganache_local")
+def test_deposit_funds_to_ledger_positive(rps_ledger_contracts):
+    # Arrange
+    rps_token, rps_game, owner_acc = rps_ledger_contracts
+    account = get_account(index=1)
+    amount_deposited = Web3.toWei(1, 'ether')
+    # Act
+    deposit_tx = rps_game.depositFunds({"from": account, "value": amount_deposited})
+    deposit_tx.wait(1)
+    # Assert
+    assert rps_game.isInternalLedgerEnabled()
+    assert rps_game.getDepositedFundsValue(account.address) == amount_deposited * rps_game.getEthRpsRatio()
+    assert rps_token.balanceOf(account.address) == 0
+    assert deposit_tx.events['fundsDepositedEvent']['_amountDepositedInEth'] == amount_deposited
+
+
+@pytest.mark.require_network("development", "ganache", "ganache_local")
+def test_withdraw_funds_from_ledger_positive(rps_ledger_contracts):
+    # Arrange
+    rps_token, rps_game, owner_acc = rps_ledger_contracts
+    account = get_account(index=1)
+    amount_deposited = Web3.toWei(1, 'ether')
+    rps_game.depositFunds({"from": account, "value": amount_deposited}).wait(1)
+    # Act
+    withdraw_tx = rps_game.withdrawFunds({"from": account})
+    withdraw_tx.wait(1)
+    # Assert
+    assert rps_game.getDepositedFundsValue(account.address) == 0
+    assert rps_game.balance() == 0
+    assert withdraw_tx.events['fundsWithdrawnEvent']['_amountWithdrawnInEth'] == amount_deposited
+
+
+@pytest.mark.require_network("development", "ganache", "ganache_local")
+def test_match_settled_on_ledger_without_approve(rps_ledger_contracts):
+    # Arrange
+    rps_token, rps_game, owner_acc = rps_ledger_contracts
+    player_account_1 = get_account(index=1)
+    player_account_2 = get_account(index=2)
+    amount_deposited = Web3.toWei(1, 'ether')
+    rps_game.depositFunds({"from": player_account_1, "value": amount_deposited}).wait(1)
+    rps_game.depositFunds({"from": player_account_2, "value": amount_deposited}).wait(1)
+    player_balance_1 = rps_game.getDepositedFundsValue(player_account_1.address)
+    player_balance_2 = rps_game.getDepositedFundsValue(player_account_2.address)
+    bid_value = rps_game.getLowBidValue()
+    # Act
+    rps_game.joinGame(0, 0, {'from': player_account_1}).wait(1)
+    join_tx = rps_game.joinGame(1, 0, {'from': player_account_2})
+    join_tx.wait(1)
+    # Assert
+    assert rps_game.getDepositedFundsValue(player_account_1.address) == player_balance_1 - bid_value
+    assert rps_game.getDepositedFundsValue(player_account_2.address) == player_balance_2 + bid_value
+    assert join_tx.events['matchEndedEvent']['_matchResult'] == 2
+    assert 'Transfer' not in join_tx.events
+
+
+@pytest.mark.require_network("development", "ganache", "ganache_local")
+def test_export_and_import_tokens_positive(rps_ledger_contracts):
+    # Arrange
+    rps_token, rps_game, owner_acc = rps_ledger_contracts
+    account = get_account(index=1)
+    amount_deposited = Web3.toWei(1, 'ether')
+    rps_game.depositFunds({"from": account, "value": amount_deposited}).wait(1)
+    ledger_balance = rps_game.getDepositedFundsValue(account.address)
+    amount_exported = ledger_balance // 4
+    # Act / Assert
+    export_tx = rps_game.exportTokens(amount_exported, {"from": account})
+    export_tx.wait(1)
+    assert rps_token.balanceOf(account.address) == amount_exported
+    assert rps_game.getDepositedFundsValue(account.address) == ledger_balance - amount_exported
+    assert export_tx.events['tokensExportedEvent']['_amountInRps'] == amount_exported
+
+    import_tx = rps_game.importTokens(amount_exported, {"from": account})
+    import_tx.wait(1)
+    assert rps_token.balanceOf(account.address) == 0
+    assert rps_game.getDepositedFundsValue(account.address) == ledger_balance
+    assert import_tx.events['tokensImportedEvent']['_amountInRps'] == amount_exported
+
+
+@pytest.mark.require_network("development", "ganache", "ganache_local")
+def test_export_tokens_while_in_queue_fail(rps_ledger_contracts):
+    # Arrange
+    rps_token, rps_game, owner_acc = rps_ledger_contracts
+    account = get_account(index=1)
+    rps_game.depositFunds({"from": account, "value": Web3.toWei(1, 'ether')}).wait(1)
+    rps_game.joinGame(0, 0, {'from': account}).wait(1)
+    # Act / Assert
+    with reverts("To export tokens, you cant be waiting for game. Please quite game!"):
+        rps_game.exportTokens(1, {"from": account})
+
+
+@pytest.mark.require_network("development", "ganache", "ganache_local")
+def test_export_tokens_with_ledger_disabled_fail(rps_contracts):
+    # Arrange
+    rps_token, rps_game, owner_acc = rps_contracts
+    account = get_account(index=1)
+    rps_game.depositFunds({"from": account, "value": Web3.toWei(1, 'ether')}).wait(1)
+    # Act / Assert
+    with reverts("Internal ledger is disabled, your funds are already RPS tokens!"):
+        rps_game.exportTokens(1, {"from": account})
@@ -1,13 +1,12 @@
-from scripts.helpful_scripts import get_account, LOCAL_BLOCKCHAIN_ENVIRONMENTS
-from scripts.deploy import deploy_rps_token_and_game
-from brownie import network, exceptions, RPS_Game, RPS_Token, config
+from scripts.helpful_scripts import get_account, sign_permit, LOCAL_BLOCKCHAIN_ENVIRONMENTS
+from brownie import network, exceptions, RPS_Game, RPS_Token, config, accounts, chain
 import pytest
 from web3 import Web3
 
 
 @pytest.mark.require_network("development", "ganache", "ganache_local")
-def test_create_new_tokens_for_game_positive():
-    rps_token, rps_game, owner_acc = deploy_rps_token_and_game()
+def test_create_new_tokens_for_game_positive(rps_contracts):
+    rps_token, rps_game, owner_acc = rps_contracts
     account = get_account(index=1)
     amount_deposited = Web3.toWei(1, 'ether')
     rps_balance_before = rps_token.balanceOf(account.address)
@@ -18,9 +17,9 @@ def test_create_new_tokens_for_game_positive():
 @pytest.mark.require_network("development", "ganache", "ganache_local")
 def test_create_new_tokens_for_game_only_rps_game_modifier_fail():
     owner_acc = get_account()
-    rps_token = RPS_Token.deploy({'from': owner_acc},
+    rps_token = RPS_Token.deploy(owner_acc.address, {'from': owner_acc},
                                  publish_source=config['networks'][network.show_active()]['publish_source'])
-    rps_game = RPS_Game.deploy(rps_token.address, {"from": owner_acc},
+    rps_game = RPS_Game.deploy(rps_token.address, False, {"from": owner_acc},
                                publish_source=config['networks'][network.show_active()]['publish_source'])
     player_acc = get_account(index=1)
     amount_deposited = Web3.toWei(1, 'ether')
@@ -29,8 +28,8 @@ def test_create_new_tokens_for_game_only_rps_game_modifier_fail():
 
 
 @pytest.mark.require_network("development", "ganache", "ganache_local")
-def test_burn_tokens_when_withdraw_positive():
-    rps_token, rps_game, owner_acc = deploy_rps_token_and_game()
+def test_burn_tokens_when_withdraw_positive(rps_contracts):
+    rps_token, rps_game, owner_acc = rps_contracts
     account = get_account(index=1)
     amount_deposited = Web3.toWei(1, 'ether')
     rps_balance_before = rps_token.balanceOf(account.address)
@@ -43,8 +42,23 @@ def test_burn_tokens_when_withdraw_positive():
 @pytest.mark.require_network("development", "ganache", "ganache_local")
 def test_set_rps_game_address_positive():
     owner_acc = get_account()
-    rps_token = RPS_Token.deploy({'from': owner_acc},
+    rps_token = RPS_Token.deploy(owner_acc.address, {'from': owner_acc},
                                  publish_source=config['networks'][network.show_active()]['publish_source'])
-    rps_game = RPS_Game.deploy(rps_token.address, {"from": owner_acc},
+    rps_game = RPS_Game.deploy(rps_token.address, False, {"from": owner_acc},
                                publish_source=config['networks'][network.show_active()]['publish_source'])
-    rps_token.setRPSGameAddress(rps_game.address, {"from": owner_acc})
\ No newline at end of file
+    rps_token.setRPSGameAddress(rps_game.address, {"from": owner_acc})
+    assert rps_token.isRPSGame(rps_game.address)
+    assert not rps_token.isRPSGame(owner_acc.address)
+
+@pytest.mark.require_network("development", "ganache", "ganache_local")
+def test_permit_sets_allowance_positive(rps_contracts):
+    rps_token, rps_game, owner_acc = rps_contracts
+    signer_acc = accounts.add()
+    spender_acc = get_account(index=1)
+    deadline = chain.time() + 3600
+    v, r, s = sign_permit(rps_token, signer_acc, spender_acc.address, 100, deadline)
+    rps_token.permit(signer_acc.address, spender_acc.address, 100, deadline, v, r, s, {"from": spender_acc}).wait(1)
+    assert rps_token.allowance(signer_acc.address, spender_acc.address) == 100
+    assert rps_token.nonces(signer_acc.address) == 1
+    with pytest.raises(exceptions.VirtualMachineError):
+        rps_token.permit(signer_acc.address, spender_acc.address, 100, deadline, v, r, s, {"from": spender_acc})
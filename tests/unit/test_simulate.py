@@ -0,0 +1,26 @@
+from scripts.simulate import MatchmakingSimulation
+from types import SimpleNamespace
+from web3.exceptions import TimeExhausted
+
+
+class TimingOutSender:
+    def send(self, account, to, data="0x", value=0):
+        return "0x" + "00" * 32
+
+    @staticmethod
+    def wait_for_receipts(tx_hashes):
+        raise TimeExhausted("Transaction was not in the chain after 120 seconds")
+
+
+def test_play_round_requeues_player_after_timeout():
+    # Arrange
+    rps_game = SimpleNamespace(address="0x" + "11" * 20, abi=[],
+                               joinGame=SimpleNamespace(encode_input=lambda symbol, bid: "0x"))
+    player = SimpleNamespace(address="0x" + "22" * 20)
+    simulation = MatchmakingSimulation(TimingOutSender(), rps_game, [player], 1)
+    # Act
+    simulation.play_round(simulation.free_players.get())
+    # Assert
+    assert simulation.free_players.get_nowait() == player
+    assert (simulation.stats.submitted, simulation.stats.timed_out, simulation.stats.reverted) == (1, 1, 0)
+    assert simulation.stats.matches == 0